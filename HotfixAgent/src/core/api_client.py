@@ -7,8 +7,10 @@ that is shared across all platform adapters (Fabric, Synapse, ADF).
 from __future__ import annotations
 
 import logging
+import random
+import threading
 import time
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import requests
 
@@ -16,6 +18,61 @@ from src.core.auth import TokenProvider
 
 logger = logging.getLogger(__name__)
 
+POLL_BASE_DELAY = 2.0
+POLL_MAX_DELAY = 30.0
+
+
+class PollBackoff:
+    """Delays between the polls of one long-running operation.
+
+    Capped exponential backoff with jitter, never shorter than the server's
+    Retry-After. The total wait is bounded by ``max_wait`` if given, otherwise
+    by ``max_polls`` polls at the larger of the base delay and the longest
+    Retry-After seen, so a slow server hint stretches the budget rather than
+    cutting the operation short.
+    """
+
+    def __init__(
+        self,
+        max_polls: int,
+        max_wait: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_polls = max_polls
+        self.max_wait = max_wait
+        self.polls = 0
+        self._clock = clock
+        self._start = clock()
+        self._hint = POLL_BASE_DELAY
+
+    @staticmethod
+    def retry_after(response: requests.Response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    @property
+    def budget(self) -> float:
+        """Seconds the operation may take in total."""
+        return self.max_wait if self.max_wait is not None else self.max_polls * self._hint
+
+    def next_delay(self, response: requests.Response) -> Optional[float]:
+        """Seconds to wait before the next poll, or None once polls or time run out."""
+        retry_after = self.retry_after(response)
+        if retry_after is not None:
+            self._hint = max(self._hint, retry_after)
+        remaining = self._start + self.budget - self._clock()
+        if self.polls >= self.max_polls or remaining <= 0:
+            return None
+        backoff = min(POLL_MAX_DELAY, POLL_BASE_DELAY * (2 ** self.polls))
+        delay = random.uniform(backoff / 2, backoff)
+        if retry_after is not None:
+            delay = max(delay, retry_after * random.uniform(1.0, 1.1))
+        self.polls += 1
+        return min(delay, remaining)
+
 
 class RestClient:
     """HTTP client with Azure long-running operation support."""
@@ -25,6 +82,15 @@ class RestClient:
         self._token_provider = token_provider
         self._timeout = timeout
         self._session = requests.Session()
+        # Set by close(); waits between polls end early once it is set
+        self._closed = threading.Event()
+        self._clock: Callable[[], float] = time.monotonic
+        self._wait: Callable[[float], bool] = self._closed.wait
+
+    def close(self) -> None:
+        """Close the session and stop any operation still being polled."""
+        self._closed.set()
+        self._session.close()
 
     def _headers(self) -> dict[str, str]:
         return {
@@ -53,12 +119,16 @@ class RestClient:
             return path
         return f"{self._base_url}/{path.lstrip('/')}"
 
-    def wait_for_long_operation(self, response: requests.Response, max_polls: int = 60) -> requests.Response:
+    def wait_for_long_operation(
+        self, response: requests.Response, max_polls: int = 60, max_wait: Optional[float] = None
+    ) -> requests.Response:
         """Poll a 202 Accepted response until completion.
 
         Azure REST APIs return 202 with a Location header for async operations.
-        This method polls that location until the operation completes (200) or
-        the max poll count is reached.
+        This method polls that location until the operation completes (200),
+        the max poll count is reached, ``max_wait`` seconds have passed
+        (default: see ``PollBackoff``) or the client is closed, backing off
+        between polls (with jitter) and honouring each response's Retry-After.
         """
         if response.status_code != 202:
             return response
@@ -68,19 +138,23 @@ class RestClient:
             logger.warning("202 response without Location header — returning as-is")
             return response
 
-        retry_after = int(response.headers.get("Retry-After", "2"))
-
-        for attempt in range(max_polls):
-            time.sleep(retry_after)
+        backoff = PollBackoff(max_polls, max_wait, self._clock)
+        poll_resp = response
+        while (delay := backoff.next_delay(poll_resp)) is not None:
+            if self._wait(delay):
+                logger.warning("Client closed while polling a long-running operation")
+                return response
             poll_resp = self.get(location)
-            logger.debug("Poll %d/%d: HTTP %d", attempt + 1, max_polls, poll_resp.status_code)
+            logger.debug("Poll %d/%d: HTTP %d", backoff.polls, max_polls, poll_resp.status_code)
 
             if poll_resp.status_code == 200:
                 return poll_resp
             if poll_resp.status_code != 202:
                 return poll_resp
 
-        logger.warning("Long-running operation did not complete after %d polls", max_polls)
+        logger.warning(
+            "Long-running operation did not complete within %d polls / %.0fs", max_polls, backoff.budget
+        )
         return response
 
     def post_and_wait(self, path: str, json: Optional[dict] = None, **kwargs: Any) -> requests.Response:
@@ -0,0 +1,86 @@
+"""Tests for long-running operation polling in RestClient (fake clock, no network)."""
+
+import requests
+
+from src.core.api_client import POLL_BASE_DELAY, POLL_MAX_DELAY, PollBackoff, RestClient
+
+
+class _FakeTokenProvider:
+    headers = {"Authorization": "Bearer test"}
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _response(status: int, retry_after: str | None = None, location: str | None = None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    if retry_after is not None:
+        resp.headers["Retry-After"] = retry_after
+    if location is not None:
+        resp.headers["Location"] = location
+    return resp
+
+
+def _polling_client(responses: list[requests.Response]) -> tuple[RestClient, _Clock, list[float]]:
+    """Client whose polls return ``responses`` in turn and whose waits advance a fake clock."""
+    client = RestClient("https://api.example.com", _FakeTokenProvider())
+    clock = _Clock()
+    waits: list[float] = []
+
+    def _wait(delay: float) -> bool:
+        waits.append(delay)
+        clock.now += delay
+        return False
+
+    client._clock = clock
+    client._wait = _wait
+    client.get = lambda path, **kwargs: responses.pop(0)
+    return client, clock, waits
+
+
+def test_poll_backoff_grows_and_honours_retry_after():
+    backoff = PollBackoff(max_polls=10, clock=_Clock())
+    plain = _response(202)
+    delays = [backoff.next_delay(plain) for _ in range(6)]
+    for attempt, delay in enumerate(delays):
+        cap = min(POLL_MAX_DELAY, POLL_BASE_DELAY * 2 ** attempt)
+        assert cap / 2 <= delay <= cap
+    assert backoff.next_delay(_response(202, retry_after="45")) >= 45
+    assert PollBackoff.retry_after(_response(202, retry_after="soon")) is None
+
+
+def test_poll_budget_scales_with_retry_after():
+    # With the server asking for 30 s between polls, 60 polls may take 30 minutes
+    slow = [_response(202, retry_after="30") for _ in range(39)] + [_response(200)]
+    client, clock, waits = _polling_client(slow)
+    result = client.wait_for_long_operation(_response(202, retry_after="30", location="/operations/1"))
+    assert result.status_code == 200
+    assert len(waits) == 40 and min(waits) >= 30 and clock.now > 20 * 60
+
+    # An operation that never finishes is given up on at 60 × Retry-After
+    client, clock, waits = _polling_client([_response(202, retry_after="30") for _ in range(60)])
+    initial = _response(202, retry_after="30", location="/operations/1")
+    assert client.wait_for_long_operation(initial) is initial
+    assert clock.now == 60 * 30
+
+
+def test_poll_stops_at_max_wait():
+    pending = [_response(202) for _ in range(100)]
+    client, clock, waits = _polling_client(pending)
+    initial = _response(202, location="/operations/1")
+    assert client.wait_for_long_operation(initial, max_polls=100, max_wait=20) is initial
+    assert clock.now == 20 and len(waits) < 100
+
+
+def test_poll_ends_when_client_closes():
+    client = RestClient("https://api.example.com", _FakeTokenProvider())
+    client.get = lambda path, **kwargs: _response(202)
+    client.close()
+    initial = _response(202, location="/operations/1")
+    assert client.wait_for_long_operation(initial) is initial
@@ -0,0 +1,70 @@
+"""Synthetic semantic models and reports for TOMPo benchmarks."""
+
+from __future__ import annotations
+
+import random
+
+from tompo_mcp.core.models import (
+    ColumnInfo, MeasureInfo, PageInfo, ReportInfo,
+    SemanticModelInfo, TableInfo, VisualFieldBinding, VisualInfo,
+)
+
+
+def make_model(
+    tables: int = 100, columns: int = 40, measures: int = 10, hidden_every: int = 25,
+) -> SemanticModelInfo:
+    return SemanticModelInfo(
+        id="ds-bench",
+        name="Benchmark Model",
+        tables=[
+            TableInfo(
+                name=f"Table{t}",
+                is_hidden=hidden_every > 0 and t % hidden_every == hidden_every - 1,
+                columns=[ColumnInfo(name=f"Col{c}", data_type="String") for c in range(columns)],
+                measures=[
+                    MeasureInfo(name=f"Measure{t}_{m}", expression=f"SUM(Table{t}[Col{m}])", table_name=f"Table{t}")
+                    for m in range(measures)
+                ],
+            )
+            for t in range(tables)
+        ],
+    )
+
+
+def make_reports(
+    model: SemanticModelInfo,
+    reports: int = 20,
+    pages: int = 10,
+    visuals: int = 20,
+    bindings: int = 5,
+    seed: int = 0,
+) -> list[ReportInfo]:
+    """Build reports whose visuals bind random fields of ``model``."""
+    rng = random.Random(seed)
+    fields: list[tuple[str, str, str]] = []
+    for tbl in model.tables:
+        fields.extend((tbl.name, c.name, "column") for c in tbl.columns)
+        fields.extend((tbl.name, m.name, "measure") for m in tbl.measures)
+
+    result: list[ReportInfo] = []
+    for r in range(reports):
+        report_pages: list[PageInfo] = []
+        for p in range(pages):
+            page_visuals: list[VisualInfo] = []
+            for v in range(visuals):
+                page_visuals.append(VisualInfo(
+                    visual_type=rng.choice(["table", "card", "clusteredBarChart", "lineChart"]),
+                    title=f"Visual {v}",
+                    visual_id=f"r{r}p{p}v{v}",
+                    field_bindings=[
+                        VisualFieldBinding(table_name=t, field_name=f, field_type=ft)
+                        for t, f, ft in rng.sample(fields, bindings)
+                    ],
+                ))
+            report_pages.append(PageInfo(name=f"page{p}", display_name=f"Page {p}", ordinal=p, visuals=page_visuals))
+        result.append(ReportInfo(id=f"rpt-{r}", name=f"Report {r}", dataset_id=model.id, pages=report_pages))
+    return result
+
+
+def binding_count(reports: list[ReportInfo]) -> int:
+    return sum(len(v.field_bindings) for r in reports for p in r.pages for v in p.visuals)
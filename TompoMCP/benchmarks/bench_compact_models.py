@@ -0,0 +1,177 @@
+"""Benchmark: slotted dataclasses vs. pydantic models for the per-binding hot types.
+
+Builds the same synthetic reports (100k field bindings by default) and the same
+lineage tree once with the current slotted-dataclass page / visual / binding /
+node types and once with pydantic equivalents of the previous models, and
+reports construction time and the memory each representation keeps alive.
+Current bindings are interned (one shared object per distinct field), so the
+slotted reports keep only references for them.
+
+Run from the TompoMCP directory:  python benchmarks/bench_compact_models.py [--reports N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, Optional
+
+from pydantic import BaseModel, Field
+
+from _synthetic import binding_count, make_model, make_reports
+
+from tompo_mcp.core.lineage import _build_lineage_tree
+from tompo_mcp.core.models import LineageNode, PageInfo, ReportInfo, VisualFieldBinding, VisualInfo
+
+
+# ── Previous representation ──────────────────────────────────────────
+
+class _PydBinding(BaseModel):
+    table_name: str
+    field_name: str
+    field_type: str
+
+
+class _PydVisual(BaseModel):
+    visual_type: str
+    title: Optional[str] = None
+    visual_id: Optional[str] = None
+    field_bindings: list[_PydBinding] = Field(default_factory=list)
+    filters: list[dict[str, Any]] = Field(default_factory=list)
+
+
+class _PydPage(BaseModel):
+    name: str
+    display_name: str
+    ordinal: int = 0
+    visibility: Optional[str] = None
+    visuals: list[_PydVisual] = Field(default_factory=list)
+
+
+class _PydReport(BaseModel):
+    id: str
+    name: str
+    dataset_id: Optional[str] = None
+    pages: list[_PydPage] = Field(default_factory=list)
+
+
+class _PydNode(BaseModel):
+    name: str
+    node_type: str
+    children: list[_PydNode] = Field(default_factory=list)
+    metadata: dict[str, Any] = Field(default_factory=dict)
+
+
+# ── Builders (same shape, both representations) ──────────────────────
+# Reports are rebuilt from plain tuples the way the parser builds them, one
+# object at a time, so both sides pay for every constructor call.
+
+# report → pages → visuals → bindings, as nested tuples
+Spec = list[tuple[Any, ...]]
+
+
+def _spec(reports: list[ReportInfo]) -> Spec:
+    return [
+        (r.id, r.name, [
+            (p.name, p.display_name, p.ordinal, [
+                (v.visual_type, v.title or "", v.visual_id or "", [
+                    (fb.table_name, fb.field_name, fb.field_type) for fb in v.field_bindings
+                ])
+                for v in p.visuals
+            ])
+            for p in r.pages
+        ])
+        for r in reports
+    ]
+
+
+def _build_compact(spec: Spec) -> list[ReportInfo]:
+    return [
+        ReportInfo(id=rid, name=rname, dataset_id="ds-bench", pages=[
+            PageInfo(name=pname, display_name=pdisp, ordinal=po, visuals=[
+                VisualInfo(visual_type=vt, title=title, visual_id=vid, field_bindings=[
+                    VisualFieldBinding(table_name=t, field_name=f, field_type=ft) for t, f, ft in bindings
+                ])
+                for vt, title, vid, bindings in visuals
+            ])
+            for pname, pdisp, po, visuals in pages
+        ])
+        for rid, rname, pages in spec
+    ]
+
+
+def _build_pydantic(spec: Spec) -> list[_PydReport]:
+    return [
+        _PydReport(id=rid, name=rname, dataset_id="ds-bench", pages=[
+            _PydPage(name=pname, display_name=pdisp, ordinal=po, visuals=[
+                _PydVisual(visual_type=vt, title=title, visual_id=vid, field_bindings=[
+                    _PydBinding(table_name=t, field_name=f, field_type=ft) for t, f, ft in bindings
+                ])
+                for vt, title, vid, bindings in visuals
+            ])
+            for pname, pdisp, po, visuals in pages
+        ])
+        for rid, rname, pages in spec
+    ]
+
+
+def _copy_tree(node: LineageNode, cls: Callable[..., Any]) -> Any:
+    return cls(
+        name=node.name, node_type=node.node_type, metadata=node.metadata,
+        children=[_copy_tree(child, cls) for child in node.children],
+    )
+
+
+def _count_nodes(node: LineageNode) -> int:
+    return 1 + sum(_count_nodes(child) for child in node.children)
+
+
+def _measure(fn: Callable[..., Any], *args: Any) -> tuple[float, int, int]:
+    """(seconds, retained bytes, peak bytes) for one call; the result is kept alive while measuring."""
+    gc.collect()
+    gc.disable()
+    try:
+        t0 = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - t0
+    finally:
+        gc.enable()
+    gc.collect()
+    tracemalloc.start()
+    result = fn(*args)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, retained, peak
+
+
+def _row(label: str, seconds: float, retained: int, peak: int) -> None:
+    print(f"{label:>26} {seconds * 1000:>9.0f} {retained / 2**20:>12.1f} {peak / 2**20:>10.1f}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--reports", type=int, default=50)
+    ap.add_argument("--pages", type=int, default=10)
+    ap.add_argument("--visuals", type=int, default=40)
+    ap.add_argument("--bindings", type=int, default=5, help="field bindings per visual")
+    args = ap.parse_args()
+
+    model = make_model(tables=200, columns=40, measures=10)
+    reports = make_reports(model, args.reports, args.pages, args.visuals, args.bindings)
+    spec = _spec(reports)
+    tree = _build_lineage_tree(model, reports, "ws-bench")
+    print(f"{binding_count(reports)} bindings, {_count_nodes(tree)} lineage tree nodes\n")
+
+    print(f"{'':>26} {'ms':>9} {'retained MB':>12} {'peak MB':>10}")
+    _row("reports, pydantic", *_measure(_build_pydantic, spec))
+    _row("reports, slotted", *_measure(_build_compact, spec))
+    _row("tree nodes, pydantic", *_measure(_copy_tree, tree, _PydNode))
+    _row("tree nodes, slotted", *_measure(_copy_tree, tree, LineageNode))
+    _row("build_lineage tree", *_measure(_build_lineage_tree, model, reports, "ws-bench"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark: parsing DAX INFO.* query results into a SemanticModelInfo.
+
+Compares the TableID-grouped _parse_from_dax with the previous per-table
+comprehensions (O(tables × columns)) on a synthetic model.
+
+Run from the TompoMCP directory:  python benchmarks/bench_dax_parse.py [--columns N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any
+
+from tompo_mcp.core.models import ColumnInfo, MeasureInfo
+from tompo_mcp.core.parser import _parse_from_dax
+
+
+def _make_rows(tables: int, columns: int, measures: int) -> dict[str, Any]:
+    # Table IDs start at 1, as in INFO.TABLES() output
+    return {
+        "_source": "dax",
+        "tables": [{"[ID]": t + 1, "[Name]": f"Table{t}", "[IsHidden]": False, "[Description]": None} for t in range(tables)],
+        "columns": [
+            {"[ID]": c, "[TableID]": c % tables + 1, "[ExplicitName]": f"Col{c}", "[InferredName]": None,
+             "[ExplicitDataType]": 2, "[IsHidden]": False, "[Expression]": None, "[Description]": None}
+            for c in range(columns)
+        ],
+        "measures": [
+            {"[TableID]": m % tables + 1, "[Name]": f"Measure{m}", "[Expression]": "1", "[FormatString]": None, "[Description]": None}
+            for m in range(measures)
+        ],
+        "relationships": [
+            {"[FromColumnID]": r, "[ToColumnID]": r + 1, "[FromCardinality]": 2, "[ToCardinality]": 1,
+             "[CrossFilteringBehavior]": 1, "[IsActive]": True}
+            for r in range(0, min(columns, 2 * tables), 2)
+        ],
+        "roles": [],
+    }
+
+
+def _legacy_table_members(raw: dict[str, Any]) -> None:
+    """The per-table comprehensions of the previous implementation."""
+    for t in raw["tables"]:
+        tid = t.get("[ID]", t.get("ID"))
+        [ColumnInfo(name=c.get("[ExplicitName]") or "", data_type=str(c.get("[ExplicitDataType]")))
+         for c in raw["columns"] if (c.get("[TableID]") or c.get("TableID")) == tid]
+        [MeasureInfo(name=m.get("[Name]", ""), expression=m.get("[Expression]", ""))
+         for m in raw["measures"] if (m.get("[TableID]") or m.get("TableID")) == tid]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--tables", type=int, default=500)
+    ap.add_argument("--columns", type=int, default=20_000)
+    ap.add_argument("--measures", type=int, default=3_000)
+    args = ap.parse_args()
+
+    raw = _make_rows(args.tables, args.columns, args.measures)
+    print(f"{args.tables} tables, {args.columns} columns, {args.measures} measures\n")
+
+    t0 = time.perf_counter()
+    model = _parse_from_dax(raw, "ds-bench", "Bench")
+    t_new = time.perf_counter() - t0
+    assert sum(len(t.columns) for t in model.tables) == args.columns
+
+    t0 = time.perf_counter()
+    _legacy_table_members(raw)
+    t_old = time.perf_counter() - t0
+
+    print(f"grouped _parse_from_dax:      {t_new * 1000:10.1f} ms")
+    print(f"per-table scans (old):        {t_old * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
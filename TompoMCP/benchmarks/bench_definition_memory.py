@@ -0,0 +1,104 @@
+"""Benchmark: peak memory of decoding and parsing a large PBIR report definition.
+
+Compares the lazily decoded DefinitionParts with the previous eager decode
+(every part base64-decoded, then JSON-parsed, up front) on a synthetic
+getDefinition response that includes bookmarks and StaticResources images.
+
+Run from the TompoMCP directory:  python benchmarks/bench_definition_memory.py [--pages N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import os
+import time
+import tracemalloc
+from typing import Any
+
+from tompo_mcp.core.definition import DefinitionParts
+from tompo_mcp.core.parser import parse_report_definition
+
+
+def _part(path: str, content: bytes) -> dict[str, str]:
+    return {"path": path, "payload": base64.b64encode(content).decode("ascii"), "payloadType": "InlineBase64"}
+
+
+def _json_part(path: str, obj: Any) -> dict[str, str]:
+    return _part(path, json.dumps(obj).encode("utf-8"))
+
+
+def _make_response(pages: int, visuals: int, bookmarks: int, images: int, image_kb: int) -> dict[str, Any]:
+    parts = [_json_part("definition/report.json", {"themeCollection": {}, "settings": {}})]
+    for p in range(pages):
+        parts.append(_json_part(f"definition/pages/p{p}/page.json", {"displayName": f"Page {p}", "ordinal": p}))
+        for v in range(visuals):
+            parts.append(_json_part(f"definition/pages/p{p}/visuals/v{v}/visual.json", {"visual": {
+                "visualType": "barChart",
+                "prototypeQuery": {"Select": [
+                    {"Column": {"Expression": {"SourceRef": {"Entity": f"Table{v % 20}"}}, "Property": f"Col{v}"}},
+                    {"Measure": {"Expression": {"SourceRef": {"Entity": f"Table{v % 20}"}}, "Property": f"Measure{v}"}},
+                ]},
+                "objects": {"title": [{"properties": {"text": "x" * 200}}]},
+            }}))
+    for b in range(bookmarks):
+        parts.append(_json_part(f"definition/bookmarks/b{b}.bookmark.json", {
+            "name": f"b{b}",
+            "explorationState": {"sections": {f"p{p}": {"visualContainers": {f"v{v}": {"filters": []} for v in range(visuals)}}
+                                              for p in range(min(pages, 5))}},
+        }))
+    for i in range(images):
+        parts.append(_part(f"StaticResources/RegisteredResources/image{i}.png", os.urandom(image_kb * 1024)))
+    return {"definition": {"format": "PBIR", "parts": parts}}
+
+
+def _eager_decode(response_body: dict[str, Any]) -> dict[str, Any]:
+    """The previous _split_definition_parts + _load_definition_parts."""
+    definition = response_body.get("definition", {})
+    raw = {p["path"]: base64.b64decode(p["payload"]) for p in definition.get("parts", [])}
+    decoded: dict[str, Any] = {"_format": definition.get("format", "unknown")}
+    for path, content in raw.items():
+        try:
+            text = content.decode("utf-8")
+            try:
+                decoded[path] = json.loads(text)
+            except json.JSONDecodeError:
+                decoded[path] = text
+        except UnicodeDecodeError:
+            decoded[path] = base64.b64encode(content).decode("ascii")
+    return decoded
+
+
+def _measure(label: str, body: dict[str, Any], decode) -> int:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    report = parse_report_definition(decode(body), "rpt-bench", "Bench")
+    elapsed = time.perf_counter() - t0
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    visuals = sum(len(p.visuals) for p in report.pages)
+    print(f"{label:24s} peak {peak / 2**20:8.1f} MiB   {elapsed * 1000:8.1f} ms   ({visuals} visuals)")
+    return visuals
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--pages", type=int, default=100)
+    ap.add_argument("--visuals", type=int, default=30)
+    ap.add_argument("--bookmarks", type=int, default=200)
+    ap.add_argument("--images", type=int, default=20)
+    ap.add_argument("--image-kb", type=int, default=500)
+    args = ap.parse_args()
+
+    body = _make_response(args.pages, args.visuals, args.bookmarks, args.images, args.image_kb)
+    payload = sum(len(p["payload"]) for p in body["definition"]["parts"])
+    print(f"{len(body['definition']['parts'])} parts, {payload / 2**20:.1f} MiB base64 payload\n")
+
+    lazy = _measure("lazy DefinitionParts", body, DefinitionParts.from_response)
+    eager = _measure("eager decode (old)", body, _eager_decode)
+    assert lazy == eager
+
+
+if __name__ == "__main__":
+    main()
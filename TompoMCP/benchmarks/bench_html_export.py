@@ -0,0 +1,63 @@
+"""Benchmark: export_lineage_html with inline vs. chunked model data.
+
+Stores many synthetic lineages and writes the HTML viewer both ways: every
+lineage inlined as one JSON array, and chunked (a manifest inline, each model
+a gzipped base64 chunk decoded when it is selected). Reports write time, peak
+Python memory while writing, file size and the inline JSON the browser must
+parse before the page can render.
+
+Run from the TompoMCP directory:  python benchmarks/bench_html_export.py [--models N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+
+from _synthetic import make_model, make_reports
+
+from tompo_mcp.core.lineage import build_lineage
+from tompo_mcp.core.store import LineageStore
+from tompo_mcp.server import _write_lineage_html
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--models", type=int, default=30)
+    ap.add_argument("--tables", type=int, default=60)
+    ap.add_argument("--reports", type=int, default=5)
+    args = ap.parse_args()
+
+    store = LineageStore()
+    for i in range(args.models):
+        model = make_model(tables=args.tables, columns=20, measures=5)
+        model.id, model.name = f"ds-{i}", f"Model {i}"
+        reports = make_reports(model, reports=args.reports, pages=5, visuals=10, bindings=4)
+        store.save("ws-bench", build_lineage(model, reports, "ws-bench"))
+    keys = store.keys()
+    print(f"{len(keys)} models, {args.tables} tables and {args.reports} reports each\n")
+
+    print(f"{'':>8} {'s':>7} {'peak MB':>8} {'file MB':>8} {'inline JSON MB':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for chunked in (False, True):
+            path = os.path.join(tmp, "lineage.html")
+            gc.collect()
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            _write_lineage_html(path, store, keys, chunked)
+            elapsed = time.perf_counter() - t0
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            with open(path, encoding="utf-8") as f:
+                inline = re.search(r"const ALL_DATA = (.*);", f.read()).group(1)
+            print(f"{'chunked' if chunked else 'inline':>8} {elapsed:>7.2f} {peak / 2**20:>8.1f} "
+                  f"{os.path.getsize(path) / 2**20:>8.1f} {len(inline) / 2**20:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
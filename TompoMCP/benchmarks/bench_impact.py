@@ -0,0 +1,115 @@
+"""Benchmark: impact analysis via the field usage index vs. the nested report loops,
+and single-field lookups against the SQLite lineage store.
+
+Every synthetic measure is ``SUM(Table[Col])``, so column lookups also follow
+the DAX dependency graph; the legacy comparison counts direct usages only.
+
+Run from the TompoMCP directory:  python benchmarks/bench_impact.py [--tables N ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Iterable
+
+from _synthetic import binding_count, make_model, make_reports
+
+from tompo_mcp.core.dax import DaxDependencyGraph
+from tompo_mcp.core.lineage import build_field_usage_index, build_lineage, get_all_impact_analysis
+from tompo_mcp.core.models import ImpactAnalysisResponse, ReportInfo, SemanticModelInfo
+from tompo_mcp.core.store import LineageStore
+
+
+def _legacy_usage_count(object_name: str, object_type: str, table_name: str, reports: list[ReportInfo]) -> int:
+    """The pre-index implementation: scan every binding for every lookup."""
+    count = 0
+    for report in reports:
+        for page in report.pages:
+            for visual in page.visuals:
+                for fb in visual.field_bindings:
+                    if fb.table_name == table_name and fb.field_name == object_name and fb.field_type == object_type:
+                        count += 1
+    return count
+
+
+def _legacy_all(model: SemanticModelInfo, reports: list[ReportInfo]) -> dict[tuple[str, str, str], int]:
+    counts: dict[tuple[str, str, str], int] = {}
+    for table in model.tables:
+        if table.is_hidden:
+            continue
+        for col in table.columns:
+            if col.is_hidden:
+                continue
+            n = _legacy_usage_count(col.name, "column", table.name, reports)
+            if n:
+                counts[(table.name, col.name, "column")] = n
+        for m in table.measures:
+            n = _legacy_usage_count(m.name, "measure", table.name, reports)
+            if n:
+                counts[(table.name, m.name, "measure")] = n
+    return counts
+
+
+def _direct_counts(results: Iterable[ImpactAnalysisResponse]) -> dict[tuple[str, str, str], int]:
+    return {
+        (r.table_name, r.object_name, r.object_type): r.usage_count - r.indirect_count
+        for r in results if r.usage_count > r.indirect_count
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--tables", type=int, default=40)
+    ap.add_argument("--columns", type=int, default=25)
+    ap.add_argument("--measures", type=int, default=5)
+    ap.add_argument("--reports", type=int, default=10)
+    ap.add_argument("--pages", type=int, default=5)
+    ap.add_argument("--visuals", type=int, default=10)
+    ap.add_argument("--bindings", type=int, default=5)
+    args = ap.parse_args()
+
+    model = make_model(args.tables, args.columns, args.measures)
+    reports = make_reports(model, args.reports, args.pages, args.visuals, args.bindings)
+    fields = sum(len(t.columns) + len(t.measures) for t in model.tables)
+    print(f"{fields} fields, {binding_count(reports)} bindings")
+
+    t0 = time.perf_counter()
+    legacy = _legacy_all(model, reports)
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    index = build_field_usage_index(reports)
+    t_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    DaxDependencyGraph.from_model(model)
+    t_graph = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    indexed = get_all_impact_analysis(model, reports, "ws-bench", index)
+    t_indexed = time.perf_counter() - t0
+
+    assert legacy == _direct_counts(indexed)
+
+    print(f"nested loops:         {t_legacy * 1000:10.1f} ms")
+    print(f"index build:          {t_build * 1000:10.1f} ms")
+    print(f"DAX graph build:      {t_graph * 1000:10.1f} ms")
+    print(f"indexed all-impact:   {t_indexed * 1000:10.1f} ms  (includes graph, closures, ImpactItem construction)")
+    print(f"indirect usages:      {sum(r.indirect_count for r in indexed):10d}")
+    print(f"speed-up:             {t_legacy / (t_build + t_indexed):10.1f}x")
+
+    # What impact_analysis does per call now: one indexed query on the store
+    store = LineageStore()
+    t0 = time.perf_counter()
+    store.save("ws-bench", build_lineage(model, reports, "ws-bench"))
+    t_save = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    stored = _direct_counts(r for key in legacy for _, r in store.find_usages(key[1], key[0], key[2]))
+    t_store = time.perf_counter() - t0
+    assert stored == legacy
+
+    print(f"store save:           {t_save * 1000:10.1f} ms  (lineage build + insert)")
+    print(f"store lookups:        {t_store / len(legacy) * 1000:10.3f} ms per field ({len(legacy)} fields)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Benchmark: single-pass lineage tree construction on synthetic large models.
+
+Checks the tree is identical to the previous tables × reports × pages × visuals
+builder, then shows build time growing linearly with the number of bindings and
+staying flat as the table count grows.
+
+Run from the TompoMCP directory:  python benchmarks/bench_lineage.py
+"""
+
+from __future__ import annotations
+
+import gc
+import time
+from dataclasses import asdict
+
+from _synthetic import binding_count, make_model, make_reports
+
+from tompo_mcp.core.lineage import _build_lineage_tree
+from tompo_mcp.core.links import build_report_link, build_visual_link
+from tompo_mcp.core.models import LineageNode, ReportInfo, SemanticModelInfo
+
+
+def _legacy_build_lineage_tree(
+    model: SemanticModelInfo, reports: list[ReportInfo], workspace_id: str = "",
+) -> LineageNode:
+    """The pre-bucketing builder, kept here as the reference output."""
+    model_node = LineageNode(
+        name=model.name, node_type="model",
+        metadata={"id": model.id, "table_count": len(model.tables)},
+    )
+    for table in model.tables:
+        if table.is_hidden:
+            continue
+        table_node = LineageNode(
+            name=table.name, node_type="table",
+            metadata={"column_count": len(table.columns), "measure_count": len(table.measures)},
+        )
+        for report in reports:
+            report_uses_table = False
+            report_link = build_report_link(workspace_id, report.id, "") if workspace_id else None
+            report_node = LineageNode(
+                name=report.name, node_type="report",
+                metadata={"id": report.id, **({
+                    "workspace_id": workspace_id, "report_link": report_link,
+                } if workspace_id else {})},
+            )
+            for page in report.pages:
+                page_uses_table = False
+                page_link = build_report_link(workspace_id, report.id, page.name) if workspace_id else None
+                page_node = LineageNode(
+                    name=page.display_name, node_type="page",
+                    metadata={"name": page.name, **({"report_link": page_link} if page_link else {})},
+                )
+                for visual in page.visuals:
+                    hits = [fb for fb in visual.field_bindings if fb.table_name == table.name]
+                    if hits:
+                        v_link = build_visual_link(
+                            workspace_id, report.id, page.name, visual.visual_id
+                        ) if workspace_id and visual.visual_id else None
+                        visual_node = LineageNode(
+                            name=visual.visual_type, node_type="visual",
+                            metadata={
+                                "title": visual.title or visual.visual_type,
+                                **({
+                                    "visual_id": visual.visual_id,
+                                    "visual_link": v_link,
+                                    "report_link": page_link,
+                                } if visual.visual_id else {}),
+                            },
+                        )
+                        for fb in hits:
+                            visual_node.children.append(LineageNode(
+                                name=fb.field_name, node_type=fb.field_type,
+                                metadata={"table": fb.table_name, "field_type": fb.field_type},
+                            ))
+                        page_node.children.append(visual_node)
+                        page_uses_table = True
+                if page_uses_table:
+                    report_node.children.append(page_node)
+                    report_uses_table = True
+            if report_uses_table:
+                table_node.children.append(report_node)
+        if table_node.children:
+            model_node.children.append(table_node)
+
+    used_table_names = {child.name for child in model_node.children}
+    for table in model.tables:
+        if table.name not in used_table_names and not table.is_hidden:
+            model_node.children.append(LineageNode(
+                name=table.name, node_type="table",
+                metadata={
+                    "column_count": len(table.columns),
+                    "measure_count": len(table.measures),
+                    "orphan": True,
+                },
+            ))
+    return model_node
+
+
+def _time(fn, *args) -> float:
+    # Like timeit: collect first and keep the cyclic GC out of the measurement
+    gc.collect()
+    gc.disable()
+    try:
+        t0 = time.perf_counter()
+        fn(*args)
+        return time.perf_counter() - t0
+    finally:
+        gc.enable()
+
+
+def main() -> None:
+    # 1. Identical output, including orphan tables (350 tables, only ~1/3 bound)
+    model = make_model(tables=350, columns=8, measures=2)
+    reports = make_reports(model, reports=8, pages=5, visuals=10, bindings=3)
+    for ws in ("", "ws-bench"):
+        new = _build_lineage_tree(model, reports, ws)
+        old = _legacy_build_lineage_tree(model, reports, ws)
+        assert asdict(new) == asdict(old), "single-pass tree differs from legacy tree"
+    orphans = sum(1 for c in new.children if c.metadata.get("orphan"))
+    print(f"identical output on 350 tables ({orphans} orphaned), {binding_count(reports)} bindings\n")
+
+    # 2. Linear in bindings
+    model = make_model(tables=300, columns=20, measures=5)
+    print(f"{'bindings':>10} {'single-pass ms':>15} {'µs/binding':>11} {'legacy ms':>11}")
+    for n_reports in (5, 10, 20, 40):
+        reports = make_reports(model, reports=n_reports, pages=10, visuals=20, bindings=5)
+        n = binding_count(reports)
+        t_new = _time(_build_lineage_tree, model, reports, "ws-bench")
+        t_old = _time(_legacy_build_lineage_tree, model, reports, "ws-bench") if n_reports <= 10 else float("nan")
+        print(f"{n:>10} {t_new * 1000:>15.1f} {t_new / n * 1e6:>11.2f} {t_old * 1000:>11.1f}")
+
+    # 3. Flat in table count for a fixed binding volume
+    print(f"\n{'tables':>10} {'single-pass ms':>15}")
+    for n_tables in (50, 200, 800):
+        model = make_model(tables=n_tables, columns=10, measures=2)
+        reports = make_reports(model, reports=10, pages=10, visuals=20, bindings=5)
+        print(f"{n_tables:>10} {_time(_build_lineage_tree, model, reports, 'ws-bench') * 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark: paged generate_lineage output vs. rendering the whole tree.
+
+Builds the lineage of a large synthetic model and formats it the way
+``generate_lineage`` does: the whole tree in one string (what every call used
+to return), the first page, a page deep into the tree, and filtered views.
+Reports render time and output size.
+
+Run from the TompoMCP directory:  python benchmarks/bench_lineage_output.py [--reports N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+from typing import Any, Callable
+
+from _synthetic import binding_count, make_model, make_reports
+
+from tompo_mcp.core.lineage import build_lineage
+from tompo_mcp.server import _format_lineage_tree, _iter_tree_rows
+
+
+def _best_of(runs: int, fn: Callable[[], Any]) -> tuple[float, Any]:
+    best, result = float("inf"), None
+    for _ in range(runs):
+        gc.collect()
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--reports", type=int, default=40)
+    ap.add_argument("--page-size", type=int, default=500)
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+
+    model = make_model(tables=300, columns=20, measures=5)
+    reports = make_reports(model, reports=args.reports, pages=10, visuals=20, bindings=5)
+    lineage = build_lineage(model, reports, "ws-bench")
+    total = sum(1 for _ in _iter_tree_rows(lineage.lineage_tree))
+    print(f"{binding_count(reports)} bindings, {total:,} tree nodes, page size {args.page_size}\n")
+
+    cases = {
+        "whole tree": {"page_size": total},
+        "first page": {},
+        "middle page": {"cursor": total // 2},
+        "tables + reports": {"max_depth": 2},
+        "tables + fields": {"node_types": ["table", "column", "measure"]},
+    }
+    print(f"{'':>18} {'ms':>9} {'output KB':>10}")
+    for label, options in cases.items():
+        elapsed, out = _best_of(
+            args.runs, lambda: _format_lineage_tree(lineage, **{"page_size": args.page_size, **options})
+        )
+        print(f"{label:>18} {elapsed * 1000:>9.1f} {len(out.encode('utf-8')) / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark: polling many long-running operations — fixed sleep loops vs. LROScheduler.
+
+Simulates N operations that finish after a random duration. The legacy pattern
+runs one coroutine per operation sleeping a fixed interval between polls; the
+scheduler polls from one loop with capped, jittered exponential backoff.
+Reports total polls, the burstiest 10 ms window and how late completions are
+noticed. Time is scaled down (1 simulated second = 10 ms).
+
+Run from the TompoMCP directory:  python benchmarks/bench_lro.py [--ops N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+
+from tompo_mcp.core.lro import LROScheduler
+
+SCALE = 0.01  # seconds per simulated second
+POLL_INTERVAL = 3 * SCALE
+
+
+class _Sim:
+    def __init__(self, ops: int, seed: int = 0) -> None:
+        rng = random.Random(seed)
+        self.start = time.perf_counter()
+        # getDefinition-like durations: mostly 5–30 s, some up to 2 min
+        self.finish_at = [rng.choice([rng.uniform(5, 30)] * 4 + [rng.uniform(30, 120)]) * SCALE for _ in range(ops)]
+        self.poll_times: list[float] = []
+        self.noticed: list[float] = [0.0] * ops
+
+    def poll(self, i: int) -> bool:
+        now = time.perf_counter() - self.start
+        self.poll_times.append(now)
+        if now >= self.finish_at[i]:
+            self.noticed[i] = now - self.finish_at[i]
+            return True
+        return False
+
+    def report(self, label: str, wall: float) -> None:
+        windows = Counter(int(t / 0.01) for t in self.poll_times)
+        lag = sorted(self.noticed)
+        print(f"{label:<18} {len(self.poll_times):>8} {max(windows.values()):>12} "
+              f"{lag[len(lag) // 2] / SCALE:>10.1f} {lag[int(len(lag) * 0.95)] / SCALE:>10.1f} {wall:>8.2f}")
+
+
+async def _fixed(sim: _Sim, ops: int) -> None:
+    async def _one(i: int) -> None:
+        while True:
+            await asyncio.sleep(POLL_INTERVAL)
+            if sim.poll(i):
+                return
+    await asyncio.gather(*[_one(i) for i in range(ops)])
+
+
+async def _scheduled(sim: _Sim, ops: int, scheduler: LROScheduler) -> None:
+    def _make(i: int):
+        async def _poll():
+            return sim.poll(i), None, None
+        return _poll
+    await asyncio.gather(*[scheduler.wait(_make(i), name=str(i)) for i in range(ops)])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--ops", type=int, default=300)
+    args = ap.parse_args()
+
+    print(f"{args.ops} operations (lag in simulated seconds)\n")
+    print(f"{'strategy':<18} {'polls':>8} {'peak/10ms':>12} {'lag p50':>10} {'lag p95':>10} {'wall s':>8}")
+
+    sim = _Sim(args.ops)
+    t0 = time.perf_counter()
+    asyncio.run(_fixed(sim, args.ops))
+    sim.report("fixed 3 s sleep", time.perf_counter() - t0)
+
+    scheduler = LROScheduler(base_delay=POLL_INTERVAL, max_delay=30 * SCALE, max_attempts=1000)
+    sim = _Sim(args.ops)
+    t0 = time.perf_counter()
+    asyncio.run(_scheduled(sim, args.ops, scheduler))
+    sim.report("LROScheduler", time.perf_counter() - t0)
+
+    m = scheduler.metrics()
+    print(f"\nscheduler metrics: p50 {m['latency_p50'] / SCALE:.1f}s, p95 {m['latency_p95'] / SCALE:.1f}s, "
+          f"avg polls {m['avg_polls']:.1f}, outcomes {m['outcomes']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark: end-to-end workspace scan time with parsing inline vs. offloaded.
+
+A fake client serves large synthetic definitions (wrapped in DefinitionParts,
+as the real client returns them) after a fixed network latency. Each parse mode
+scans the same many-model workspace; a ticker task measures how long the event
+loop was blocked, which is how long in-flight downloads stalled.
+
+Run from the TompoMCP directory:  python benchmarks/bench_parse_offload.py [--models N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import time
+from typing import Any
+
+from tompo_mcp import server
+from tompo_mcp.core.definition import DefinitionParts
+from tompo_mcp.core.offload import PARSE_MODES, ParseExecutor
+from tompo_mcp.core.store import LineageStore
+
+
+def _body(fmt: str, parts: dict[str, Any]) -> dict[str, Any]:
+    return {"definition": {"format": fmt, "parts": [
+        {"path": path, "payloadType": "InlineBase64",
+         "payload": base64.b64encode(json.dumps(content).encode("utf-8")).decode("ascii")}
+        for path, content in parts.items()
+    ]}}
+
+
+def _model_body(tables: int, columns: int) -> dict[str, Any]:
+    return _body("TMSL", {"model.bim": {"model": {"tables": [
+        {
+            "name": f"Table{t}",
+            "columns": [{"name": f"Col{c}", "dataType": "string", "sourceColumn": f"c{c}"} for c in range(columns)],
+            "measures": [{"name": f"Measure{t}_{m}", "expression": f"SUM(Table{t}[Col{m}])"} for m in range(10)],
+        }
+        for t in range(tables)
+    ]}}})
+
+
+def _report_body(pages: int, visuals: int) -> dict[str, Any]:
+    parts: dict[str, Any] = {}
+    for p in range(pages):
+        parts[f"definition/pages/p{p}/page.json"] = {"displayName": f"Page {p}"}
+        for v in range(visuals):
+            parts[f"definition/pages/p{p}/visuals/v{v}/visual.json"] = {"visual": {
+                "visualType": "table",
+                "prototypeQuery": {"Select": [
+                    {"Column": {"Expression": {"SourceRef": {"Entity": f"Table{c % 50}"}}, "Property": f"Col{c}"}}
+                    for c in range(8)
+                ]},
+            }}
+    return _body("PBIR", parts)
+
+
+class FakeClient:
+    def __init__(self, models: int, reports_per_model: int, latency: float) -> None:
+        self.latency = latency
+        self.datasets = [{"id": f"ds-{m}", "name": f"Model {m}"} for m in range(models)]
+        self.reports = [
+            {"id": f"rpt-{m}-{r}", "name": f"Report {m}.{r}", "datasetId": f"ds-{m}"}
+            for m in range(models) for r in range(reports_per_model)
+        ]
+        self.model_body = _model_body(tables=50, columns=40)
+        self.report_body = _report_body(pages=20, visuals=25)
+
+    async def get_workspace_items(self, workspace_id: str) -> dict[str, list[dict[str, Any]]]:
+        return {"datasets": self.datasets, "reports": self.reports}
+
+    async def get_semantic_model_definition(
+        self, workspace_id: str, dataset_id: str, bypass_cache: bool = False, prefer_scanner: bool = False,
+    ) -> DefinitionParts:
+        await asyncio.sleep(self.latency)
+        return DefinitionParts.from_response(self.model_body)
+
+    async def get_report_definition(self, workspace_id: str, report_id: str, bypass_cache: bool = False) -> DefinitionParts:
+        await asyncio.sleep(self.latency)
+        return DefinitionParts.from_response(self.report_body)
+
+
+async def _scan(fake: FakeClient) -> tuple[float, float]:
+    server._client = fake  # type: ignore[assignment]
+    server._store = LineageStore()
+    stalls = [0.0]
+    stop = asyncio.Event()
+
+    async def _ticker() -> None:
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            t = loop.time()
+            await asyncio.sleep(0.005)
+            stalls[0] = max(stalls[0], loop.time() - t - 0.005)
+
+    ticker = asyncio.create_task(_ticker())
+    t0 = time.perf_counter()
+    await server.generate_workspace_lineage("ws-bench", incremental=False)
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await ticker
+    return elapsed, stalls[0]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--models", type=int, default=24)
+    ap.add_argument("--reports", type=int, default=4, help="reports bound to each model")
+    ap.add_argument("--latency", type=float, default=0.05, help="seconds per simulated getDefinition")
+    ap.add_argument("--workers", type=int, default=0, help="pool size (default min(8, CPUs))")
+    args = ap.parse_args()
+
+    fake = FakeClient(args.models, args.reports, args.latency)
+    print(f"{args.models} models × {args.reports} reports (1000 visuals each), "
+          f"{args.latency * 1000:.0f} ms per call\n")
+    print(f"{'mode':>8} {'wall s':>8} {'max loop stall ms':>18}")
+    for mode in PARSE_MODES:
+        server._parser = ParseExecutor(mode, args.workers or None)
+        try:
+            elapsed, stall = asyncio.run(_scan(fake))
+        finally:
+            server._parser.shutdown()
+        print(f"{mode:>8} {elapsed:>8.2f} {stall * 1000:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark: sustained request rate against a throttling API, with and without the rate limiter.
+
+The simulated service accepts ``--capacity`` requests per second (token bucket
+with a one-second burst) and answers anything above that with 429 and
+Retry-After: 1. The same batch of requests is sent:
+
+  no limiter   — every request fired at once, a 429 is a failure (previous behaviour)
+  at quota     — RateLimiter configured at the service's capacity
+  over quota   — RateLimiter configured at 3× capacity; it has to learn the real rate
+
+Run from the TompoMCP directory:  python benchmarks/bench_rate_limit.py [--requests N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+import httpx
+
+from tompo_mcp.core.ratelimit import RateLimited, RateLimiter
+
+URL = "https://api.powerbi.com/v1.0/myorg/groups/ws/reports"
+
+
+class ThrottlingService:
+    def __init__(self, capacity: float, latency: float) -> None:
+        self.capacity = capacity
+        self.latency = latency
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.throttled = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity)
+        self.updated = now
+        await asyncio.sleep(self.latency)
+        if self.tokens < 1:
+            self.throttled += 1
+            return httpx.Response(429, headers={"Retry-After": "1"})
+        self.tokens -= 1
+        return httpx.Response(200, json={"value": []})
+
+
+async def _run(requests: int, service: ThrottlingService, limiter: Optional[RateLimiter]) -> tuple[float, int]:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(service.handle))
+
+    async def _one() -> bool:
+        try:
+            if limiter is None:
+                resp = await client.get(URL)
+            else:
+                resp = await limiter.send(client, "GET", URL)
+            return resp.status_code == 200
+        except RateLimited:
+            return False
+
+    t0 = time.perf_counter()
+    ok = sum(await asyncio.gather(*[_one() for _ in range(requests)]))
+    elapsed = time.perf_counter() - t0
+    await client.aclose()
+    return elapsed, ok
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--requests", type=int, default=300)
+    ap.add_argument("--capacity", type=float, default=50.0, help="requests/second the service accepts")
+    ap.add_argument("--latency", type=float, default=0.02)
+    args = ap.parse_args()
+
+    print(f"{args.requests} requests, service capacity {args.capacity:.0f}/s\n")
+    print(f"{'mode':>12} {'wall s':>8} {'succeeded':>10} {'429s':>6} {'req/s':>8}")
+    modes = {
+        "no limiter": None,
+        "at quota": RateLimiter({"powerbi": (args.capacity, int(args.capacity))}),
+        "over quota": RateLimiter({"powerbi": (args.capacity * 3, int(args.capacity))}),
+    }
+    for name, limiter in modes.items():
+        service = ThrottlingService(args.capacity, args.latency)
+        elapsed, ok = asyncio.run(_run(args.requests, service, limiter))
+        print(f"{name:>12} {elapsed:>8.2f} {ok:>10} {service.throttled:>6} {ok / elapsed:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""Benchmark: PBIR report parsing throughput (visuals per second).
+
+Synthetic PBIR reports (100 pages × 50 visuals by default) carry every visual's
+fields in all three places real reports use — query metadata, query state and
+the prototype query — so the binding extractor has to deduplicate. Each report
+is parsed from plain dict parts and from lazily decoded DefinitionParts (as the
+client returns them), and compared against the previous path-splitting parser,
+which must produce the same pages.
+
+Legacy reports are timed as well: a Layout whose container configs are drawn
+from a small pool of distinct configs (duplicated slicers and headers), parsed
+once with an empty config memo and again as a second report cloned from the
+same template, against decoding every config with ``json.loads``.
+
+Run from the TompoMCP directory:  python benchmarks/bench_report_parse.py [--pages N --visuals N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import gc
+import json
+import time
+from collections.abc import Mapping
+from dataclasses import asdict
+from typing import Any, Callable, Optional
+
+from tompo_mcp.core import fastjson, parser
+from tompo_mcp.core.definition import DefinitionParts
+from tompo_mcp.core.models import PageInfo, ReportInfo, VisualFieldBinding, VisualInfo
+from tompo_mcp.core.parser import (
+    _extract_field_bindings_legacy, _extract_visual_title_legacy, _extract_visual_title_pbir, _try_parse_pbir,
+    parse_report_definition,
+)
+
+
+def _visual(p: int, v: int, fields: int) -> dict[str, Any]:
+    refs = [(f"Table{(p + v + i) % 30}", f"Col{i}", i % 4 == 0) for i in range(fields)]
+    return {"visual": {
+        "visualType": "tableEx",
+        "objects": {"title": [{"properties": {"text": {"expr": {"Literal": {"Value": f"'Visual {v}'"}}}}}]},
+        "dataTransforms": {"queryMetadata": {"Select": [
+            {"Name": f"{t}.{c}", "Type": 2 if measure else 1} for t, c, measure in refs
+        ]}},
+        "query": {"queryState": {"Values": {"projections": [
+            {"queryRef": f"{t}.{c}"} for t, c, _ in refs
+        ]}}},
+        "prototypeQuery": {"Select": [
+            {"Measure" if measure else "Column": {"Expression": {"SourceRef": {"Entity": t}}, "Property": c}}
+            for t, c, measure in refs
+        ]},
+    }}
+
+
+def make_report(pages: int, visuals: int, fields: int) -> dict[str, Any]:
+    parts: dict[str, Any] = {
+        "definition/report.json": {"themeCollection": {}},
+        "definition/pages/pages.json": {"pageOrder": [f"page{p}" for p in range(pages)]},
+    }
+    for p in range(pages):
+        parts[f"definition/pages/page{p}/page.json"] = {"displayName": f"Page {p}", "ordinal": p}
+        for v in range(visuals):
+            parts[f"definition/pages/page{p}/visuals/visual{v}/visual.json"] = _visual(p, v, fields)
+    return parts
+
+
+def make_legacy_report(pages: int, visuals: int, fields: int, distinct: int) -> dict[str, Any]:
+    # ``distinct`` visual configs, copied across the pages; each copy has its own name
+    configs = []
+    for i in range(distinct):
+        v = _visual(i, i, fields)["visual"]
+        configs.append(json.dumps({"layouts": [{"position": {"x": i, "y": i}}], "singleVisual": {
+            "visualType": "slicer", "prototypeQuery": v["prototypeQuery"],
+            "projections": {"Values": [{"queryRef": f"Table{i % 30}.Col{c}"} for c in range(fields)]},
+        }})[1:])
+    return {"report.json": {"sections": [
+        {"name": f"section{p}", "displayName": f"Page {p}", "visualContainers": [
+            {"x": v, "y": v, "config": f'{{"name": "visual{p}_{v}", ' + configs[(p * visuals + v) % distinct]}
+            for v in range(visuals)
+        ]}
+        for p in range(pages)
+    ]}}
+
+
+def _as_response(parts: dict[str, Any]) -> dict[str, Any]:
+    return {"definition": {"format": "PBIR", "parts": [
+        {"path": path, "payloadType": "InlineBase64",
+         "payload": base64.b64encode(json.dumps(content).encode("utf-8")).decode("ascii")}
+        for path, content in parts.items()
+    ]}}
+
+
+# ── Previous parser, kept as the reference output ────────────────────
+
+def _legacy_try_parse_pbir(definition: Mapping[str, Any]) -> Optional[list[PageInfo]]:
+    page_paths: dict[str, dict[str, Any]] = {}
+    visual_paths: dict[str, list[tuple[str, dict[str, Any]]]] = {}
+    for path in definition:
+        if "/pages/" not in path or not (path.endswith("page.json") or path.endswith("visual.json")):
+            continue
+        content = definition[path]
+        if not isinstance(content, dict):
+            continue
+        if "/pages/" in path and path.endswith("page.json"):
+            page_id = path.split("/pages/")[1].split("/")[0]
+            page_paths[page_id] = content
+        if "/visuals/" in path and path.endswith("visual.json"):
+            parts = path.split("/pages/")[1].split("/visuals/")
+            if len(parts) == 2:
+                visual_paths.setdefault(parts[0], []).append((path, content))
+    if not page_paths:
+        return None
+
+    pages: list[PageInfo] = []
+    for page_id, page_content in page_paths.items():
+        visuals: list[VisualInfo] = []
+        for vpath, visual_content in visual_paths.get(page_id, []):
+            visual_id = vpath.split("/visuals/")[1].split("/")[0]
+            v = visual_content.get("visual", visual_content)
+            visuals.append(VisualInfo(
+                visual_type=v.get("visualType", "unknown"), title=_extract_visual_title_pbir(v),
+                visual_id=visual_id, field_bindings=_legacy_bindings(v),
+            ))
+        visibility = page_content.get("visibility")
+        pages.append(PageInfo(
+            name=page_id,
+            display_name=page_content.get("displayName") or page_content.get("name") or page_id,
+            ordinal=page_content.get("ordinal", 0),
+            visibility=str(visibility) if visibility else None, visuals=visuals,
+        ))
+    pages.sort(key=lambda p: p.ordinal)
+    return pages
+
+
+def _legacy_bindings(v: dict[str, Any]) -> list[VisualFieldBinding]:
+    bindings: list[VisualFieldBinding] = []
+    seen: set[tuple[str, str]] = set()
+
+    def _add(table_name: str, field_name: str, field_type: str) -> None:
+        if (table_name, field_name) not in seen:
+            seen.add((table_name, field_name))
+            bindings.append(VisualFieldBinding(table_name=table_name, field_name=field_name, field_type=field_type))
+
+    for sel in v.get("dataTransforms", {}).get("queryMetadata", {}).get("Select", []):
+        name = sel.get("Name", "")
+        if "." in name:
+            table_name, field_name = name.split(".", 1)
+            _add(table_name, field_name, "measure" if sel.get("Type") == 2 else "column")
+    for role_data in v.get("query", {}).get("queryState", {}).values():
+        for proj in role_data.get("projections", []) if isinstance(role_data, dict) else []:
+            query_ref = proj.get("queryRef", "")
+            if "." in query_ref:
+                _add(*query_ref.split(".", 1), "column")
+    for sel in v.get("prototypeQuery", {}).get("Select", []):
+        for kind, field_type in (("Column", "column"), ("Measure", "measure")):
+            if kind in sel:
+                table_name = sel[kind].get("Expression", {}).get("SourceRef", {}).get("Entity", "")
+                field_name = sel[kind].get("Property", "")
+                if table_name and field_name:
+                    _add(table_name, field_name, field_type)
+    return bindings
+
+
+def _legacy_parse_layout(layout: dict[str, Any]) -> list[PageInfo]:
+    pages = []
+    for idx, section in enumerate(layout["sections"]):
+        visuals = []
+        for vc in section.get("visualContainers", []):
+            sv = json.loads(vc["config"]).get("singleVisual", {})
+            visuals.append(VisualInfo(
+                visual_type=sv.get("visualType", "unknown"), title=_extract_visual_title_legacy(sv),
+                field_bindings=_extract_field_bindings_legacy(sv),
+            ))
+        pages.append(PageInfo(name=section["name"], display_name=section["displayName"], ordinal=idx, visuals=visuals))
+    return pages
+
+
+def _cold_legacy(definition: dict[str, Any]) -> ReportInfo:
+    parser.clear_legacy_config_memo()
+    return parse_report_definition(definition, "rpt", "Legacy")
+
+
+def _best_of(runs: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--pages", type=int, default=100)
+    ap.add_argument("--visuals", type=int, default=50, help="visuals per page")
+    ap.add_argument("--fields", type=int, default=6, help="fields per visual")
+    ap.add_argument("--distinct", type=int, default=200, help="distinct configs in the legacy layout")
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+
+    parts = make_report(args.pages, args.visuals, args.fields)
+    response = _as_response(parts)
+    n_visuals = args.pages * args.visuals
+
+    new = _try_parse_pbir(parts, "rpt", "Report", None)
+    assert [asdict(p) for p in new] == [asdict(p) for p in _legacy_try_parse_pbir(parts)], "parsers disagree"
+    assert len(new[0].visuals[0].field_bindings) == args.fields
+    print(f"{args.pages} pages × {args.visuals} visuals, {args.fields} fields each (best of {args.runs})\n")
+
+    cases = {
+        "dict parts, previous": lambda: _legacy_try_parse_pbir(parts),
+        "dict parts, single-pass": lambda: _try_parse_pbir(parts, "rpt", "Report", None),
+        "DefinitionParts, previous": lambda: _legacy_try_parse_pbir(DefinitionParts.from_response(response)),
+        "DefinitionParts, single-pass": lambda: _try_parse_pbir(
+            DefinitionParts.from_response(response), "rpt", "Report", None
+        ),
+    }
+    print(f"{'':>30} {'ms':>8} {'visuals/s':>11}")
+    for label, fn in cases.items():
+        elapsed = _best_of(args.runs, fn)
+        print(f"{label:>30} {elapsed * 1000:>8.1f} {n_visuals / elapsed:>11,.0f}")
+
+    legacy = make_legacy_report(args.pages, args.visuals, args.fields, args.distinct)
+    print(f"\nlegacy layout, {args.distinct} distinct configs, JSON backend: {fastjson.BACKEND}")
+    cases = {
+        "json.loads per config": lambda: _legacy_parse_layout(legacy["report.json"]),
+        "memo, first report": lambda: _cold_legacy(legacy),
+        "memo, cloned report": lambda: parse_report_definition(legacy, "rpt", "Legacy"),
+    }
+    for label, fn in cases.items():
+        elapsed = _best_of(args.runs, fn)
+        print(f"{label:>30} {elapsed * 1000:>8.1f} {n_visuals / elapsed:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
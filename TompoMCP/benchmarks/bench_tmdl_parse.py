@@ -0,0 +1,132 @@
+"""Benchmark: TMDL semantic model parsing throughput.
+
+Builds a synthetic model as TMDL — one file per table (columns with several
+properties, multi-line measures, an M partition), a relationships file, role
+files and model.tmdl — and the same model as model.bim, and parses both through
+``parse_semantic_model``. The two results must agree. Reports files, lines and
+objects per second; the model.bim row is a baseline (JSON is decoded up front
+there, so it only measures mapping, and it has no relationships or roles).
+
+Run from the TompoMCP directory:  python benchmarks/bench_tmdl_parse.py [--tables N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+from typing import Any, Callable
+
+from tompo_mcp.core.parser import parse_semantic_model
+
+
+def _quote(name: str) -> str:
+    return f"'{name}'" if " " in name else name
+
+
+def make_tmdl(tables: int, columns: int, measures: int, roles: int) -> dict[str, str]:
+    parts: dict[str, str] = {}
+    for t in range(tables):
+        name = f"Table {t}" if t % 3 == 0 else f"Table{t}"
+        out = [f"/// Table {t} description", f"table {_quote(name)}", f"\tlineageTag: t-{t}", ""]
+        for c in range(columns):
+            out += [
+                f"\tcolumn Col{c}",
+                "\t\tdataType: string",
+                "\t\tisHidden" if c % 5 == 0 else "\t\tsummarizeBy: none",
+                f"\t\tsourceColumn: col_{c}",
+                f"\t\tlineageTag: t-{t}-c-{c}",
+                "",
+            ]
+        for m in range(measures):
+            out += [
+                f"\tmeasure 'Measure {t}.{m}' =",
+                f"\t\t\tVAR base = SUM({_quote(name)}[Col{m}])",
+                "\t\t\tRETURN",
+                "\t\t\t    DIVIDE(base, 100)",
+                "\t\tformatString: #,0.00",
+                f"\t\tlineageTag: t-{t}-m-{m}",
+                "",
+            ]
+        out += [
+            f"\tpartition {_quote(name)} = m",
+            "\t\tmode: import",
+            "\t\tsource =",
+            "\t\t\t\tlet",
+            f'\t\t\t\t    Source = Sql.Database("srv", "db"){{[Item="t{t}"]}}[Data]',
+            "\t\t\t\tin",
+            "\t\t\t\t    Source",
+            "",
+        ]
+        parts[f"definition/tables/{name}.tmdl"] = "\n".join(out)
+
+    rels = []
+    for t in range(1, tables):
+        rels += [f"relationship r{t}", f"\tfromColumn: Table{t}.Col0" if t % 3 else f"\tfromColumn: 'Table {t}'.Col0",
+                 "\ttoColumn: 'Table 0'.Col0", ""]
+    parts["definition/relationships.tmdl"] = "\n".join(rels)
+    for r in range(roles):
+        parts[f"definition/roles/Role{r}.tmdl"] = "\n".join([
+            f"role Role{r}", "\tmodelPermission: read", f"\tmember user{r}@contoso.com", "",
+            f"\ttablePermission Table{r % tables + 1} = [Col1] = \"R{r}\"", "",
+        ])
+    parts["definition/model.tmdl"] = "model Model\n\tculture: en-US\n\n" + "\n".join(
+        f"ref table {_quote(path.split('/')[-1][:-5])}" for path in parts if "/tables/" in path
+    )
+    return parts
+
+
+def make_bim(tables: int, columns: int, measures: int) -> dict[str, Any]:
+    return {"model.bim": {"model": {"tables": [
+        {
+            "name": f"Table {t}" if t % 3 == 0 else f"Table{t}",
+            "columns": [{"name": f"Col{c}", "dataType": "string", "sourceColumn": f"col_{c}"} for c in range(columns)],
+            "measures": [{"name": f"Measure {t}.{m}", "expression": ["VAR base = 1", "RETURN base"]} for m in range(measures)],
+            "partitions": [{"source": {"type": "m", "expression": ["let", "    Source = 1", "in", "    Source"]}}],
+        }
+        for t in range(tables)
+    ]}}}
+
+
+def _best_of(runs: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--tables", type=int, default=2000)
+    ap.add_argument("--columns", type=int, default=40)
+    ap.add_argument("--measures", type=int, default=10)
+    ap.add_argument("--roles", type=int, default=50)
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+
+    tmdl = make_tmdl(args.tables, args.columns, args.measures, args.roles)
+    bim = make_bim(args.tables, args.columns, args.measures)
+    n_lines = sum(content.count("\n") + 1 for content in tmdl.values())
+    n_objects = args.tables * (args.columns + args.measures + 2) + args.tables - 1 + args.roles * 3
+
+    model = parse_semantic_model(tmdl, "ds", "Bench")
+    baseline = parse_semantic_model(bim, "ds", "Bench")
+    assert [(t.name, len(t.columns), len(t.measures), bool(t.source)) for t in model.tables] == [
+        (t.name, len(t.columns), len(t.measures), bool(t.source)) for t in baseline.tables
+    ], "TMDL and model.bim disagree"
+    assert len(model.relationships) == args.tables - 1 and len(model.roles) == args.roles
+    print(f"{len(tmdl)} TMDL files, {n_lines:,} lines, {n_objects:,} objects (best of {args.runs})\n")
+
+    print(f"{'':>12} {'ms':>8} {'files/s':>10} {'lines/s':>12} {'objects/s':>12}")
+    elapsed = _best_of(args.runs, lambda: parse_semantic_model(tmdl, "ds", "Bench"))
+    print(f"{'TMDL':>12} {elapsed * 1000:>8.1f} {len(tmdl) / elapsed:>10,.0f} {n_lines / elapsed:>12,.0f} "
+          f"{n_objects / elapsed:>12,.0f}")
+    elapsed = _best_of(args.runs, lambda: parse_semantic_model(bim, "ds", "Bench"))
+    print(f"{'model.bim':>12} {elapsed * 1000:>8.1f} {'-':>10} {'-':>12} {'-':>12}")
+
+
+if __name__ == "__main__":
+    main()
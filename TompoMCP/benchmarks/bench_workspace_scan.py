@@ -0,0 +1,86 @@
+"""Benchmark: wall-clock time of generate_workspace_lineage against a simulated API.
+
+The fake client sleeps for a fixed latency per definition call and records the
+peak number of requests in flight, so the effect of the model and report
+concurrency limits can be compared without Azure access.
+
+Run from the TompoMCP directory:  python benchmarks/bench_workspace_scan.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+from tompo_mcp import server
+from tompo_mcp.core.store import LineageStore
+
+
+class FakeClient:
+    def __init__(self, models: int, reports_per_model: int, latency: float) -> None:
+        self.latency = latency
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.datasets = [{"id": f"ds-{m}", "name": f"Model {m}"} for m in range(models)]
+        self.reports = [
+            {"id": f"rpt-{m}-{r}", "name": f"Report {m}.{r}", "datasetId": f"ds-{m}"}
+            for m in range(models) for r in range(reports_per_model)
+        ]
+
+    async def _call(self, result: dict[str, Any]) -> dict[str, Any]:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            return result
+        finally:
+            self.in_flight -= 1
+
+    async def get_workspace_items(self, workspace_id: str) -> dict[str, list[dict[str, Any]]]:
+        return {"datasets": self.datasets, "reports": self.reports}
+
+    async def get_semantic_model_definition(
+        self, workspace_id: str, dataset_id: str, bypass_cache: bool = False, prefer_scanner: bool = False,
+    ) -> dict[str, Any]:
+        return await self._call({"model.bim": {"model": {"tables": [
+            {"name": "Sales", "columns": [{"name": "Region"}], "measures": [{"name": "Total", "expression": "1"}]},
+        ]}}})
+
+    async def get_report_definition(self, workspace_id: str, report_id: str, bypass_cache: bool = False) -> dict[str, Any]:
+        return await self._call({
+            "definition/pages/p1/page.json": {"displayName": "Page 1"},
+            "definition/pages/p1/visuals/v1/visual.json": {"visual": {"visualType": "card", "prototypeQuery": {
+                "Select": [{"Column": {"Expression": {"SourceRef": {"Entity": "Sales"}}, "Property": "Region"}}],
+            }}},
+        })
+
+
+async def _scan(fake: FakeClient) -> float:
+    server._client = fake  # type: ignore[assignment]
+    server._store = LineageStore()
+    t0 = time.perf_counter()
+    await server.generate_workspace_lineage("ws-bench", incremental=False)
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--models", type=int, default=12)
+    ap.add_argument("--reports", type=int, default=10, help="reports bound to each model")
+    ap.add_argument("--latency", type=float, default=0.05, help="seconds per simulated getDefinition")
+    args = ap.parse_args()
+
+    print(f"{args.models} models × {args.reports} reports, {args.latency * 1000:.0f} ms per call\n")
+    print(f"{'report limit':>12} {'wall s':>8} {'peak in flight':>15}")
+    for limit in (1, 4, 8, 16):
+        server.REPORT_CONCURRENCY = limit
+        fake = FakeClient(args.models, args.reports, args.latency)
+        elapsed = asyncio.run(_scan(fake))
+        print(f"{limit:>12} {elapsed:>8.2f} {fake.peak_in_flight:>15}")
+    print(f"\nmodel limit: {server.MODEL_CONCURRENCY}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,35 @@ Authentication for TOMPo MCP.
 
 Uses DefaultAzureCredential (Azure CLI / VS Code) by default.
 Also accepts a raw bearer token for Fabric Notebook scenarios.
+
+Tokens are cached per scope until shortly before they expire. A credential
+call can shell out to the Azure CLI and take hundreds of milliseconds, so
+async callers get the cached token immediately, a token close to expiry is
+renewed in the background, and concurrent callers share a single refresh.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Optional
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
 
 from azure.identity import DefaultAzureCredential
 
 logger = logging.getLogger(__name__)
 
+POWERBI_SCOPE = "https://analysis.windows.net/powerbi/api/.default"
+FABRIC_SCOPE = "https://api.fabric.microsoft.com/.default"
+GRAPH_SCOPE = "https://graph.microsoft.com/.default"
+
+# Renew tokens in the background once they are this close to expiry
+REFRESH_MARGIN = 300.0
+# Never hand out a token with less than this left; wait for a new one instead
+MIN_VALIDITY = 60.0
+
 _credential: Optional[DefaultAzureCredential] = None
 
 
@@ -27,33 +45,101 @@ def _get_credential() -> DefaultAzureCredential:
     return _credential
 
 
+@dataclass(frozen=True)
+class _CachedToken:
+    token: str
+    expires_on: float
+
+
 class TokenProvider:
     """Provides bearer tokens for Fabric/Power BI API calls.
 
     If initialized with a raw token string, uses it directly (Fabric Notebook).
-    Otherwise uses DefaultAzureCredential (az login / VS Code identity).
+    Otherwise uses DefaultAzureCredential (az login / VS Code identity), or the
+    given ``credential`` (anything with ``get_token(scope)``).
     """
 
-    def __init__(self, token: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        credential: Any = None,
+        refresh_margin: float = REFRESH_MARGIN,
+    ) -> None:
         self._raw_token = token
+        self._credential = credential
+        self.refresh_margin = refresh_margin
+        self._tokens: dict[str, _CachedToken] = {}
+        self._fetch_lock = threading.Lock()
+        self._refreshes: dict[str, asyncio.Task] = {}
 
     def get_powerbi_token(self) -> str:
-        if self._raw_token:
-            return self._raw_token
-        cred = _get_credential()
-        result = cred.get_token("https://analysis.windows.net/powerbi/api/.default")
-        return result.token
+        return self.get_token(POWERBI_SCOPE)
 
     def get_fabric_token(self) -> str:
+        return self.get_token(FABRIC_SCOPE)
+
+    def get_graph_token(self) -> str:
+        return self.get_token(GRAPH_SCOPE)
+
+    def get_token(self, scope: str) -> str:
+        """Return a token for ``scope``, calling the credential only if none is cached."""
         if self._raw_token:
             return self._raw_token
-        cred = _get_credential()
-        result = cred.get_token("https://api.fabric.microsoft.com/.default")
-        return result.token
+        cached = self._usable(scope)
+        if cached is not None:
+            return cached.token
+        return self._fetch(scope).token
 
-    def get_graph_token(self) -> str:
+    async def get_token_async(self, scope: str) -> str:
+        """Return a token for ``scope`` without blocking the event loop.
+
+        A cached token is returned straight away; if it is within
+        ``refresh_margin`` of expiry a background renewal is started. Only when
+        no usable token is cached does the caller wait, sharing one refresh
+        with every other caller of the same scope.
+        """
         if self._raw_token:
             return self._raw_token
-        cred = _get_credential()
-        result = cred.get_token("https://graph.microsoft.com/.default")
-        return result.token
+        cached = self._usable(scope)
+        if cached is not None:
+            if cached.expires_on - time.time() < self.refresh_margin:
+                self._refresh(scope)
+            return cached.token
+        return (await asyncio.shield(self._refresh(scope))).token
+
+    # ── Internals ────────────────────────────────────────────────────
+
+    def _usable(self, scope: str) -> Optional[_CachedToken]:
+        cached = self._tokens.get(scope)
+        if cached is not None and cached.expires_on - time.time() > MIN_VALIDITY:
+            return cached
+        return None
+
+    def _refresh(self, scope: str) -> asyncio.Task:
+        """Start (or join) the refresh of ``scope`` on the running loop."""
+        loop = asyncio.get_running_loop()
+        task = self._refreshes.get(scope)
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(asyncio.to_thread(self._fetch, scope, True))
+            task.add_done_callback(self._log_failed_refresh)
+            self._refreshes[scope] = task
+        return task
+
+    def _fetch(self, scope: str, renew: bool = False) -> _CachedToken:
+        with self._fetch_lock:
+            # Another thread may have fetched while we waited for the lock
+            cached = self._tokens.get(scope)
+            if cached is not None and cached.expires_on - time.time() > (
+                self.refresh_margin if renew else MIN_VALIDITY
+            ):
+                return cached
+            credential = self._credential or _get_credential()
+            result = credential.get_token(scope)
+            cached = self._tokens[scope] = _CachedToken(result.token, float(result.expires_on))
+            logger.debug("Token for %s refreshed, expires in %.0fs", scope, cached.expires_on - time.time())
+            return cached
+
+    @staticmethod
+    def _log_failed_refresh(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Token refresh failed: %s", task.exception())
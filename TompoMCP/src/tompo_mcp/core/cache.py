@@ -0,0 +1,225 @@
+"""Persistent on-disk cache of item definitions (SQLite — standard library only).
+
+Definitions are stored as their decoded parts (path → bytes) keyed by workspace,
+item type and item id, together with the item's last-modified version string
+from the Fabric admin item listing. An entry whose version differs from the one looked
+up is dropped, so changed items are re-downloaded automatically. When either
+side's version is unknown (e.g. an item fetched without a prior listing) the
+entry can't be validated and only hits while it is younger than the
+unversioned maximum age; a versioned entry is kept for versioned lookups.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from tompo_mcp.core.definition import PartContent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "tompo-mcp")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+# Items without a known modification time can't be validated, so keep them briefly
+DEFAULT_UNVERSIONED_MAX_AGE = 3600
+
+# Fabric admin item field that changes whenever an item's definition changes.
+# The Power BI groups/{id}/datasets and /reports listings carry no such field.
+VERSION_FIELD = "lastUpdatedDate"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    workspace_id TEXT NOT NULL,
+    item_type    TEXT NOT NULL,
+    item_id      TEXT NOT NULL,
+    version      TEXT NOT NULL,
+    format       TEXT NOT NULL,
+    size         INTEGER NOT NULL,
+    created_at   REAL NOT NULL,
+    accessed_at  REAL NOT NULL,
+    PRIMARY KEY (workspace_id, item_type, item_id)
+);
+CREATE TABLE IF NOT EXISTS parts (
+    workspace_id TEXT NOT NULL,
+    item_type    TEXT NOT NULL,
+    item_id      TEXT NOT NULL,
+    path         TEXT NOT NULL,
+    is_text      INTEGER NOT NULL,
+    content      BLOB NOT NULL,
+    PRIMARY KEY (workspace_id, item_type, item_id, path)
+);
+CREATE INDEX IF NOT EXISTS ix_items_accessed ON items (accessed_at);
+"""
+
+
+def item_version(item: dict[str, Any]) -> str:
+    """Return the modification marker of a Fabric admin item entry, or "" if none."""
+    value = item.get(VERSION_FIELD)
+    return str(value) if value else ""
+
+
+class DefinitionCache:
+    """SQLite-backed definition cache with size and age eviction.
+
+    Safe to call from worker threads (``asyncio.to_thread``); a single
+    connection is shared behind a lock.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float = DEFAULT_MAX_AGE,
+        unversioned_max_age: float = DEFAULT_UNVERSIONED_MAX_AGE,
+    ) -> None:
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.unversioned_max_age = unversioned_max_age
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        self.path = os.path.join(self.cache_dir, "definitions.sqlite")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self.evict()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(
+        self, workspace_id: str, item_type: str, item_id: str, version: str
+    ) -> Optional[tuple[str, dict[str, PartContent]]]:
+        """Return ``(format, parts)`` if a fresh entry for this version exists.
+
+        ``version=""`` means the caller doesn't know the item's version.
+        """
+        now = time.time()
+        key = (workspace_id, item_type, item_id)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, format, created_at FROM items"
+                " WHERE workspace_id = ? AND item_type = ? AND item_id = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            cached_version, fmt, created_at = row
+            if version and cached_version and cached_version != version:
+                self._delete(key)  # the item changed since it was cached
+                return None
+            age = now - created_at
+            validated = bool(version) and cached_version == version
+            if age > (self.max_age if validated else self.unversioned_max_age):
+                if cached_version and not version and age <= self.max_age:
+                    return None  # still valid for lookups that know the version
+                self._delete(key)
+                return None
+
+            parts: dict[str, PartContent] = {}
+            for path, is_text, content in self._conn.execute(
+                "SELECT path, is_text, content FROM parts"
+                " WHERE workspace_id = ? AND item_type = ? AND item_id = ?",
+                key,
+            ):
+                data = zlib.decompress(content)
+                parts[path] = data.decode("utf-8") if is_text else data
+            self._conn.execute(
+                "UPDATE items SET accessed_at = ?"
+                " WHERE workspace_id = ? AND item_type = ? AND item_id = ?",
+                (now, *key),
+            )
+        return fmt, parts
+
+    def put(
+        self,
+        workspace_id: str,
+        item_type: str,
+        item_id: str,
+        version: str,
+        fmt: str,
+        parts: Iterable[tuple[str, PartContent]],
+    ) -> None:
+        now = time.time()
+        key = (workspace_id, item_type, item_id)
+        rows = []
+        size = 0
+        for path, content in parts:
+            is_text = isinstance(content, str)
+            blob = zlib.compress(content.encode("utf-8") if is_text else content)
+            size += len(blob)
+            rows.append((*key, path, int(is_text), blob))
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._delete(key)
+                self._conn.execute(
+                    "INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*key, version, fmt, size, now, now),
+                )
+                self._conn.executemany("INSERT INTO parts VALUES (?, ?, ?, ?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        self.evict()
+
+    def invalidate(self, workspace_id: str, item_type: str, item_id: str) -> None:
+        with self._lock:
+            self._delete((workspace_id, item_type, item_id))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM parts")
+            self._conn.execute("DELETE FROM items")
+
+    def evict(self) -> int:
+        """Drop expired entries, then least-recently-used ones until under ``max_bytes``."""
+        now = time.time()
+        evicted = 0
+        with self._lock:
+            expired = self._conn.execute(
+                "SELECT workspace_id, item_type, item_id FROM items"
+                " WHERE created_at < ? OR (version = '' AND created_at < ?)",
+                (now - self.max_age, now - self.unversioned_max_age),
+            ).fetchall()
+            for key in expired:
+                self._delete(key)
+                evicted += 1
+
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM items").fetchone()[0]
+            if total > self.max_bytes:
+                for *key, size in self._conn.execute(
+                    "SELECT workspace_id, item_type, item_id, size FROM items ORDER BY accessed_at"
+                ).fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    self._delete(tuple(key))
+                    total -= size
+                    evicted += 1
+
+        if evicted:
+            logger.info("Evicted %d cached definition(s)", evicted)
+        return evicted
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM items"
+            ).fetchone()
+        return {"items": count, "bytes": size}
+
+    def _delete(self, key: tuple[str, ...]) -> None:
+        # Caller holds self._lock
+        where = " WHERE workspace_id = ? AND item_type = ? AND item_id = ?"
+        self._conn.execute("DELETE FROM parts" + where, key)
+        self._conn.execute("DELETE FROM items" + where, key)
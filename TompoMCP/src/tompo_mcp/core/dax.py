@@ -0,0 +1,132 @@
+"""DAX field references and the dependency graph between a model's fields.
+
+Measures and calculated columns name the fields they use as ``'Table'[Column]``,
+``Table[Column]`` or a bare ``[Name]`` (a measure, or a column of the same
+table). ``extract_references`` finds those tokens, skipping string literals and
+comments; ``DaxDependencyGraph`` resolves them against a model so impact
+analysis can follow a column through every measure built on top of it.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import Optional
+
+from tompo_mcp.core.models import SemanticModelInfo
+
+# (table_name, field_name, field_type), as in report field bindings
+FieldRef = tuple[str, str, str]
+
+_TOKEN = re.compile(
+    r"""
+      "(?:[^"]|"")*"                                           # string literal
+    | //[^\n]* | --[^\n]*                                      # line comment
+    | /\*.*?(?:\*/|\Z)                                         # block comment
+    | '(?P<qtable>(?:[^']|'')+)'\s*\[(?P<qname>(?:[^\]]|\]\])+)\]   # 'My Table'[Field]
+    | (?P<table>[^\W\d]\w*)\[(?P<tname>(?:[^\]]|\]\])+)\]      # Table[Field]
+    | \[(?P<name>(?:[^\]]|\]\])+)\]                            # [Field]
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+
+def extract_references(expression: str) -> list[tuple[str, str]]:
+    """``(table, field)`` for every field a DAX expression names, in order, once each.
+
+    ``table`` is empty for a bare ``[Name]``.
+    """
+    refs: dict[tuple[str, str], None] = {}
+    for match in _TOKEN.finditer(expression):
+        qtable, qname, table, tname, name = match.group("qtable", "qname", "table", "tname", "name")
+        if qname is not None:
+            ref = (qtable.replace("''", "'"), qname.replace("]]", "]"))
+        elif tname is not None:
+            ref = (table, tname.replace("]]", "]"))
+        elif name is not None:
+            ref = ("", name.replace("]]", "]"))
+        else:
+            continue  # string literal or comment
+        refs.setdefault(ref)
+    return list(refs)
+
+
+class DaxDependencyGraph:
+    """Which measures and calculated columns use each field of one model.
+
+    Built once from every field's expression. The transitive dependents of a
+    field — measures on measures on a column — are computed on first request
+    and cached, so repeated impact lookups only pay for the traversal once.
+    Names resolve case-insensitively, as in DAX.
+    """
+
+    def __init__(self, fields: Iterable[tuple[str, str, str, Optional[str]]]) -> None:
+        """``fields`` are ``(table, name, field_type, expression)`` for every column and measure."""
+        fields = list(fields)
+        self._columns: dict[tuple[str, str], FieldRef] = {}
+        self._measures: dict[str, FieldRef] = {}
+        self._named: dict[str, list[FieldRef]] = {}
+        for table, name, field_type, _ in fields:
+            ref = (table, name, field_type)
+            if field_type == "measure":
+                self._measures.setdefault(name.casefold(), ref)
+            else:
+                self._columns.setdefault((table.casefold(), name.casefold()), ref)
+            self._named.setdefault(name.casefold(), []).append(ref)
+
+        self._used_by: dict[FieldRef, list[FieldRef]] = {}
+        for table, name, field_type, expression in fields:
+            if not expression:
+                continue
+            ref = (table, name, field_type)
+            for target in self._resolve(table, expression):
+                users = self._used_by.setdefault(target, [])
+                if target != ref and ref not in users:
+                    users.append(ref)
+        self._closure: dict[FieldRef, tuple[FieldRef, ...]] = {}
+
+    @classmethod
+    def from_model(cls, model: SemanticModelInfo) -> DaxDependencyGraph:
+        return cls(
+            field
+            for table in model.tables
+            for field in (
+                *((table.name, c.name, "column", c.expression) for c in table.columns),
+                *((table.name, m.name, "measure", m.expression) for m in table.measures),
+            )
+        )
+
+    def _resolve(self, home_table: str, expression: str) -> Iterator[FieldRef]:
+        for table, name in extract_references(expression):
+            key = name.casefold()
+            if table:
+                ref = self._columns.get((table.casefold(), key)) or self._measures.get(key)
+            else:
+                ref = self._measures.get(key) or self._columns.get((home_table.casefold(), key))
+            if ref is not None:
+                yield ref
+
+    def fields_named(self, name: str) -> list[FieldRef]:
+        """Every column and measure of the model called ``name`` (case-insensitive)."""
+        return self._named.get(name.casefold(), [])
+
+    def used_by(self, ref: FieldRef) -> list[FieldRef]:
+        """Fields whose own expression names ``ref``."""
+        return self._used_by.get(ref, [])
+
+    def dependents(self, ref: FieldRef) -> tuple[FieldRef, ...]:
+        """Every field that uses ``ref``, directly or through other fields, nearest first."""
+        cached = self._closure.get(ref)
+        if cached is None:
+            seen = {ref}
+            order: list[FieldRef] = []
+            queue = deque([ref])
+            while queue:
+                for user in self._used_by.get(queue.popleft(), ()):
+                    if user not in seen:
+                        seen.add(user)
+                        order.append(user)
+                        queue.append(user)
+            cached = self._closure[ref] = tuple(order)
+        return cached
@@ -0,0 +1,150 @@
+"""Lazily decoded item definitions returned by getDefinition or the local cache.
+
+A definition behaves like the plain ``{path: content}`` dict the parser has
+always consumed, but each part is only base64/UTF-8/JSON decoded the first time
+it is read, and its raw payload is released as soon as it has been decoded
+(keeping only a hash of it, so the definition's digest doesn't depend on which
+parts have been read). Parts the parser never touches (static resources,
+bookmarks) are never decoded.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+import logging
+from collections.abc import Iterator, Mapping
+from typing import Any, Union
+
+from tompo_mcp.core import fastjson
+
+logger = logging.getLogger(__name__)
+
+# Parts no parser reads — images, themes, bookmarks and local editor state
+SKIPPED_PART_MARKERS = ("StaticResources/", "/bookmarks/", ".pbi/")
+
+# Decoded definition part: bytes for InlineBase64 payloads, str for anything passed through as-is
+PartContent = Union[bytes, str]
+
+
+def is_skipped_part(path: str) -> bool:
+    return any(marker in path for marker in SKIPPED_PART_MARKERS)
+
+
+class _Base64Payload(str):
+    """An InlineBase64 payload that has not been decoded yet."""
+
+
+class DefinitionParts(Mapping[str, Any]):
+    """Read-only ``{path: content}`` mapping that decodes parts on first access.
+
+    Content is the parsed JSON for JSON parts, text otherwise, and the original
+    payload when it is not UTF-8 (binary resources). The ``_format`` key holds
+    the definition format, as in the eagerly decoded dicts.
+    """
+
+    def __init__(self, fmt: str, parts: Mapping[str, PartContent]) -> None:
+        self.format = fmt
+        self._paths = ["_format", *parts]
+        self._raw: dict[str, PartContent] = dict(parts)
+        self._loaded: dict[str, Any] = {"_format": fmt}
+        # SHA-256 of the payload of every part decoded so far
+        self._hashes: dict[str, bytes] = {}
+
+    @classmethod
+    def from_response(cls, response_body: Mapping[str, Any]) -> DefinitionParts:
+        """Wrap a getDefinition response body without decoding any payload."""
+        definition = response_body.get("definition", {})
+        parts: dict[str, PartContent] = {}
+        for part in definition.get("parts", []):
+            payload = part.get("payload", "")
+            if part.get("payloadType", "") == "InlineBase64" and payload:
+                payload = _Base64Payload(payload)
+            parts[part.get("path", "")] = payload
+        return cls(definition.get("format", "unknown"), parts)
+
+    def __getitem__(self, path: str) -> Any:
+        if path in self._loaded:
+            return self._loaded[path]
+        raw = self._raw.pop(path)
+        self._hashes[path] = _payload_hash(raw)
+        value = self._loaded[path] = _load_part(path, raw)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._loaded or path in self._raw
+
+    def digest(self) -> str:
+        """SHA-256 over every part's decoded payload, without parsing any of them."""
+        h = hashlib.sha256(self.format.encode("utf-8"))
+        for path in self._paths[1:]:
+            h.update(path.encode("utf-8"))
+            raw = self._raw.get(path)
+            h.update(self._hashes[path] if raw is None else _payload_hash(raw))
+        return h.hexdigest()
+
+    def raw_parts(self) -> Iterator[tuple[str, PartContent]]:
+        """Yield ``(path, bytes | str)`` for every part not yet decoded, one at a time.
+
+        Used to write the definition to the local cache straight after download,
+        before any part has been read.
+        """
+        for path in self._paths[1:]:
+            raw = self._raw.get(path)
+            if raw is None:
+                continue
+            if isinstance(raw, _Base64Payload):
+                try:
+                    yield path, base64.b64decode(raw)
+                    continue
+                except (binascii.Error, ValueError):
+                    raw = str(raw)
+            yield path, raw
+
+
+def _payload_hash(raw: PartContent) -> bytes:
+    """SHA-256 of a part's payload bytes (base64 decoded), the same from the API or the cache."""
+    if isinstance(raw, _Base64Payload):
+        try:
+            content = base64.b64decode(raw)
+        except (binascii.Error, ValueError):
+            content = raw.encode("utf-8")
+    else:
+        content = raw.encode("utf-8") if isinstance(raw, str) else raw
+    return hashlib.sha256(content).digest()
+
+
+def _load_part(path: str, raw: PartContent) -> Any:
+    if isinstance(raw, _Base64Payload):
+        try:
+            raw = base64.b64decode(raw)
+        except (binascii.Error, ValueError) as exc:
+            logger.warning("Failed to decode part %s: %s", path, exc)
+            return str(raw)
+    if isinstance(raw, str):
+        return raw
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        logger.warning("Failed to decode part %s: %s", path, exc)
+        return base64.b64encode(raw).decode("ascii")
+    try:
+        return fastjson.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def definition_digest(definition: Mapping[str, Any]) -> str:
+    """Content hash of a raw definition (getDefinition parts or a fallback API dict)."""
+    if isinstance(definition, DefinitionParts):
+        return definition.digest()
+    payload = json.dumps(definition, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
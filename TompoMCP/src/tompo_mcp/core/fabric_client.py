@@ -3,22 +3,42 @@
 from __future__ import annotations
 
 import asyncio
-import base64
-import json
 import logging
+import time
 from typing import Any, Optional
 
 import httpx
 
-from tompo_mcp.auth import TokenProvider
+from tompo_mcp.auth import FABRIC_SCOPE, GRAPH_SCOPE, POWERBI_SCOPE, TokenProvider
+from tompo_mcp.core.cache import DefinitionCache, item_version
+from tompo_mcp.core.definition import DefinitionParts
+from tompo_mcp.core.labels import Artifact, LabelBatcher, LabelDowngrades
+from tompo_mcp.core.lro import LROScheduler, PollResult
+from tompo_mcp.core.ratelimit import RateLimited, RateLimiter, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
 REQUEST_TIMEOUT = 300.0
 POLL_INTERVAL = 3
 MAX_POLL_ATTEMPTS = 80
+# Backoff grows past POLL_INTERVAL, so bound the total wait by the old fixed-interval
+# timeout; the scheduler stretches it to MAX_POLL_ATTEMPTS × a longer Retry-After
+POLL_DEADLINE = POLL_INTERVAL * MAX_POLL_ATTEMPTS
+
+# Admin Scanner API: workspaces per getInfo call, and how long a scan result is reused
+SCANNER_MAX_WORKSPACES = 100
+SCAN_RESULT_TTL = 600
 
 RESTRICTED_LABELS = {"confidential", "highly confidential", "restricted", "secret"}
+# After a label downgrade, re-read the workspace's admin listing after each of
+# these pauses until the change shows, then retry the fetch once
+LABEL_READY_DELAYS = (0.25, 0.5, 1.0, 2.0, 4.0)
+# Admin item metadata (labels, owners): workspaces per admin/groups listing, how
+# long listings and the General label id are reused, and how soon a failed
+# lookup is retried
+ADMIN_GROUPS_BATCH = 50
+ADMIN_METADATA_TTL = 600
+LOOKUP_FAILURE_TTL = 60
 
 PBI_BASE = "https://api.powerbi.com/v1.0/myorg"
 FABRIC_BASE = "https://api.fabric.microsoft.com/v1"
@@ -27,11 +47,37 @@ FABRIC_BASE = "https://api.fabric.microsoft.com/v1"
 class FabricClient:
     """Async client for Power BI and Fabric REST APIs."""
 
-    def __init__(self, token_provider: TokenProvider) -> None:
+    def __init__(
+        self,
+        token_provider: TokenProvider,
+        cache: Optional[DefinitionCache] = None,
+        lro: Optional[LROScheduler] = None,
+        limiter: Optional[RateLimiter] = None,
+    ) -> None:
         self._tp = token_provider
         self._pbi_base = PBI_BASE
         self._fabric_base = FABRIC_BASE
         self._client: Optional[httpx.AsyncClient] = None
+        self._cache = cache
+        # item id (lowercase) → last-modified marker from the most recent workspace listing
+        self._item_versions: dict[str, str] = {}
+        # Scanner API results: workspace id → (started, scan task); dataset id → (scanned, dataset)
+        self._workspace_scans: dict[str, tuple[float, asyncio.Task]] = {}
+        self._scanned_datasets: dict[str, tuple[float, dict[str, Any]]] = {}
+        # One poller for every pending getDefinition / scan operation of this client
+        self._lro = lro or LROScheduler(
+            base_delay=POLL_INTERVAL, max_attempts=MAX_POLL_ATTEMPTS, deadline=POLL_DEADLINE
+        )
+        # Per-endpoint throttling shared by every request of this client
+        self._limiter = limiter or RateLimiter()
+        # Temporary label downgrades, batched into shared setLabels calls
+        self._labels = LabelDowngrades(LabelBatcher(self._set_labels))
+        self._label_ready_delays = LABEL_READY_DELAYS
+        # Admin listings: workspace id → (started, listing task); (type, item id) → (fetched, admin item)
+        self._admin_listings: dict[str, tuple[float, asyncio.Task]] = {}
+        self._artifact_metadata: dict[Artifact, tuple[float, dict[str, Any]]] = {}
+        # General label discovery: (started, lookup task)
+        self._general_label: Optional[tuple[float, asyncio.Task]] = None
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create a shared httpx client (connection pooling)."""
@@ -43,59 +89,111 @@ class FabricClient:
         if self._client and not self._client.is_closed:
             await self._client.aclose()
 
-    def _pbi_headers(self) -> dict[str, str]:
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send through the rate limiter; raises ``RateLimited`` if throttling persists."""
+        client = await self._get_client()
+        return await self._limiter.send(client, method, url, **kwargs)
+
+    async def _pbi_headers(self) -> dict[str, str]:
         return {
-            "Authorization": f"Bearer {self._tp.get_powerbi_token()}",
+            "Authorization": f"Bearer {await self._tp.get_token_async(POWERBI_SCOPE)}",
             "Content-Type": "application/json",
         }
 
-    def _fabric_headers(self) -> dict[str, str]:
+    async def _fabric_headers(self) -> dict[str, str]:
         return {
-            "Authorization": f"Bearer {self._tp.get_fabric_token()}",
+            "Authorization": f"Bearer {await self._tp.get_token_async(FABRIC_SCOPE)}",
             "Content-Type": "application/json",
         }
 
     # ── Workspace Operations ──────────────────────────────────────────
 
     async def list_workspaces(self) -> list[dict[str, Any]]:
-        client = await self._get_client()
-        resp = await client.get(
-            f"{self._pbi_base}/groups",
-            headers=self._pbi_headers(),
+        resp = await self._request(
+            "GET", f"{self._pbi_base}/groups",
+            headers=await self._pbi_headers(),
             params={"$top": 1000},
         )
         resp.raise_for_status()
         return resp.json().get("value", [])
 
-    async def get_workspace_items(
-        self, workspace_id: str
-    ) -> dict[str, list[dict[str, Any]]]:
-        client = await self._get_client()
-        datasets_resp, reports_resp = await asyncio.gather(
-            client.get(
-                f"{self._pbi_base}/groups/{workspace_id}/datasets",
-                headers=self._pbi_headers(),
+    async def get_workspace_items(self, workspace_id: str) -> dict[str, Any]:
+        """List a workspace's datasets and reports, with their modification markers.
+
+        The Power BI listings carry no modification time, so ``versions`` (lowercase
+        item id → marker) comes from the Fabric admin item listing. It is empty
+        when that listing is unavailable (e.g. without Fabric admin rights).
+        """
+        datasets_resp, reports_resp, versions = await asyncio.gather(
+            self._request(
+                "GET", f"{self._pbi_base}/groups/{workspace_id}/datasets",
+                headers=await self._pbi_headers(),
             ),
-            client.get(
-                f"{self._pbi_base}/groups/{workspace_id}/reports",
-                headers=self._pbi_headers(),
+            self._request(
+                "GET", f"{self._pbi_base}/groups/{workspace_id}/reports",
+                headers=await self._pbi_headers(),
             ),
+            self._list_item_versions(workspace_id),
         )
         datasets_resp.raise_for_status()
         reports_resp.raise_for_status()
+        self._item_versions.update(versions)
         return {
             "datasets": datasets_resp.json().get("value", []),
             "reports": reports_resp.json().get("value", []),
+            "versions": versions,
         }
 
+    async def _list_item_versions(self, workspace_id: str) -> dict[str, str]:
+        """Lowercase item id → lastUpdatedDate for every item in the workspace ({} on failure)."""
+        versions: dict[str, str] = {}
+        params = {"workspaceId": workspace_id}
+        try:
+            while True:
+                resp = await self._request(
+                    "GET", f"{self._fabric_base}/admin/items",
+                    headers=await self._fabric_headers(),
+                    params=params,
+                )
+                if resp.status_code != 200:
+                    logger.info("Admin item listing returned %d; item versions unknown", resp.status_code)
+                    return {}
+                body = resp.json()
+                for item in body.get("itemEntities", []):
+                    version = item_version(item)
+                    if item.get("id") and version:
+                        versions[item["id"].lower()] = version
+                token = body.get("continuationToken")
+                if not token:
+                    return versions
+                params = {"workspaceId": workspace_id, "continuationToken": token}
+        except Exception as exc:
+            logger.warning("Admin item listing failed; item versions unknown: %s", exc)
+            return {}
+
     # ── Semantic Model Definition ─────────────────────────────────────
 
     async def get_semantic_model_definition(
-        self, workspace_id: str, dataset_id: str
+        self,
+        workspace_id: str,
+        dataset_id: str,
+        bypass_cache: bool = False,
+        prefer_scanner: bool = False,
     ) -> Optional[dict[str, Any]]:
+        """Fetch a model definition: getDefinition, then Scanner API, then DAX INFO.
+
+        With ``prefer_scanner``, a dataset already present in a recent Scanner API
+        result (see ``scan_workspaces_admin``) is served from it without calling
+        getDefinition.
+        """
         async def _fetch_all_strategies():
+            if prefer_scanner:
+                scanned = self._get_scanned_dataset(dataset_id)
+                if scanned:
+                    return scanned
+
             definition = await self._get_definition_fabric(
-                workspace_id, "semanticModels", dataset_id
+                workspace_id, "semanticModels", dataset_id, bypass_cache
             )
             if definition:
                 return definition
@@ -112,9 +210,13 @@ class FabricClient:
 
             return None
 
-        result = await self._with_label_downgrade(
-            workspace_id, "datasets", dataset_id, _fetch_all_strategies
-        )
+        try:
+            result = await self._with_label_downgrade(
+                workspace_id, "datasets", dataset_id, _fetch_all_strategies
+            )
+        except RateLimited as exc:
+            logger.warning("Skipping dataset %s: %s", dataset_id, exc)
+            return None
 
         if not result:
             logger.error(
@@ -124,142 +226,209 @@ class FabricClient:
         return result
 
     async def _get_definition_fabric(
-        self, workspace_id: str, item_type: str, item_id: str
+        self, workspace_id: str, item_type: str, item_id: str, bypass_cache: bool = False
     ) -> Optional[dict[str, Any]]:
+        version = self._item_versions.get(item_id.lower(), "")
+        if self._cache and not bypass_cache:
+            try:
+                cached = await asyncio.to_thread(
+                    self._cache.get, workspace_id, item_type, item_id, version
+                )
+                if cached:
+                    logger.info("Serving %s/%s definition from local cache", item_type, item_id)
+                    return DefinitionParts(*cached)
+            except Exception as exc:
+                logger.warning("Definition cache read failed: %s", exc)
+
         try:
-            client = await self._get_client()
             url = f"{self._fabric_base}/workspaces/{workspace_id}/{item_type}/{item_id}/getDefinition"
-            resp = await client.post(url, headers=self._fabric_headers())
+            resp = await self._request("POST", url, headers=await self._fabric_headers())
 
             if resp.status_code == 200:
-                return self._decode_definition_parts(resp.json())
-            if resp.status_code == 202:
-                return await self._poll_long_running_operation(client, resp)
-
-            logger.warning(
-                "getDefinition returned %d for %s/%s",
-                resp.status_code, item_type, item_id,
-            )
-            return None
+                body = resp.json()
+            elif resp.status_code == 202:
+                body = await self._poll_long_running_operation(resp)
+                if body is None:
+                    return None
+            else:
+                logger.warning(
+                    "getDefinition returned %d for %s/%s",
+                    resp.status_code, item_type, item_id,
+                )
+                return None
+        except RateLimited:
+            # Still throttled after retries: falling back to other APIs would only add load
+            raise
         except Exception as exc:
             logger.warning("Fabric getDefinition failed: %s", exc)
             return None
 
+        if "definition" not in body:
+            return body
+
+        definition = DefinitionParts.from_response(body)
+        if self._cache:
+            try:
+                await asyncio.to_thread(
+                    self._cache.put, workspace_id, item_type, item_id, version,
+                    definition.format, definition.raw_parts(),
+                )
+            except Exception as exc:
+                logger.warning("Definition cache write failed: %s", exc)
+        return definition
+
     async def _poll_long_running_operation(
-        self, client: httpx.AsyncClient, initial_resp: httpx.Response
+        self, initial_resp: httpx.Response
     ) -> Optional[dict[str, Any]]:
         location = initial_resp.headers.get("Location")
-        retry_after = int(initial_resp.headers.get("Retry-After", str(POLL_INTERVAL)))
 
         if not location:
             logger.warning("No Location header in 202 response")
             return None
 
-        for _attempt in range(MAX_POLL_ATTEMPTS):
-            await asyncio.sleep(retry_after)
-            poll_resp = await client.get(location, headers=self._fabric_headers())
-
-            if poll_resp.status_code == 200:
-                body = poll_resp.json()
-                if "definition" in body:
-                    return self._decode_definition_parts(body)
-                result_location = poll_resp.headers.get("Location")
-                if result_location:
-                    result_resp = await client.get(
-                        result_location, headers=self._fabric_headers()
-                    )
-                    if result_resp.status_code == 200:
-                        return self._decode_definition_parts(result_resp.json())
-                return body
+        async def _poll() -> PollResult:
+            poll_resp = await self._request("GET", location, headers=await self._fabric_headers())
 
             if poll_resp.status_code == 202:
-                retry_after = int(
-                    poll_resp.headers.get("Retry-After", str(POLL_INTERVAL))
+                return False, None, parse_retry_after(poll_resp)
+            if poll_resp.status_code != 200:
+                logger.warning("Poll returned unexpected status %d", poll_resp.status_code)
+                return True, None, None
+
+            body = poll_resp.json()
+            if "definition" in body:
+                return True, body, None
+            status = body.get("status")
+            if status in ("NotStarted", "Running"):
+                return False, None, parse_retry_after(poll_resp)
+            if status == "Failed":
+                logger.warning("Long-running operation failed: %s", body.get("error"))
+                return True, None, None
+            result_location = poll_resp.headers.get("Location")
+            if result_location:
+                result_resp = await self._request(
+                    "GET", result_location, headers=await self._fabric_headers()
                 )
-                continue
+                if result_resp.status_code == 200:
+                    return True, result_resp.json(), None
+            return True, body, None
 
-            logger.warning("Poll returned unexpected status %d", poll_resp.status_code)
+        try:
+            return await self._lro.wait(_poll, parse_retry_after(initial_resp), name=location)
+        except TimeoutError:
+            logger.error("Long-running operation timed out")
             return None
 
-        logger.error("Long-running operation timed out")
-        return None
+    def _decode_definition_parts(self, response_body: dict[str, Any]) -> DefinitionParts:
+        return DefinitionParts.from_response(response_body)
 
-    def _decode_definition_parts(self, response_body: dict[str, Any]) -> dict[str, Any]:
-        definition = response_body.get("definition", {})
-        parts = definition.get("parts", [])
-        decoded: dict[str, Any] = {"_format": definition.get("format", "unknown")}
-
-        for part in parts:
-            path = part.get("path", "")
-            payload = part.get("payload", "")
-            payload_type = part.get("payloadType", "")
-
-            if payload_type == "InlineBase64" and payload:
-                try:
-                    decoded_bytes = base64.b64decode(payload)
-                    content = decoded_bytes.decode("utf-8")
-                    try:
-                        decoded[path] = json.loads(content)
-                    except json.JSONDecodeError:
-                        decoded[path] = content
-                except Exception as exc:
-                    logger.warning("Failed to decode part %s: %s", path, exc)
-                    decoded[path] = payload
-            else:
-                decoded[path] = payload
+    # ── Fallback: Admin Scanner API ───────────────────────────────────
 
-        return decoded
+    async def scan_workspaces_admin(
+        self, workspace_ids: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Scan workspaces with the Admin Scanner API, batching up to 100 per call.
+
+        Every dataset in the results is kept for ``SCAN_RESULT_TTL`` seconds so
+        later Scanner fallbacks for the same workspace are answered without a new
+        scan. Workspaces already being scanned are joined rather than re-scanned.
+        Returns dataset id → scanner dataset for the requested workspaces.
+        """
+        now = time.monotonic()
+        wanted = list(dict.fromkeys(workspace_ids))
+        to_scan = [
+            ws for ws in wanted
+            if ws not in self._workspace_scans
+            or now - self._workspace_scans[ws][0] > SCAN_RESULT_TTL
+        ]
+        for i in range(0, len(to_scan), SCANNER_MAX_WORKSPACES):
+            chunk = to_scan[i:i + SCANNER_MAX_WORKSPACES]
+            task = asyncio.ensure_future(self._run_admin_scan(chunk))
+            for ws in chunk:
+                self._workspace_scans[ws] = (now, task)
+
+        await asyncio.gather(*{self._workspace_scans[ws][1] for ws in wanted})
+
+        wanted_set = {ws.lower() for ws in wanted}
+        return {
+            ds_id: ds
+            for ds_id, (_scanned_at, ds) in self._scanned_datasets.items()
+            if ds.get("_workspace_id") in wanted_set
+        }
 
-    # ── Fallback: Admin Scanner API ───────────────────────────────────
+    def _get_scanned_dataset(self, dataset_id: str) -> Optional[dict[str, Any]]:
+        entry = self._scanned_datasets.get(dataset_id)
+        if not entry or time.monotonic() - entry[0] > SCAN_RESULT_TTL:
+            return None
+        return {"_source": "scanner", "dataset": entry[1]}
 
     async def _scan_workspace_admin(
         self, workspace_id: str, dataset_id: str
     ) -> Optional[dict[str, Any]]:
+        scanned = self._get_scanned_dataset(dataset_id)
+        if scanned:
+            return scanned
+        await self.scan_workspaces_admin([workspace_id])
+        return self._get_scanned_dataset(dataset_id)
+
+    async def _run_admin_scan(self, workspace_ids: list[str]) -> bool:
+        """Trigger one getInfo scan, wait for it and index every dataset it returns."""
         try:
-            client = await self._get_client()
-            scan_resp = await client.post(
-                f"{self._pbi_base}/admin/workspaces/getInfo",
-                headers=self._pbi_headers(),
+            scan_resp = await self._request(
+                "POST", f"{self._pbi_base}/admin/workspaces/getInfo",
+                headers=await self._pbi_headers(),
                 params={"datasetSchema": "true", "datasetExpressions": "true"},
-                json={"workspaces": [workspace_id]},
+                json={"workspaces": workspace_ids},
             )
 
             if scan_resp.status_code != 202:
                 logger.warning("Scanner API trigger returned %d", scan_resp.status_code)
-                return None
+                return False
 
             scan_id = scan_resp.json().get("id")
             if not scan_id:
-                return None
+                return False
 
-            for _ in range(MAX_POLL_ATTEMPTS):
-                await asyncio.sleep(POLL_INTERVAL)
-                status_resp = await client.get(
-                    f"{self._pbi_base}/admin/workspaces/scanStatus/{scan_id}",
-                    headers=self._pbi_headers(),
+            async def _poll_scan() -> PollResult:
+                status_resp = await self._request(
+                    "GET", f"{self._pbi_base}/admin/workspaces/scanStatus/{scan_id}",
+                    headers=await self._pbi_headers(),
                 )
-                status = status_resp.json()
-                if status.get("status") == "Succeeded":
-                    break
-            else:
+                status = status_resp.json().get("status")
+                if status == "Succeeded":
+                    return True, True, None
+                if status == "Failed":
+                    return True, False, None
+                return False, None, parse_retry_after(status_resp)
+
+            try:
+                succeeded = await self._lro.wait(_poll_scan, name=f"scan {scan_id}")
+            except TimeoutError:
                 logger.error("Scanner API timed out")
-                return None
+                return False
+            if not succeeded:
+                logger.warning("Scanner API scan %s failed", scan_id)
+                return False
 
-            result_resp = await client.get(
-                f"{self._pbi_base}/admin/workspaces/scanResult/{scan_id}",
-                headers=self._pbi_headers(),
+            result_resp = await self._request(
+                "GET", f"{self._pbi_base}/admin/workspaces/scanResult/{scan_id}",
+                headers=await self._pbi_headers(),
             )
             result_resp.raise_for_status()
             scan_result = result_resp.json()
 
+            scanned_at = time.monotonic()
+            count = 0
             for ws in scan_result.get("workspaces", []):
                 for ds in ws.get("datasets", []):
-                    if ds.get("id") == dataset_id:
-                        return {"_source": "scanner", "dataset": ds}
-            return None
+                    if ds.get("id"):
+                        self._scanned_datasets[ds["id"]] = (scanned_at, {**ds, "_workspace_id": (ws.get("id") or "").lower()})
+                        count += 1
+            logger.info("Scanner API returned %d dataset(s) for %d workspace(s)", count, len(workspace_ids))
+            return True
         except Exception as exc:
             logger.warning("Admin Scanner API failed: %s", exc)
-            return None
+            return False
 
     # ── Fallback: DAX executeQueries ──────────────────────────────────
 
@@ -274,29 +443,31 @@ class FabricClient:
             "roles": "EVALUATE SELECTCOLUMNS(INFO.ROLES(), \"ID\", [ID], \"Name\", [Name], \"ModelPermission\", [ModelPermission], \"Description\", [Description])",
         }
 
-        try:
-            results: dict[str, Any] = {"_source": "dax"}
-            client = await self._get_client()
-            for key, dax in dax_queries.items():
-                resp = await client.post(
-                    f"{self._pbi_base}/groups/{workspace_id}/datasets/{dataset_id}/executeQueries",
-                    headers=self._pbi_headers(),
-                    json={
-                        "queries": [{"query": dax}],
-                        "serializerSettings": {"includeNulls": True},
-                    },
+        # executeQueries accepts one query per request, so the INFO queries run concurrently
+        async def _run_query(key: str, dax: str) -> list[dict[str, Any]]:
+            resp = await self._request(
+                "POST", f"{self._pbi_base}/groups/{workspace_id}/datasets/{dataset_id}/executeQueries",
+                headers=await self._pbi_headers(),
+                json={
+                    "queries": [{"query": dax}],
+                    "serializerSettings": {"includeNulls": True},
+                },
+            )
+            if resp.status_code == 200:
+                data = resp.json()
+                return (
+                    data.get("results", [{}])[0]
+                    .get("tables", [{}])[0]
+                    .get("rows", [])
                 )
-                if resp.status_code == 200:
-                    data = resp.json()
-                    rows = (
-                        data.get("results", [{}])[0]
-                        .get("tables", [{}])[0]
-                        .get("rows", [])
-                    )
-                    results[key] = rows
-                else:
-                    logger.warning("DAX query for '%s' returned %d", key, resp.status_code)
-                    results[key] = []
+            logger.warning("DAX query for '%s' returned %d", key, resp.status_code)
+            return []
+
+        try:
+            rows = await asyncio.gather(
+                *[_run_query(key, dax) for key, dax in dax_queries.items()]
+            )
+            results: dict[str, Any] = {"_source": "dax", **dict(zip(dax_queries, rows))}
 
             return results if any(results.get(k) for k in dax_queries) else None
         except Exception as exc:
@@ -306,11 +477,11 @@ class FabricClient:
     # ── Report Definition ─────────────────────────────────────────────
 
     async def get_report_definition(
-        self, workspace_id: str, report_id: str
+        self, workspace_id: str, report_id: str, bypass_cache: bool = False
     ) -> Optional[dict[str, Any]]:
         async def _fetch_report():
             definition = await self._get_definition_fabric(
-                workspace_id, "reports", report_id
+                workspace_id, "reports", report_id, bypass_cache
             )
             if definition:
                 return definition
@@ -321,18 +492,21 @@ class FabricClient:
                 return {"_source": "pages_api", "pages": pages}
             return None
 
-        return await self._with_label_downgrade(
-            workspace_id, "reports", report_id, _fetch_report
-        )
+        try:
+            return await self._with_label_downgrade(
+                workspace_id, "reports", report_id, _fetch_report
+            )
+        except RateLimited as exc:
+            logger.warning("Skipping report %s: %s", report_id, exc)
+            return None
 
     async def _get_report_pages_fallback(
         self, workspace_id: str, report_id: str
     ) -> Optional[list[dict[str, Any]]]:
         try:
-            client = await self._get_client()
-            resp = await client.get(
-                f"{self._pbi_base}/groups/{workspace_id}/reports/{report_id}/pages",
-                headers=self._pbi_headers(),
+            resp = await self._request(
+                "GET", f"{self._pbi_base}/groups/{workspace_id}/reports/{report_id}/pages",
+                headers=await self._pbi_headers(),
             )
             if resp.status_code == 200:
                 return resp.json().get("value", [])
@@ -343,45 +517,131 @@ class FabricClient:
 
     # ── Sensitivity Label Management ────────────────────────────────────
 
-    async def _get_artifact_sensitivity_label(
+    @staticmethod
+    def _lookup_fresh(started: float, task: asyncio.Task) -> bool:
+        """Whether a cached lookup task may be reused (failures expire sooner)."""
+        failed = task.done() and (task.cancelled() or not task.result())
+        return time.monotonic() - started <= (LOOKUP_FAILURE_TTL if failed else ADMIN_METADATA_TTL)
+
+    async def prefetch_artifact_metadata(
+        self, workspace_ids: list[str], started_after: Optional[float] = None
+    ) -> None:
+        """Load the admin metadata of every dataset and report in the workspaces.
+
+        One ``admin/groups`` call with ``$expand=datasets,reports`` covers up to
+        ``ADMIN_GROUPS_BATCH`` workspaces, and the items are kept for
+        ``ADMIN_METADATA_TTL`` seconds, so the label lookups of a scan are served
+        from memory. Listings already in flight are joined rather than repeated;
+        with ``started_after`` (a ``time.monotonic()`` value) only listings
+        started after it are reused.
+        """
+        wanted = list(dict.fromkeys(ws.lower() for ws in workspace_ids))
+        to_fetch = [
+            ws for ws in wanted
+            if ws not in self._admin_listings
+            or not self._lookup_fresh(*self._admin_listings[ws])
+            or (started_after is not None and self._admin_listings[ws][0] <= started_after)
+        ]
+        now = time.monotonic()
+        for i in range(0, len(to_fetch), ADMIN_GROUPS_BATCH):
+            chunk = to_fetch[i:i + ADMIN_GROUPS_BATCH]
+            task = asyncio.ensure_future(self._fetch_admin_listing(chunk))
+            for ws in chunk:
+                self._admin_listings[ws] = (now, task)
+
+        await asyncio.gather(*{self._admin_listings[ws][1] for ws in wanted})
+
+    async def _fetch_admin_listing(self, workspace_ids: list[str]) -> bool:
+        """One admin/groups call; index every dataset and report it returns."""
+        try:
+            resp = await self._request(
+                "GET", f"{self._pbi_base}/admin/groups",
+                headers=await self._pbi_headers(),
+                params={
+                    "$filter": " or ".join(f"id eq '{ws}'" for ws in workspace_ids),
+                    "$expand": "datasets,reports",
+                    "$top": len(workspace_ids),
+                },
+            )
+            if resp.status_code != 200:
+                logger.warning("Admin workspace listing returned %d", resp.status_code)
+                return False
+            groups = resp.json().get("value", [])
+        except Exception as exc:
+            logger.warning("Admin workspace listing failed: %s", exc)
+            return False
+
+        fetched_at = time.monotonic()
+        for group in groups:
+            for artifact_type in ("datasets", "reports"):
+                for item in group.get(artifact_type) or []:
+                    if item.get("id"):
+                        self._artifact_metadata[(artifact_type, item["id"].lower())] = (fetched_at, item)
+        return True
+
+    async def _get_artifact_metadata(
         self, workspace_id: str, artifact_type: str, artifact_id: str
     ) -> Optional[dict[str, Any]]:
-        try:
-            client = await self._get_client()
-            if artifact_type == "datasets":
-                url = f"{self._pbi_base}/admin/datasets/{artifact_id}"
-            elif artifact_type == "reports":
-                url = f"{self._pbi_base}/admin/reports/{artifact_id}"
-            else:
-                return None
+        """Admin view of one dataset or report (sensitivity label, owner), cached.
 
-            resp = await client.get(url, headers=self._pbi_headers())
-            if resp.status_code == 200:
-                data = resp.json()
-                label = data.get("sensitivityLabel")
-                if label:
-                    return {
-                        "labelId": label.get("labelId"),
-                        "labelName": label.get("labelId"),
-                    }
-                return None
+        Served from the workspace's admin listing, fetched on first use; items
+        missing from it (no listing access, or created since) are asked for one
+        by one.
+        """
+        if artifact_type not in ("datasets", "reports"):
             return None
+        key = (artifact_type, artifact_id.lower())
+        entry = self._artifact_metadata.get(key)
+        if entry is None or time.monotonic() - entry[0] > ADMIN_METADATA_TTL:
+            await self.prefetch_artifact_metadata([workspace_id])
+            entry = self._artifact_metadata.get(key)
+        if entry is None or time.monotonic() - entry[0] > ADMIN_METADATA_TTL:
+            return await self._fetch_admin_item(artifact_type, artifact_id)
+        return entry[1]
+
+    async def _fetch_admin_item(self, artifact_type: str, artifact_id: str) -> Optional[dict[str, Any]]:
+        """Fresh admin view of one dataset or report; refreshes its cache entry."""
+        try:
+            resp = await self._request(
+                "GET", f"{self._pbi_base}/admin/{artifact_type}/{artifact_id}",
+                headers=await self._pbi_headers(),
+            )
+            if resp.status_code != 200:
+                return None
+            item = resp.json()
         except Exception as exc:
-            logger.warning("Failed to get sensitivity label: %s", exc)
+            logger.warning("Failed to get admin metadata for %s/%s: %s", artifact_type, artifact_id, exc)
             return None
+        self._artifact_metadata[(artifact_type, artifact_id.lower())] = (time.monotonic(), item)
+        return item
+
+    async def _get_artifact_sensitivity_label(
+        self, workspace_id: str, artifact_type: str, artifact_id: str
+    ) -> Optional[dict[str, Any]]:
+        data = await self._get_artifact_metadata(workspace_id, artifact_type, artifact_id)
+        label = data.get("sensitivityLabel") if data else None
+        if label:
+            return {
+                "labelId": label.get("labelId"),
+                "labelName": label.get("labelId"),
+            }
+        return None
 
     async def _get_general_label_id(self) -> Optional[str]:
-        if hasattr(self, "_general_label_id_cache"):
-            return self._general_label_id_cache
+        """Id of the tenant's General (or Public) label; concurrent callers share one lookup."""
+        entry = self._general_label
+        if entry is None or not self._lookup_fresh(*entry):
+            entry = self._general_label = (time.monotonic(), asyncio.ensure_future(self._find_general_label_id()))
+        return await asyncio.shield(entry[1])
 
+    async def _find_general_label_id(self) -> Optional[str]:
         try:
-            client = await self._get_client()
             headers = {
-                "Authorization": f"Bearer {self._tp.get_graph_token()}",
+                "Authorization": f"Bearer {await self._tp.get_token_async(GRAPH_SCOPE)}",
                 "Content-Type": "application/json",
             }
-            resp = await client.get(
-                "https://graph.microsoft.com/v1.0/informationProtection/policy/labels",
+            resp = await self._request(
+                "GET", "https://graph.microsoft.com/v1.0/informationProtection/policy/labels",
                 headers=headers,
             )
             if resp.status_code == 200:
@@ -389,85 +649,88 @@ class FabricClient:
                 for lbl in labels:
                     name = (lbl.get("name") or "").lower()
                     if name in ("general", "public"):
-                        self._general_label_id_cache = lbl["id"]
-                        return self._general_label_id_cache
+                        return lbl["id"]
         except Exception as exc:
             logger.warning("Failed to discover General label ID: %s", exc)
-
-        self._general_label_id_cache = None
         return None
 
-    async def _set_sensitivity_label(
-        self, artifact_type: str, artifact_id: str, label_id: str
-    ) -> bool:
+    async def _set_labels(self, label_id: str, artifacts: list[Artifact]) -> Optional[set[Artifact]]:
+        """One setLabels call for many artifacts; returns those whose label was set.
+
+        None means the outcome is unknown: the request failed without a response.
+        """
+        grouped: dict[str, list[dict[str, str]]] = {}
+        for artifact_type, artifact_id in artifacts:
+            if artifact_type in ("datasets", "reports"):
+                grouped.setdefault(artifact_type, []).append({"id": artifact_id})
+        if not grouped:
+            return set()
         try:
-            field_map = {"datasets": "datasets", "reports": "reports"}
-            field = field_map.get(artifact_type)
-            if not field:
-                return False
-
-            payload = {
-                "artifacts": {field: [{"id": artifact_id}]},
-                "labelId": label_id,
-                "assignmentMethod": "Standard",
-            }
-            client = await self._get_client()
-            resp = await client.post(
-                f"{self._pbi_base}/admin/informationprotection/setLabels",
-                headers=self._pbi_headers(),
-                json=payload,
+            resp = await self._request(
+                "POST", f"{self._pbi_base}/admin/informationprotection/setLabels",
+                headers=await self._pbi_headers(),
+                json={"artifacts": grouped, "labelId": label_id, "assignmentMethod": "Standard"},
             )
-            if resp.status_code == 200:
-                result = resp.json()
-                items = result.get(field, [])
-                if items and items[0].get("status") == "Succeeded":
-                    return True
-            return False
+            if resp.status_code != 200:
+                logger.warning("setLabels returned %d for %d artifact(s)", resp.status_code, len(artifacts))
+                return set()
+            result = resp.json()
+        except RateLimited as exc:
+            logger.warning("setLabels not sent: %s", exc)
+            return set()
         except Exception as exc:
-            logger.warning("Failed to set sensitivity label: %s", exc)
-            return False
+            logger.warning("Failed to set sensitivity labels: %s", exc)
+            return None
+        succeeded = {
+            (artifact_type, item.get("id", "").lower())
+            for artifact_type in grouped
+            for item in result.get(artifact_type, [])
+            if item.get("status") == "Succeeded"
+        }
+        # Keep cached admin metadata in step with the new labels
+        for key in succeeded:
+            if key in self._artifact_metadata:
+                fetched_at, item = self._artifact_metadata[key]
+                self._artifact_metadata[key] = (fetched_at, {**item, "sensitivityLabel": {"labelId": label_id}})
+        return succeeded
 
     async def _with_label_downgrade(
         self, workspace_id: str, artifact_type: str, artifact_id: str, fetch_fn
     ) -> Optional[dict[str, Any]]:
+        """``fetch_fn()``, retried once with the item's label lowered to General if it fails.
+
+        Before the retry, the workspace's admin listing is re-read on a short
+        backoff until the item's label shows General, so ``fetch_fn`` itself runs
+        no more often than without a label. Items downgraded together share each
+        re-read, as downgrades and restores are batched with those of other
+        artifacts, and concurrent fetches of the same artifact share one downgrade.
+        """
         result = await fetch_fn()
         if result is not None:
             return result
 
         logger.info("Initial fetch failed for %s/%s, checking sensitivity label...", artifact_type, artifact_id)
-
-        original_label = await self._get_artifact_sensitivity_label(
-            workspace_id, artifact_type, artifact_id
-        )
-
-        if not original_label or not original_label.get("labelId"):
-            return None
-
-        original_label_id = original_label["labelId"]
         general_label_id = await self._get_general_label_id()
-
-        if not general_label_id or original_label_id == general_label_id:
+        if not general_label_id:
             return None
 
-        logger.info("Temporarily setting %s/%s label to General for parsing...", artifact_type, artifact_id)
-        downgrade_ok = await self._set_sensitivity_label(artifact_type, artifact_id, general_label_id)
+        async def _read_label() -> Optional[str]:
+            label = await self._get_artifact_sensitivity_label(workspace_id, artifact_type, artifact_id)
+            return label.get("labelId") if label else None
 
-        if not downgrade_ok:
+        artifact = (artifact_type, artifact_id)
+        if not await self._labels.acquire(artifact, general_label_id, _read_label):
             return None
-
-        await asyncio.sleep(2)
-
         try:
-            result = await fetch_fn()
-            return result
+            downgraded_at = time.monotonic()
+            for delay in self._label_ready_delays:
+                await asyncio.sleep(delay)
+                await self.prefetch_artifact_metadata([workspace_id], started_after=downgraded_at)
+                if await _read_label() == general_label_id:
+                    break
+            return await fetch_fn()
         finally:
-            logger.info("Restoring original label %s on %s/%s...", original_label_id, artifact_type, artifact_id)
-            restore_ok = await self._set_sensitivity_label(artifact_type, artifact_id, original_label_id)
-            if not restore_ok:
-                logger.error(
-                    "CRITICAL: Failed to restore original label %s on %s/%s!",
-                    original_label_id, artifact_type, artifact_id,
-                )
+            await self._labels.release(artifact)
 
     # ── Reports for Dataset ───────────────────────────────────────────
 
@@ -0,0 +1,28 @@
+"""JSON decoding with orjson when it is installed, the standard library otherwise.
+
+Install the ``fast`` extra (``pip install tompo-mcp[fast]``) to pick up orjson.
+Documents orjson rejects but the standard library accepts (NaN/Infinity
+literals, integers beyond 64 bits) are decoded with ``json`` instead, so both
+backends accept the same input. Errors are always ``json.JSONDecodeError``.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
@@ -0,0 +1,160 @@
+"""Background scan jobs: queue workspace and tenant scans and poll their progress.
+
+A scan tool called with ``background=true`` returns a job id at once and the
+scan runs on the server's event loop, so the client never waits out a long
+scan inside one tool call and other tool calls are served meanwhile. At most
+``workers`` jobs run at a time; later ones wait in submission order, so
+queuing several scans never multiplies the load on the APIs. A job records
+per-model progress, from which status reports derive throughput and an ETA.
+The newest ``keep_finished`` finished jobs stay readable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScanJob:
+    """One queued or running scan and its progress, updated by the scan itself."""
+
+    id: str
+    description: str
+    key: str = ""
+    state: str = "queued"  # queued → running → done | failed
+    submitted_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    models_total: int = 0
+    models_done: int = 0
+    models_failed: int = 0
+    reports_done: int = 0
+    # names of the models being scanned right now, in start order
+    in_progress: list[str] = field(default_factory=list)
+    result: Optional[str] = None
+    error: Optional[str] = None
+
+    # ── Progress hooks (called by the scan) ───────────────────────────
+
+    def set_total(self, models: int) -> None:
+        self.models_total = models
+
+    def model_started(self, name: str) -> None:
+        self.in_progress.append(name)
+
+    def model_finished(self, name: str, reports: int = 0, failed: bool = False) -> None:
+        if name in self.in_progress:
+            self.in_progress.remove(name)
+        self.models_done += 1
+        self.models_failed += failed
+        self.reports_done += reports
+
+    # ── Derived figures ───────────────────────────────────────────────
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("done", "failed")
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds spent running (0 while queued)."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def rate(self) -> Optional[float]:
+        """Models finished per second so far, once at least one has."""
+        elapsed = self.elapsed
+        return self.models_done / elapsed if self.models_done and elapsed > 0 else None
+
+    def eta(self) -> Optional[float]:
+        """Seconds until every model is done at the current rate."""
+        rate = self.rate()
+        if rate is None or not self.models_total or self.finished:
+            return None
+        return max(self.models_total - self.models_done, 0) / rate
+
+
+class ScanJobQueue:
+    """Run submitted scans as asyncio tasks, at most ``workers`` at a time."""
+
+    def __init__(self, workers: int = 2, keep_finished: int = 20) -> None:
+        self.workers = max(1, workers)
+        self.keep_finished = keep_finished
+        self._jobs: dict[str, ScanJob] = {}
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def submit(self, key: str, description: str, run: Callable[[ScanJob], Awaitable[str]]) -> ScanJob:
+        """Queue ``run(job)``; a queued or running job with the same ``key`` is returned instead.
+
+        Must be called from the event loop the jobs run on.
+        """
+        for job in self._jobs.values():
+            if job.key == key and not job.finished:
+                return job
+        job = ScanJob(id=uuid.uuid4().hex[:12], description=description, key=key)
+        self._jobs[job.id] = job
+        self._tasks[job.id] = asyncio.get_running_loop().create_task(self._run(job, run))
+        return job
+
+    def get(self, job_id: str) -> Optional[ScanJob]:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> list[ScanJob]:
+        """Every known job, oldest first."""
+        return list(self._jobs.values())
+
+    def position(self, job: ScanJob) -> int:
+        """1-based place of a queued job in the queue (0 once it has started)."""
+        if job.state != "queued":
+            return 0
+        queued = [j for j in self._jobs.values() if j.state == "queued"]
+        return queued.index(job) + 1
+
+    async def wait(self, job_id: str) -> Optional[ScanJob]:
+        """Wait for a job to finish."""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.shield(task)
+        return self._jobs.get(job_id)
+
+    # ── Internals ────────────────────────────────────────────────────
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop; a new loop (tests) gets new slots
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots, self._loop = asyncio.Semaphore(self.workers), loop
+        return self._slots
+
+    async def _run(self, job: ScanJob, run: Callable[[ScanJob], Awaitable[str]]) -> None:
+        try:
+            async with self._get_slots():
+                job.state, job.started_at = "running", time.monotonic()
+                job.result = await run(job)
+                job.state = "done"
+        except asyncio.CancelledError:
+            job.state, job.error = "failed", "cancelled (server shutting down)"
+            raise
+        except Exception as exc:
+            logger.exception("Scan job %s failed", job.id)
+            job.state, job.error = "failed", str(exc) or type(exc).__name__
+        finally:
+            job.finished_at = time.monotonic()
+            job.in_progress.clear()
+            self._tasks.pop(job.id, None)
+            self._evict()
+
+    def _evict(self) -> None:
+        finished = [j.id for j in self._jobs.values() if j.finished]
+        for job_id in finished[:max(len(finished) - self.keep_finished, 0)]:
+            del self._jobs[job_id]
@@ -0,0 +1,181 @@
+"""Temporary sensitivity-label downgrades, batched and shared across concurrent scans.
+
+Reading the definition of a labelled item means lowering its label to General,
+fetching, and restoring the original label. The admin ``setLabels`` API takes
+arrays of artifacts, so ``LabelBatcher`` collects the requests made within a
+short window and sends one call per target label: a workspace scan downgrades
+every labelled item in one or two calls and restores them the same way.
+
+``LabelDowngrades`` is the per-artifact registry. The first scan that needs an
+item downgraded flips its label and takes a lease; overlapping scans of the
+same item join that lease instead of reading the (already lowered) label and
+flipping it again, and the original label is restored when the last one is done.
+A downgrade the API rejected takes no lease, so nothing is restored for it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# (artifact_type, artifact_id), artifact_type being "datasets" or "reports"
+Artifact = tuple[str, str]
+# setLabels(label_id, artifacts) → the artifacts whose label was set (ids in any
+# case), or None if the outcome is unknown (e.g. the request timed out)
+SetLabelsFn = Callable[[str, list[Artifact]], Awaitable[Optional[set[Artifact]]]]
+
+# Requests to the same label within this many seconds share one setLabels call
+BATCH_WINDOW = 0.2
+MAX_BATCH = 100
+
+
+def _normalize(artifact: Artifact) -> Artifact:
+    return artifact[0], artifact[1].lower()
+
+
+@dataclass
+class _Batch:
+    artifacts: list[Artifact] = field(default_factory=list)
+    done: asyncio.Future[Optional[set[Artifact]]] = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+
+class LabelBatcher:
+    """Coalesce concurrent label changes into one ``setLabels`` call per label."""
+
+    def __init__(self, set_labels: SetLabelsFn, window: float = BATCH_WINDOW, max_batch: int = MAX_BATCH) -> None:
+        self._set_labels = set_labels
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: dict[str, _Batch] = {}
+        self._flushes: set[asyncio.Task[None]] = set()
+        self.calls = 0
+
+    async def set_label(self, artifact: Artifact, label_id: str) -> Optional[bool]:
+        """Set one artifact's label as part of the next batch for ``label_id``.
+
+        True once the API confirmed the change, False if it was rejected, None
+        if the outcome is unknown.
+        """
+        batch = self._pending.get(label_id)
+        if batch is None:
+            batch = self._pending[label_id] = _Batch()
+            self._schedule(label_id, batch, self.window)
+        if artifact not in batch.artifacts:
+            batch.artifacts.append(artifact)
+        if len(batch.artifacts) >= self.max_batch:
+            self._schedule(label_id, batch, 0)
+        succeeded = await asyncio.shield(batch.done)
+        if succeeded is None:
+            return None
+        # Item ids are GUIDs; the API doesn't necessarily echo them in the case they were sent
+        return _normalize(artifact) in {_normalize(a) for a in succeeded}
+
+    def _schedule(self, label_id: str, batch: _Batch, delay: float) -> None:
+        task = asyncio.get_running_loop().create_task(self._flush(label_id, batch, delay))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, label_id: str, batch: _Batch, delay: float) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        if self._pending.get(label_id) is not batch:
+            return  # already sent (filled up before the window closed)
+        del self._pending[label_id]
+        self.calls += 1
+        try:
+            succeeded = await self._set_labels(label_id, batch.artifacts)
+        except Exception as exc:
+            logger.warning("setLabels for %d artifact(s) failed: %s", len(batch.artifacts), exc)
+            succeeded = None
+        batch.done.set_result(succeeded)
+
+
+@dataclass
+class _Lease:
+    original_label: str
+    holders: int = 0
+
+
+@dataclass
+class _ArtifactLock:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    users: int = 0
+
+
+class LabelDowngrades:
+    """Registry of artifacts whose label is temporarily lowered, one lease per artifact."""
+
+    def __init__(self, batcher: LabelBatcher) -> None:
+        self._batcher = batcher
+        self._leases: dict[Artifact, _Lease] = {}
+        # Only kept while someone waits on the artifact or holds its lease
+        self._locks: dict[Artifact, _ArtifactLock] = {}
+
+    async def acquire(
+        self,
+        artifact: Artifact,
+        general_label: str,
+        read_label: Callable[[], Awaitable[Optional[str]]],
+    ) -> bool:
+        """Make sure ``artifact`` carries ``general_label`` until ``release``.
+
+        ``read_label`` fetches the current label and is only called when no
+        other scan holds a lease on the artifact. Returns False, without taking
+        a lease, when the item is unlabelled or already General, or when the API
+        rejected the downgrade. A downgrade whose outcome is unknown (it may have
+        gone through) still takes the lease, so ``release`` puts the original back.
+        """
+        key = _normalize(artifact)
+        async with self._locked(key):
+            lease = self._leases.get(key)
+            if lease is None:
+                original = await read_label()
+                if not original or original == general_label:
+                    return False
+                logger.info("Temporarily setting %s/%s label to General for parsing...", *artifact)
+                outcome = await self._batcher.set_label(artifact, general_label)
+                if outcome is False:
+                    logger.warning("setLabels rejected the General label on %s/%s", *artifact)
+                    return False
+                if outcome is None:
+                    logger.warning("Could not confirm the General label on %s/%s", *artifact)
+                lease = self._leases[key] = _Lease(original)
+            lease.holders += 1
+            return True
+
+    async def release(self, artifact: Artifact) -> bool:
+        """Give up a lease; the last holder restores the original label."""
+        key = _normalize(artifact)
+        async with self._locked(key):
+            lease = self._leases[key]
+            lease.holders -= 1
+            if lease.holders:
+                return True
+            del self._leases[key]
+            logger.info("Restoring original label %s on %s/%s...", lease.original_label, *artifact)
+            restored = bool(await self._batcher.set_label(artifact, lease.original_label))
+            if not restored:
+                logger.error(
+                    "CRITICAL: Failed to restore original label %s on %s/%s!", lease.original_label, *artifact,
+                )
+            return restored
+
+    @contextlib.asynccontextmanager
+    async def _locked(self, key: Artifact) -> AsyncIterator[None]:
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = _ArtifactLock()
+        entry.users += 1
+        try:
+            async with entry.lock:
+                yield
+        finally:
+            entry.users -= 1
+            if not entry.users and key not in self._leases:
+                del self._locks[key]
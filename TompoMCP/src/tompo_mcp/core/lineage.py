@@ -3,19 +3,29 @@
 from __future__ import annotations
 
 import logging
+from typing import Optional
 
+from tompo_mcp.core.dax import DaxDependencyGraph
 from tompo_mcp.core.links import build_report_link, build_visual_link
 from tompo_mcp.core.models import (
     ImpactAnalysisResponse,
     ImpactItem,
     LineageNode,
     LineageResponse,
+    PageInfo,
     ReportInfo,
     SemanticModelInfo,
+    VisualFieldBinding,
+    VisualInfo,
 )
 
 logger = logging.getLogger(__name__)
 
+# (table_name, field_name, field_type) → every visual that binds that field
+FieldKey = tuple[str, str, str]
+BindingLocation = tuple[ReportInfo, PageInfo, VisualInfo]
+FieldUsageIndex = dict[FieldKey, list[BindingLocation]]
+
 
 def build_lineage(
     model: SemanticModelInfo,
@@ -37,9 +47,20 @@ def _build_lineage_tree(
         metadata={"id": model.id, "table_count": len(model.tables)},
     )
 
+    # Single pass over every binding, bucketed by table in report → page → visual order
+    bindings_by_table: dict[str, list[tuple[int, int, int, VisualFieldBinding]]] = {}
+    for ri, report in enumerate(reports):
+        for pi, page in enumerate(report.pages):
+            for vi, visual in enumerate(page.visuals):
+                for fb in visual.field_bindings:
+                    bindings_by_table.setdefault(fb.table_name, []).append((ri, pi, vi, fb))
+
     for table in model.tables:
         if table.is_hidden:
             continue
+        table_bindings = bindings_by_table.get(table.name)
+        if not table_bindings:
+            continue
 
         table_node = LineageNode(
             name=table.name,
@@ -50,21 +71,31 @@ def _build_lineage_tree(
             },
         )
 
-        for report in reports:
-            report_uses_table = False
-            report_link = build_report_link(workspace_id, report.id, "") if workspace_id else None
-            report_node = LineageNode(
-                name=report.name,
-                node_type="report",
-                metadata={"id": report.id, **({
-                    "workspace_id": workspace_id,
-                    "report_link": report_link,
-                } if workspace_id else {})},
-            )
+        current_report = current_page = current_visual = -1
+        report_node = page_node = visual_node = None
+        page_link = None
+        report_ws = workspace_id
+        for ri, pi, vi, fb in table_bindings:
+            report = reports[ri]
+            if ri != current_report:
+                current_report, current_page = ri, -1
+                # Reports may live in another workspace than their model
+                report_ws = report.workspace_id or workspace_id
+                report_link = build_report_link(report_ws, report.id, "") if report_ws else None
+                report_node = LineageNode(
+                    name=report.name,
+                    node_type="report",
+                    metadata={"id": report.id, **({
+                        "workspace_id": report_ws,
+                        "report_link": report_link,
+                    } if report_ws else {})},
+                )
+                table_node.children.append(report_node)
 
-            for page in report.pages:
-                page_uses_table = False
-                page_link = build_report_link(workspace_id, report.id, page.name) if workspace_id else None
+            page = report.pages[pi]
+            if pi != current_page:
+                current_page, current_visual = pi, -1
+                page_link = build_report_link(report_ws, report.id, page.name) if report_ws else None
                 page_node = LineageNode(
                     name=page.display_name,
                     node_type="page",
@@ -72,51 +103,36 @@ def _build_lineage_tree(
                         "report_link": page_link,
                     } if page_link else {})},
                 )
+                report_node.children.append(page_node)
 
-                for visual in page.visuals:
-                    visual_table_bindings = [
-                        fb for fb in visual.field_bindings
-                        if fb.table_name == table.name
-                    ]
-
-                    if visual_table_bindings:
-                        visual_title = visual.title or visual.visual_type
-                        v_link = build_visual_link(
-                            workspace_id, report.id, page.name, visual.visual_id
-                        ) if workspace_id and visual.visual_id else None
-                        visual_node = LineageNode(
-                            name=visual.visual_type,
-                            node_type="visual",
-                            metadata={
-                                "title": visual_title,
-                                **({
-                                    "visual_id": visual.visual_id,
-                                    "visual_link": v_link,
-                                    "report_link": page_link,
-                                } if visual.visual_id else {}),
-                            },
-                        )
-
-                        for fb in visual_table_bindings:
-                            field_node = LineageNode(
-                                name=fb.field_name,
-                                node_type=fb.field_type,
-                                metadata={"table": fb.table_name, "field_type": fb.field_type},
-                            )
-                            visual_node.children.append(field_node)
-
-                        page_node.children.append(visual_node)
-                        page_uses_table = True
-
-                if page_uses_table:
-                    report_node.children.append(page_node)
-                    report_uses_table = True
-
-            if report_uses_table:
-                table_node.children.append(report_node)
+            if vi != current_visual:
+                current_visual = vi
+                visual = page.visuals[vi]
+                visual_title = visual.title or visual.visual_type
+                v_link = build_visual_link(
+                    report_ws, report.id, page.name, visual.visual_id
+                ) if report_ws and visual.visual_id else None
+                visual_node = LineageNode(
+                    name=visual.visual_type,
+                    node_type="visual",
+                    metadata={
+                        "title": visual_title,
+                        **({
+                            "visual_id": visual.visual_id,
+                            "visual_link": v_link,
+                            "report_link": page_link,
+                        } if visual.visual_id else {}),
+                    },
+                )
+                page_node.children.append(visual_node)
+
+            visual_node.children.append(LineageNode(
+                name=fb.field_name,
+                node_type=fb.field_type,
+                metadata={"table": fb.table_name, "field_type": fb.field_type},
+            ))
 
-        if table_node.children:
-            model_node.children.append(table_node)
+        model_node.children.append(table_node)
 
     used_table_names = {child.name for child in model_node.children}
     for table in model.tables:
@@ -135,42 +151,86 @@ def _build_lineage_tree(
     return model_node
 
 
+def build_field_usage_index(reports: list[ReportInfo]) -> FieldUsageIndex:
+    """Walk every report → page → visual → binding once and bucket by field."""
+    index: FieldUsageIndex = {}
+    for report in reports:
+        for page in report.pages:
+            for visual in page.visuals:
+                for fb in visual.field_bindings:
+                    key = (fb.table_name, fb.field_name, fb.field_type)
+                    index.setdefault(key, []).append((report, page, visual))
+    return index
+
+
+def get_field_usage_index(lineage: LineageResponse) -> FieldUsageIndex:
+    """Return the field usage index for a lineage, building it on first use."""
+    if lineage._field_index is None:
+        lineage._field_index = build_field_usage_index(lineage.reports)
+    return lineage._field_index
+
+
+def get_dependency_graph(model: SemanticModelInfo) -> DaxDependencyGraph:
+    """Return the DAX dependency graph of a model, building it on first use."""
+    if model._dax_graph is None:
+        model._dax_graph = DaxDependencyGraph.from_model(model)
+    return model._dax_graph
+
+
+def _impact_item(
+    location: BindingLocation, workspace_id: str, via: Optional[str] = None
+) -> ImpactItem:
+    report, page, visual = location
+    report_ws = report.workspace_id or workspace_id
+    v_link = build_visual_link(
+        report_ws, report.id, page.name, visual.visual_id
+    ) if report_ws and visual.visual_id else None
+    r_link = build_report_link(
+        report_ws, report.id, page.name
+    ) if report_ws else None
+    return ImpactItem(
+        report_name=report.name,
+        page_name=page.display_name,
+        visual_type=visual.visual_type,
+        visual_title=visual.title,
+        visual_link=v_link,
+        report_link=r_link,
+        via=via,
+    )
+
+
 def get_impact_analysis(
     object_name: str,
     object_type: str,
     table_name: str,
     reports: list[ReportInfo],
     workspace_id: str = "",
+    index: Optional[FieldUsageIndex] = None,
+    graph: Optional[DaxDependencyGraph] = None,
 ) -> ImpactAnalysisResponse:
-    used_in: list[ImpactItem] = []
+    """Every visual that binds the field; with ``graph``, also every visual that
+    binds a measure or calculated column derived from it (``ImpactItem.via``)."""
+    if index is None:
+        index = build_field_usage_index(reports)
 
-    for report in reports:
-        for page in report.pages:
-            for visual in page.visuals:
-                for fb in visual.field_bindings:
-                    if (
-                        fb.table_name == table_name
-                        and fb.field_name == object_name
-                        and fb.field_type == object_type
-                    ):
-                        v_link = build_visual_link(
-                            workspace_id, report.id, page.name, visual.visual_id
-                        ) if workspace_id and visual.visual_id else None
-                        r_link = build_report_link(
-                            workspace_id, report.id, page.name
-                        ) if workspace_id else None
-                        used_in.append(ImpactItem(
-                            report_name=report.name,
-                            page_name=page.display_name,
-                            visual_type=visual.visual_type,
-                            visual_title=visual.title,
-                            visual_link=v_link,
-                            report_link=r_link,
-                        ))
+    field = (table_name, object_name, object_type)
+    locations = index.get(field, [])
+    used_in = [_impact_item(location, workspace_id) for location in locations]
+
+    indirect = 0
+    if graph is not None:
+        seen = {id(visual) for _, _, visual in locations}
+        for dependent in graph.dependents(field):
+            for location in index.get(dependent, ()):
+                if id(location[2]) not in seen:
+                    seen.add(id(location[2]))
+                    used_in.append(_impact_item(location, workspace_id, via=dependent[1]))
+                    indirect += 1
 
     return ImpactAnalysisResponse(
         object_name=object_name, object_type=object_type,
         table_name=table_name, used_in=used_in, usage_count=len(used_in),
+        indirect_count=indirect,
     )
 
 
@@ -178,7 +238,12 @@ def get_all_impact_analysis(
     model: SemanticModelInfo,
     reports: list[ReportInfo],
     workspace_id: str = "",
+    index: Optional[FieldUsageIndex] = None,
 ) -> list[ImpactAnalysisResponse]:
+    if index is None:
+        index = build_field_usage_index(reports)
+    graph = get_dependency_graph(model)
+
     results: list[ImpactAnalysisResponse] = []
     for table in model.tables:
         if table.is_hidden:
@@ -186,11 +251,11 @@ def get_all_impact_analysis(
         for col in table.columns:
             if col.is_hidden:
                 continue
-            impact = get_impact_analysis(col.name, "column", table.name, reports, workspace_id)
+            impact = get_impact_analysis(col.name, "column", table.name, reports, workspace_id, index, graph)
             if impact.usage_count > 0:
                 results.append(impact)
         for measure in table.measures:
-            impact = get_impact_analysis(measure.name, "measure", table.name, reports, workspace_id)
+            impact = get_impact_analysis(measure.name, "measure", table.name, reports, workspace_id, index, graph)
             if impact.usage_count > 0:
                 results.append(impact)
     results.sort(key=lambda x: x.usage_count, reverse=True)
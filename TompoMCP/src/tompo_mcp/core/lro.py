@@ -0,0 +1,228 @@
+"""Shared scheduler for polling long-running operations (getDefinition, Scanner API).
+
+Instead of one sleeping coroutine per operation, every pending operation sits in
+a single time-ordered heap and one background loop issues the polls that are
+due. Delays follow capped exponential backoff with jitter, never shorter than
+the server's Retry-After, so hundreds of concurrent operations spread out
+rather than polling in lockstep. An optional deadline bounds the total wait per
+operation whatever the backoff has grown to; it stretches to ``max_attempts``
+times the longest Retry-After the server sent, so a slow server hint doesn't
+cut an operation short.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# A poll returns (done, result, retry_after). retry_after is the server's hint in
+# seconds (None if absent) and is only used when done is False.
+PollResult = tuple[bool, Any, Optional[float]]
+PollFn = Callable[[], Awaitable[PollResult]]
+
+
+@dataclass
+class OperationMetrics:
+    name: str
+    outcome: str  # "succeeded", "failed", "timed_out" or "cancelled"
+    latency: float
+    polls: int
+
+
+@dataclass
+class _Operation:
+    name: str
+    poll: PollFn
+    future: asyncio.Future
+    submitted_at: float
+    polls: int = 0
+    # Longest Retry-After the server has sent for this operation
+    retry_hint: float = 0.0
+
+
+class LROScheduler:
+    """Poll many long-running operations from one loop with jittered backoff."""
+
+    def __init__(
+        self,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        max_attempts: int = 80,
+        max_concurrent_polls: int = 16,
+        history: int = 1000,
+        deadline: Optional[float] = None,
+    ) -> None:
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        # Seconds from submission after which an operation times out (None: no
+        # limit), or max_attempts × its longest Retry-After if that is later
+        self.deadline = deadline
+        self.max_concurrent_polls = max_concurrent_polls
+        self._heap: list[tuple[float, int, _Operation]] = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._polls_in_flight: set[asyncio.Task] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._poll_slots: Optional[asyncio.Semaphore] = None
+        self._history: deque[OperationMetrics] = deque(maxlen=history)
+
+    async def wait(
+        self, poll: PollFn, retry_after: Optional[float] = None, name: str = ""
+    ) -> Any:
+        """Schedule ``poll`` until it reports done and return its result.
+
+        Raises ``TimeoutError`` after ``max_attempts`` polls or once the
+        operation's deadline has passed, and re-raises any exception raised by
+        ``poll`` itself.
+        """
+        loop = asyncio.get_running_loop()
+        self._ensure_runner(loop)
+        op = _Operation(name, poll, loop.create_future(), loop.time())
+        self._schedule(op, retry_after)
+        try:
+            return await op.future
+        except asyncio.CancelledError:
+            self._record(op, "cancelled")
+            raise
+
+    def next_delay(self, polls: int, retry_after: Optional[float] = None) -> float:
+        """Delay before poll number ``polls + 1``: jittered, capped, ≥ Retry-After."""
+        backoff = min(self.max_delay, self.base_delay * (2 ** polls))
+        delay = random.uniform(backoff / 2, backoff)
+        if retry_after is not None:
+            # Spread callers sharing the same hint over the next 10%
+            delay = max(delay, retry_after * random.uniform(1.0, 1.1))
+        return delay
+
+    def metrics(self) -> dict[str, Any]:
+        """Summary of recently finished operations plus the current backlog."""
+        done = list(self._history)
+        latencies = sorted(m.latency for m in done)
+
+        def _pct(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else 0.0
+
+        outcomes: dict[str, int] = {}
+        for m in done:
+            outcomes[m.outcome] = outcomes.get(m.outcome, 0) + 1
+        return {
+            "pending": len(self._heap) + self._active,
+            "finished": len(done),
+            "outcomes": outcomes,
+            "latency_p50": _pct(0.5),
+            "latency_p95": _pct(0.95),
+            "latency_max": latencies[-1] if latencies else 0.0,
+            "avg_polls": sum(m.polls for m in done) / len(done) if done else 0.0,
+        }
+
+    def recent(self) -> list[OperationMetrics]:
+        """Per-operation metrics for recently finished operations, oldest first."""
+        return list(self._history)
+
+    # ── Internals ────────────────────────────────────────────────────
+
+    def _ensure_runner(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._loop is not loop:
+            # Operations from a previous (closed) event loop can never complete
+            self._heap.clear()
+            self._active = 0
+            self._polls_in_flight.clear()
+            self._loop = loop
+            self._runner = None
+            self._wakeup = asyncio.Event()
+            self._poll_slots = asyncio.Semaphore(self.max_concurrent_polls)
+        if self._runner is None or self._runner.done():
+            self._runner = loop.create_task(self._run())
+
+    def _schedule(self, op: _Operation, retry_after: Optional[float]) -> None:
+        now = self._loop.time()
+        if retry_after is not None:
+            op.retry_hint = max(op.retry_hint, retry_after)
+        delay = self.next_delay(op.polls, retry_after)
+        deadline = self._deadline(op)
+        if deadline is not None:
+            # The last poll happens at the deadline, not a full backoff past it
+            delay = min(delay, max(op.submitted_at + deadline - now, 0.0))
+        heapq.heappush(self._heap, (now + delay, next(self._seq), op))
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        loop = self._loop
+        while self._heap or self._active:
+            now = loop.time()
+            while self._heap and self._heap[0][0] <= now:
+                _due, _seq, op = heapq.heappop(self._heap)
+                if op.future.done():
+                    continue
+                self._active += 1
+                task = loop.create_task(self._poll_once(op))
+                self._polls_in_flight.add(task)
+                task.add_done_callback(self._polls_in_flight.discard)
+
+            timeout = self._heap[0][0] - now if self._heap else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._runner = None
+
+    async def _poll_once(self, op: _Operation) -> None:
+        try:
+            async with self._poll_slots:
+                op.polls += 1
+                done, result, retry_after = await op.poll()
+        except Exception as exc:
+            self._finish(op, "failed", exc=exc)
+            return
+        finally:
+            self._active -= 1
+            self._wakeup.set()
+
+        if retry_after is not None:
+            op.retry_hint = max(op.retry_hint, retry_after)
+        if done:
+            self._finish(op, "succeeded", result=result)
+        elif op.polls >= self.max_attempts or self._past_deadline(op):
+            elapsed = self._loop.time() - op.submitted_at
+            self._finish(op, "timed_out", exc=TimeoutError(
+                f"Operation {op.name or '?'} not finished after {op.polls} polls ({elapsed:.0f}s)"
+            ))
+        elif not op.future.done():
+            self._schedule(op, retry_after)
+
+    def _deadline(self, op: _Operation) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(self.deadline, self.max_attempts * op.retry_hint)
+
+    def _past_deadline(self, op: _Operation) -> bool:
+        deadline = self._deadline(op)
+        return deadline is not None and self._loop.time() - op.submitted_at >= deadline
+
+    def _finish(
+        self, op: _Operation, outcome: str, result: Any = None, exc: Optional[BaseException] = None
+    ) -> None:
+        if op.future.done():
+            return
+        if exc is not None:
+            op.future.set_exception(exc)
+        else:
+            op.future.set_result(result)
+        self._record(op, outcome)
+
+    def _record(self, op: _Operation, outcome: str) -> None:
+        latency = self._loop.time() - op.submitted_at if self._loop else 0.0
+        self._history.append(OperationMetrics(op.name, outcome, latency, op.polls))
+        logger.debug("LRO %s %s after %.1fs and %d poll(s)", op.name, outcome, latency, op.polls)
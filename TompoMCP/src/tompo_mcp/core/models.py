@@ -1,10 +1,25 @@
-"""Pydantic data models for TOMPo — semantic models, reports, lineage."""
+"""Data models for TOMPo — semantic models, reports, lineage.
+
+Types created once per column, measure, page, visual, field binding or lineage
+tree node — hundreds of thousands of them on a large tenant — are slotted
+dataclasses. The containers that own them (tables, models, reports, lineage and
+impact responses) are pydantic models: pydantic accepts the dataclass instances
+as they are, without revalidating, and serialises them in ``model_dump()``.
+Validating a dumped binding (a dict) interns it again, so
+``LineageResponse.model_validate(lineage.model_dump())`` round-trips.
+
+Field bindings are interned: the same (table, field, type) is one shared
+``VisualFieldBinding`` with a small integer id, however many visuals bind it.
+"""
 
 from __future__ import annotations
 
+import itertools
+from dataclasses import dataclass, field
 from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, GetCoreSchemaHandler, PrivateAttr
+from pydantic_core import core_schema
 
 
 # ── Workspace ──────────────────────────────────────────────────────────────
@@ -20,7 +35,8 @@ class Workspace(BaseModel):
 # ── Semantic Model (Dataset) ───────────────────────────────────────────────
 
 
-class ColumnInfo(BaseModel):
+@dataclass(slots=True)
+class ColumnInfo:
     name: str
     data_type: str = "Unknown"
     is_hidden: bool = False
@@ -29,7 +45,8 @@ class ColumnInfo(BaseModel):
     source_column: Optional[str] = None
 
 
-class MeasureInfo(BaseModel):
+@dataclass(slots=True)
+class MeasureInfo:
     name: str
     expression: str = ""
     format_string: Optional[str] = None
@@ -76,54 +93,132 @@ class SemanticModelInfo(BaseModel):
     tables: list[TableInfo] = Field(default_factory=list)
     relationships: list[RelationshipInfo] = Field(default_factory=list)
     roles: list[RoleInfo] = Field(default_factory=list)
+    # DAX dependencies between the fields; built lazily by lineage.get_dependency_graph
+    _dax_graph: Optional[Any] = PrivateAttr(default=None)
 
 
 # ── Report / Visual Lineage ───────────────────────────────────────────────
 
 
-class VisualFieldBinding(BaseModel):
+@dataclass(frozen=True, slots=True, eq=False, init=False)
+class VisualFieldBinding:
+    """A (table, field, type) bound by visuals; one shared instance per field.
+
+    Constructing a binding returns the registered instance when the field has
+    been seen before, so bindings compare and hash by identity. Instances are
+    frozen because every visual binding the field holds the same object.
+    """
+
     table_name: str
     field_name: str
     field_type: str  # "column" or "measure"
-
-
-class VisualInfo(BaseModel):
+    # Registration order in FIELD_REGISTRY
+    field_id: int
+
+    def __new__(cls, table_name: str, field_name: str, field_type: str) -> VisualFieldBinding:
+        return FIELD_REGISTRY.intern(cls, table_name, field_name, field_type)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        # pydantic would build a dict input field by field, bypassing __new__;
+        # intern it first so validation yields the registered instance
+        return core_schema.no_info_before_validator_function(cls._from_dump, handler(source))
+
+    @classmethod
+    def _from_dump(cls, value: Any) -> Any:
+        if isinstance(value, dict):
+            # field_id is per process; the registry assigns its own
+            try:
+                return cls(value["table_name"], value["field_name"], value["field_type"])
+            except KeyError as exc:
+                raise ValueError(f"field binding without {exc}") from None
+        return value
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Bindings parsed in a worker process rejoin this process's registry
+        return VisualFieldBinding, (self.table_name, self.field_name, self.field_type)
+
+
+class FieldRegistry:
+    """Shared field identities for every binding parsed in this process.
+
+    Grows with the number of distinct fields seen (not with visuals or
+    reports) and is never cleared, so identity comparison stays valid.
+    Lock-free: parser threads racing on a new field may each build a
+    candidate, but ``setdefault`` keeps exactly one.
+    """
+
+    def __init__(self) -> None:
+        self._bindings: dict[tuple[str, str, str], VisualFieldBinding] = {}
+        self._ids = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._bindings)
+
+    def intern(
+        self, cls: type[VisualFieldBinding], table_name: str, field_name: str, field_type: str
+    ) -> VisualFieldBinding:
+        key = (table_name, field_name, field_type)
+        binding = self._bindings.get(key)
+        if binding is None:
+            candidate = object.__new__(cls)
+            for name, value in zip(("table_name", "field_name", "field_type", "field_id"), (*key, next(self._ids))):
+                object.__setattr__(candidate, name, value)
+            binding = self._bindings.setdefault(key, candidate)
+        return binding
+
+    def get(self, table_name: str, field_name: str, field_type: str) -> Optional[VisualFieldBinding]:
+        """The registered binding for a field, without registering it."""
+        return self._bindings.get((table_name, field_name, field_type))
+
+
+FIELD_REGISTRY = FieldRegistry()
+
+
+@dataclass(slots=True)
+class VisualInfo:
     visual_type: str
     title: Optional[str] = None
     visual_id: Optional[str] = None
-    field_bindings: list[VisualFieldBinding] = Field(default_factory=list)
-    filters: list[dict[str, Any]] = Field(default_factory=list)
+    field_bindings: list[VisualFieldBinding] = field(default_factory=list)
+    filters: list[dict[str, Any]] = field(default_factory=list)
 
 
-class PageInfo(BaseModel):
+@dataclass(slots=True)
+class PageInfo:
     name: str
     display_name: str
     ordinal: int = 0
     visibility: Optional[str] = None
-    visuals: list[VisualInfo] = Field(default_factory=list)
+    visuals: list[VisualInfo] = field(default_factory=list)
 
 
 class ReportInfo(BaseModel):
     id: str
     name: str
     dataset_id: Optional[str] = None
+    # Workspace the report lives in, when it differs from its model's workspace
+    workspace_id: Optional[str] = None
     pages: list[PageInfo] = Field(default_factory=list)
 
 
 # ── Lineage Tree ──────────────────────────────────────────────────────────
 
 
-class LineageNode(BaseModel):
+@dataclass(slots=True)
+class LineageNode:
     name: str
     node_type: str  # model, table, report, page, visual, column, measure
-    children: list[LineageNode] = Field(default_factory=list)
-    metadata: dict[str, Any] = Field(default_factory=dict)
+    children: list[LineageNode] = field(default_factory=list)
+    metadata: dict[str, Any] = field(default_factory=dict)
 
 
 class LineageResponse(BaseModel):
     model: SemanticModelInfo
     reports: list[ReportInfo]
     lineage_tree: LineageNode
+    # (table, field, field_type) → binding locations; built lazily by lineage.get_field_usage_index
+    _field_index: Optional[dict[tuple[str, str, str], list[Any]]] = PrivateAttr(default=None)
 
 
 # ── Impact Analysis ───────────────────────────────────────────────────────
@@ -136,6 +231,8 @@ class ImpactItem(BaseModel):
     visual_title: Optional[str] = None
     visual_link: Optional[str] = None
     report_link: Optional[str] = None
+    # measure or calculated column the visual binds when it uses the field indirectly
+    via: Optional[str] = None
 
 
 class ImpactAnalysisResponse(BaseModel):
@@ -144,3 +241,4 @@ class ImpactAnalysisResponse(BaseModel):
     table_name: str
     used_in: list[ImpactItem] = Field(default_factory=list)
     usage_count: int = 0
+    indirect_count: int = 0  # of usage_count, visuals reached through dependent measures
@@ -0,0 +1,99 @@
+"""Run CPU-bound definition parsing and lineage assembly off the asyncio event loop.
+
+Parsing a large model.bim or a PBIR report with thousands of visuals is pure
+Python and would otherwise stall every in-flight HTTP request of a workspace
+scan. A ``ParseExecutor`` hands the parser functions to a thread or process
+pool and awaits the result, so downloads keep progressing while earlier
+definitions are parsed. Lineage assembly runs on a worker thread in both
+pooled modes; its inputs are already parsed objects in this process.
+
+Modes:
+  inline  — parse on the event loop (previous behaviour)
+  thread  — thread pool; keeps the loop responsive, parsing still shares the GIL
+  process — process pool; parses on several cores, definitions are pickled across
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+from collections.abc import Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+from tompo_mcp.core.lineage import build_lineage
+from tompo_mcp.core.models import LineageResponse, ReportInfo, SemanticModelInfo
+from tompo_mcp.core.parser import parse_report_definition, parse_semantic_model
+
+logger = logging.getLogger(__name__)
+
+PARSE_MODES = ("inline", "thread", "process")
+
+T = TypeVar("T")
+
+
+class ParseExecutor:
+    """Await ``parse_semantic_model`` / ``parse_report_definition`` in a worker pool."""
+
+    def __init__(self, mode: str = "thread", max_workers: Optional[int] = None) -> None:
+        if mode not in PARSE_MODES:
+            raise ValueError(f"Unknown parse mode {mode!r}; expected one of {', '.join(PARSE_MODES)}")
+        self.mode = mode
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self._pool: Optional[Executor] = None
+
+    async def parse_semantic_model(
+        self, raw_definition: Mapping[str, Any], dataset_id: str, dataset_name: str
+    ) -> SemanticModelInfo:
+        return await self._run(parse_semantic_model, raw_definition, dataset_id, dataset_name)
+
+    async def parse_report_definition(
+        self,
+        raw_definition: Mapping[str, Any],
+        report_id: str,
+        report_name: str,
+        dataset_id: Optional[str] = None,
+    ) -> ReportInfo:
+        return await self._run(parse_report_definition, raw_definition, report_id, report_name, dataset_id)
+
+    async def build_lineage(
+        self, model: SemanticModelInfo, reports: list[ReportInfo], workspace_id: str = ""
+    ) -> LineageResponse:
+        if self.mode == "inline":
+            return build_lineage(model, reports, workspace_id)
+        return await asyncio.to_thread(build_lineage, model, reports, workspace_id)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # ── Internals ────────────────────────────────────────────────────
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.mode == "inline":
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_pool(), functools.partial(fn, *args))
+        except BrokenProcessPool as exc:
+            # A crashed worker (e.g. killed for memory) poisons the whole pool
+            logger.warning("Parse worker pool failed, parsing inline from now on: %s", exc)
+            self.shutdown()
+            self.mode = "inline"
+            return fn(*args)
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.mode == "process":
+                # spawn, not fork: the server process has live event-loop and HTTP threads
+                self._pool = ProcessPoolExecutor(
+                    self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="tompo-parse")
+        return self._pool
@@ -6,11 +6,15 @@ Parses PBIR, legacy Layout, TMSL/BIM, TMDL, Scanner API, and DAX INFO outputs.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import re
+from collections.abc import Iterable, Iterator, Mapping
 from typing import Any, Optional
 
+from tompo_mcp.core import fastjson
+from tompo_mcp.core.definition import is_skipped_part
 from tompo_mcp.core.models import (
     ColumnInfo,
     MeasureInfo,
@@ -24,6 +28,7 @@ from tompo_mcp.core.models import (
     VisualFieldBinding,
     VisualInfo,
 )
+from tompo_mcp.core.tmdl import parse_tmdl
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +39,7 @@ logger = logging.getLogger(__name__)
 
 
 def parse_semantic_model(
-    raw_definition: dict[str, Any], dataset_id: str, dataset_name: str
+    raw_definition: Mapping[str, Any], dataset_id: str, dataset_name: str
 ) -> SemanticModelInfo:
     source = raw_definition.get("_source", "")
     if source == "scanner":
@@ -45,25 +50,24 @@ def parse_semantic_model(
 
 
 def _parse_from_fabric_definition(
-    definition: dict[str, Any], dataset_id: str, dataset_name: str
+    definition: Mapping[str, Any], dataset_id: str, dataset_name: str
 ) -> SemanticModelInfo:
-    bim_content = None
-    for key, value in definition.items():
-        if key.endswith("model.bim") or key.endswith(".bim"):
-            bim_content = value
-            break
-        if isinstance(value, dict) and "model" in value:
-            bim_content = value
-            break
-
+    # Match on part paths first so lazily decoded definitions only decode what is used
+    bim_content = next((definition[k] for k in definition if k.endswith(".bim")), None)
     if bim_content and isinstance(bim_content, dict):
         return _parse_bim_json(bim_content, dataset_id, dataset_name)
 
-    tmdl_parts = {k: v for k, v in definition.items() if isinstance(v, str) and k.endswith(".tmdl")}
-    if tmdl_parts:
-        return _parse_tmdl(tmdl_parts, dataset_id, dataset_name)
+    tmdl_paths = [k for k in definition if k.endswith(".tmdl")]
+    if tmdl_paths:
+        return parse_tmdl(
+            ((k, definition[k]) for k in tmdl_paths if isinstance(definition[k], str)),
+            dataset_id, dataset_name,
+        )
 
-    for key, value in definition.items():
+    for key in definition:
+        if is_skipped_part(key):
+            continue
+        value = definition[key]
         if isinstance(value, dict):
             if "tables" in value or "model" in value:
                 return _parse_bim_json(
@@ -86,7 +90,7 @@ def _parse_bim_json(
             ColumnInfo(
                 name=col.get("name", ""),
                 data_type=col.get("dataType", "Unknown"),
-                is_hidden=col.get("isHidden", False),
+                is_hidden=bool(col.get("isHidden", False)),
                 expression=col.get("expression"),
                 description=col.get("description"),
                 source_column=col.get("sourceColumn"),
@@ -166,198 +170,6 @@ def _parse_bim_json(
     )
 
 
-def _parse_tmdl(
-    tmdl_parts: dict[str, str], dataset_id: str, dataset_name: str
-) -> SemanticModelInfo:
-    tables: list[TableInfo] = []
-    relationships: list[RelationshipInfo] = []
-    roles: list[RoleInfo] = []
-
-    for path, content in tmdl_parts.items():
-        if "/tables/" in path or path.startswith("tables/"):
-            table = _parse_tmdl_table(content)
-            if table:
-                tables.append(table)
-        elif "/relationships/" in path or path.startswith("relationships/"):
-            rel = _parse_tmdl_relationship(content)
-            if rel:
-                relationships.append(rel)
-        elif "/roles/" in path or path.startswith("roles/"):
-            role = _parse_tmdl_role(content)
-            if role:
-                roles.append(role)
-
-    for path, content in tmdl_parts.items():
-        if path.endswith("model.tmdl") or path == "model.tmdl":
-            inline_rels, inline_roles = _parse_tmdl_model_file(content, tables)
-            relationships.extend(inline_rels)
-            roles.extend(inline_roles)
-
-    return SemanticModelInfo(
-        id=dataset_id, name=dataset_name,
-        tables=tables, relationships=relationships, roles=roles,
-    )
-
-
-def _parse_tmdl_table(content: str) -> Optional[TableInfo]:
-    lines = content.split("\n")
-    table_name = ""
-    columns: list[ColumnInfo] = []
-    measures: list[MeasureInfo] = []
-
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        if line.startswith("table "):
-            table_name = line.replace("table ", "").strip().strip("'\"")
-        elif line.startswith("column "):
-            col_name = line.replace("column ", "").strip().strip("'\"")
-            data_type = "Unknown"
-            i += 1
-            while i < len(lines) and lines[i].startswith("\t\t"):
-                prop = lines[i].strip()
-                if prop.startswith("dataType:"):
-                    data_type = prop.replace("dataType:", "").strip()
-                i += 1
-            columns.append(ColumnInfo(name=col_name, data_type=data_type))
-            continue
-        elif line.startswith("measure "):
-            match = re.match(r"measure\s+'?([^'=]+)'?\s*=\s*(.*)", line)
-            if match:
-                m_name = match.group(1).strip()
-                m_expr = match.group(2).strip()
-                i += 1
-                while i < len(lines) and (lines[i].startswith("\t\t\t") or lines[i].strip() == ""):
-                    m_expr += "\n" + lines[i].strip()
-                    i += 1
-                measures.append(MeasureInfo(name=m_name, expression=m_expr, table_name=table_name))
-                continue
-        i += 1
-
-    if not table_name:
-        return None
-    return TableInfo(name=table_name, columns=columns, measures=measures)
-
-
-def _parse_tmdl_relationship(content: str) -> Optional[RelationshipInfo]:
-    from_table = from_column = to_table = to_column = ""
-    from_card = "many"
-    to_card = "one"
-    cross_filter = "oneDirection"
-    is_active = True
-
-    for line in content.split("\n"):
-        stripped = line.strip()
-        if stripped.startswith("fromColumn:"):
-            ref = stripped.replace("fromColumn:", "").strip().strip("'\"")
-            parts = ref.split(".")
-            if len(parts) >= 2:
-                from_table = parts[0].strip("'\"")
-                from_column = ".".join(parts[1:]).strip("'\"")
-            else:
-                from_column = ref
-        elif stripped.startswith("toColumn:"):
-            ref = stripped.replace("toColumn:", "").strip().strip("'\"")
-            parts = ref.split(".")
-            if len(parts) >= 2:
-                to_table = parts[0].strip("'\"")
-                to_column = ".".join(parts[1:]).strip("'\"")
-            else:
-                to_column = ref
-        elif stripped.startswith("fromCardinality:"):
-            from_card = stripped.replace("fromCardinality:", "").strip()
-        elif stripped.startswith("toCardinality:"):
-            to_card = stripped.replace("toCardinality:", "").strip()
-        elif stripped.startswith("crossFilteringBehavior:"):
-            cross_filter = stripped.replace("crossFilteringBehavior:", "").strip()
-        elif stripped.startswith("isActive:"):
-            is_active = stripped.replace("isActive:", "").strip().lower() != "false"
-
-    if not (from_table and to_table):
-        return None
-    return RelationshipInfo(
-        from_table=from_table, from_column=from_column,
-        to_table=to_table, to_column=to_column,
-        from_cardinality=from_card, to_cardinality=to_card,
-        cross_filter=cross_filter, is_active=is_active,
-    )
-
-
-def _parse_tmdl_role(content: str) -> Optional[RoleInfo]:
-    role_name = ""
-    model_permission = "read"
-    table_permissions: list[dict[str, str]] = []
-    members: list[RoleMember] = []
-
-    lines = content.split("\n")
-    i = 0
-    while i < len(lines):
-        stripped = lines[i].strip()
-        if stripped.startswith("role "):
-            role_name = stripped.replace("role ", "").strip().strip("'\"")
-        elif stripped.startswith("modelPermission:"):
-            model_permission = stripped.replace("modelPermission:", "").strip()
-        elif stripped.startswith("tablePermission "):
-            tp_table = stripped.replace("tablePermission ", "").strip().strip("'\"")
-            filter_expr = ""
-            i += 1
-            while i < len(lines) and (lines[i].startswith("\t\t\t") or lines[i].startswith("   ")):
-                sub = lines[i].strip()
-                if sub.startswith("filterExpression:") or sub.startswith("expression:"):
-                    filter_expr = sub.split(":", 1)[1].strip().strip('"')
-                elif filter_expr == "" and not sub.startswith("//"):
-                    filter_expr += sub
-                i += 1
-            table_permissions.append({"table": tp_table, "filter": filter_expr})
-            continue
-        elif stripped.startswith("member "):
-            member_name = stripped.replace("member ", "").strip().strip("'\"")
-            members.append(RoleMember(member_name=member_name))
-        i += 1
-
-    if not role_name:
-        return None
-    return RoleInfo(
-        name=role_name, model_permission=model_permission,
-        table_permissions=table_permissions, members=members,
-    )
-
-
-def _parse_tmdl_model_file(
-    content: str, tables: list[TableInfo]
-) -> tuple[list[RelationshipInfo], list[RoleInfo]]:
-    relationships: list[RelationshipInfo] = []
-    roles: list[RoleInfo] = []
-
-    lines = content.split("\n")
-    i = 0
-    while i < len(lines):
-        stripped = lines[i].strip()
-        if stripped.startswith("relationship "):
-            block = stripped + "\n"
-            i += 1
-            while i < len(lines) and (lines[i].startswith("\t") or lines[i].startswith("  ")):
-                block += lines[i] + "\n"
-                i += 1
-            rel = _parse_tmdl_relationship(block)
-            if rel:
-                relationships.append(rel)
-            continue
-        if stripped.startswith("role "):
-            block = stripped + "\n"
-            i += 1
-            while i < len(lines) and (lines[i].startswith("\t") or lines[i].startswith("  ")):
-                block += lines[i] + "\n"
-                i += 1
-            role = _parse_tmdl_role(block)
-            if role:
-                roles.append(role)
-            continue
-        i += 1
-
-    return relationships, roles
-
-
 def _parse_from_scanner(
     raw: dict[str, Any], dataset_id: str, dataset_name: str
 ) -> SemanticModelInfo:
@@ -368,7 +180,7 @@ def _parse_from_scanner(
             ColumnInfo(
                 name=col.get("name", ""),
                 data_type=col.get("columnType", "Unknown"),
-                is_hidden=col.get("isHidden", False),
+                is_hidden=bool(col.get("isHidden", False)),
                 description=col.get("description"),
             )
             for col in tbl.get("columns", [])
@@ -436,6 +248,14 @@ def _parse_from_dax(
     raw_measures = raw.get("measures", [])
     raw_relationships = raw.get("relationships", [])
 
+    # Group columns and measures by TableID once instead of rescanning them per table
+    columns_by_table: dict[Any, list[dict[str, Any]]] = {}
+    for c in raw_columns:
+        columns_by_table.setdefault(c.get("[TableID]") or c.get("TableID"), []).append(c)
+    measures_by_table: dict[Any, list[dict[str, Any]]] = {}
+    for m in raw_measures:
+        measures_by_table.setdefault(m.get("[TableID]") or m.get("TableID"), []).append(m)
+
     table_id_map: dict[int, str] = {}
     tables: list[TableInfo] = []
 
@@ -452,8 +272,7 @@ def _parse_from_dax(
                 expression=c.get("[Expression]"),
                 description=c.get("[Description]"),
             )
-            for c in raw_columns
-            if (c.get("[TableID]") or c.get("TableID")) == tid
+            for c in columns_by_table.get(tid, [])
         ]
         measures = [
             MeasureInfo(
@@ -463,8 +282,7 @@ def _parse_from_dax(
                 description=m.get("[Description]", m.get("Description")),
                 table_name=tname,
             )
-            for m in raw_measures
-            if (m.get("[TableID]") or m.get("TableID")) == tid
+            for m in measures_by_table.get(tid, [])
         ]
 
         tables.append(
@@ -524,7 +342,7 @@ def _parse_from_dax(
 
 
 def parse_report_definition(
-    raw_definition: dict[str, Any],
+    raw_definition: Mapping[str, Any],
     report_id: str,
     report_name: str,
     dataset_id: Optional[str] = None,
@@ -545,41 +363,48 @@ def parse_report_definition(
     return ReportInfo(id=report_id, name=report_name, dataset_id=dataset_id)
 
 
-def _try_parse_pbir(
-    definition: dict[str, Any], report_id: str, report_name: str, dataset_id: Optional[str],
-) -> Optional[list[PageInfo]]:
-    page_paths: dict[str, dict[str, Any]] = {}
-    visual_paths: dict[str, list[tuple[str, dict[str, Any]]]] = {}
+def _index_pbir_paths(
+    paths: Iterable[str],
+) -> tuple[dict[str, str], dict[str, list[tuple[str, str]]]]:
+    """Split every PBIR part path once.
 
-    for path, content in definition.items():
-        if not isinstance(content, dict):
+    Returns page id → page.json path, and page id → [(visual id, visual.json
+    path)], both in definition order. Nothing is decoded here.
+    """
+    page_paths: dict[str, str] = {}
+    visual_paths: dict[str, list[tuple[str, str]]] = {}
+    for path in paths:
+        _, sep, rest = path.partition("/pages/")
+        if not sep:
             continue
-        if "/pages/" in path and path.endswith("page.json"):
-            page_id = path.split("/pages/")[1].split("/")[0]
-            page_paths[page_id] = content
-        if "/visuals/" in path and path.endswith("visual.json"):
-            parts = path.split("/pages/")[1].split("/visuals/")
-            if len(parts) == 2:
-                page_id = parts[0]
-                visual_paths.setdefault(page_id, []).append((path, content))
-
-    if not page_paths:
-        return None
+        segments = rest.split("/")
+        leaf = segments[-1]
+        if leaf == "page.json":
+            page_paths[segments[0]] = path
+        elif leaf == "visual.json" and len(segments) >= 4 and segments[1] == "visuals":
+            visual_paths.setdefault(segments[0], []).append((segments[2], path))
+    return page_paths, visual_paths
+
+
+def _try_parse_pbir(
+    definition: Mapping[str, Any], report_id: str, report_name: str, dataset_id: Optional[str],
+) -> Optional[list[PageInfo]]:
+    page_paths, visual_paths = _index_pbir_paths(definition)
 
     pages: list[PageInfo] = []
-    for page_id, page_content in page_paths.items():
+    for page_id, page_path in page_paths.items():
+        page_content = definition[page_path]
+        if not isinstance(page_content, dict):
+            continue
         display_name = page_content.get("displayName") or page_content.get("name") or page_id
         ordinal = page_content.get("ordinal", 0)
         visibility = page_content.get("visibility")
 
         visuals: list[VisualInfo] = []
-        for _vpath, visual_content in visual_paths.get(page_id, []):
-            visual_id = None
-            try:
-                vid_part = _vpath.split("/visuals/")[1]
-                visual_id = vid_part.split("/")[0]
-            except (IndexError, AttributeError):
-                pass
+        for visual_id, visual_path in visual_paths.get(page_id, []):
+            visual_content = definition[visual_path]
+            if not isinstance(visual_content, dict):
+                continue
             visual = _parse_pbir_visual(visual_content, visual_id=visual_id)
             if visual:
                 visuals.append(visual)
@@ -589,6 +414,9 @@ def _try_parse_pbir(
             visibility=str(visibility) if visibility else None, visuals=visuals,
         ))
 
+    if not pages:
+        return None
+
     pages.sort(key=lambda p: p.ordinal)
     return pages
 
@@ -637,79 +465,67 @@ def _extract_visual_title_pbir(v: dict[str, Any]) -> Optional[str]:
 
 
 def _extract_field_bindings_pbir(v: dict[str, Any]) -> list[VisualFieldBinding]:
+    """Bindings from query metadata, query state and prototype query, first occurrence wins."""
     bindings: list[VisualFieldBinding] = []
     seen: set[tuple[str, str]] = set()
+    for table_name, field_name, field_type in _iter_field_refs_pbir(v):
+        key = (table_name, field_name)
+        if key not in seen:
+            seen.add(key)
+            bindings.append(VisualFieldBinding(table_name=table_name, field_name=field_name, field_type=field_type))
+    return bindings
+
 
+def _iter_field_refs_pbir(v: dict[str, Any]) -> Iterator[tuple[str, str, str]]:
     # Method 1: dataTransforms.queryMetadata.Select
-    data_transforms = v.get("dataTransforms", {})
-    query_metadata = data_transforms.get("queryMetadata", {})
-    for sel in query_metadata.get("Select", []):
-        name = sel.get("Name", "")
-        field_type_code = sel.get("Type")
-        if "." in name:
-            table_name, field_name = name.split(".", 1)
-            field_type = "measure" if field_type_code == 2 else "column"
-            key = (table_name, field_name)
-            if key not in seen:
-                seen.add(key)
-                bindings.append(VisualFieldBinding(table_name=table_name, field_name=field_name, field_type=field_type))
+    for sel in v.get("dataTransforms", {}).get("queryMetadata", {}).get("Select", []):
+        table_name, dot, field_name = sel.get("Name", "").partition(".")
+        if dot:
+            yield table_name, field_name, "measure" if sel.get("Type") == 2 else "column"
 
     # Method 2: query.queryState projections
-    query = v.get("query", {})
-    query_state = query.get("queryState", {})
-    for _role, role_data in query_state.items():
-        projections = role_data.get("projections", []) if isinstance(role_data, dict) else []
-        for proj in projections:
-            query_ref = proj.get("queryRef", "")
-            if "." in query_ref:
-                table_name, field_name = query_ref.split(".", 1)
-                key = (table_name, field_name)
-                if key not in seen:
-                    seen.add(key)
-                    bindings.append(VisualFieldBinding(table_name=table_name, field_name=field_name, field_type="column"))
+    for role_data in v.get("query", {}).get("queryState", {}).values():
+        if not isinstance(role_data, dict):
+            continue
+        for proj in role_data.get("projections", []):
+            table_name, dot, field_name = proj.get("queryRef", "").partition(".")
+            if dot:
+                yield table_name, field_name, "column"
 
     # Method 3: prototypeQuery.Select
-    prototype = v.get("prototypeQuery", {})
-    for sel in prototype.get("Select", []):
+    for sel in v.get("prototypeQuery", {}).get("Select", []):
         if "Column" in sel:
-            col = sel["Column"]
-            table_name = col.get("Expression", {}).get("SourceRef", {}).get("Entity", "")
-            field_name = col.get("Property", "")
-            if table_name and field_name:
-                key = (table_name, field_name)
-                if key not in seen:
-                    seen.add(key)
-                    bindings.append(VisualFieldBinding(table_name=table_name, field_name=field_name, field_type="column"))
+            ref, field_type = sel["Column"], "column"
         elif "Measure" in sel:
-            meas = sel["Measure"]
-            table_name = meas.get("Expression", {}).get("SourceRef", {}).get("Entity", "")
-            field_name = meas.get("Property", "")
-            if table_name and field_name:
-                key = (table_name, field_name)
-                if key not in seen:
-                    seen.add(key)
-                    bindings.append(VisualFieldBinding(table_name=table_name, field_name=field_name, field_type="measure"))
-
-    return bindings
+            ref, field_type = sel["Measure"], "measure"
+        else:
+            continue
+        table_name = ref.get("Expression", {}).get("SourceRef", {}).get("Entity", "")
+        field_name = ref.get("Property", "")
+        if table_name and field_name:
+            yield table_name, field_name, field_type
 
 
 def _try_parse_legacy_layout(
-    definition: dict[str, Any], report_id: str, report_name: str, dataset_id: Optional[str],
+    definition: Mapping[str, Any], report_id: str, report_name: str, dataset_id: Optional[str],
 ) -> Optional[list[PageInfo]]:
-    layout_content = None
-    for key, value in definition.items():
-        if key.lower().endswith("layout") or key.lower() == "report/layout":
-            layout_content = value
-            break
-        if isinstance(value, dict) and "sections" in value:
-            layout_content = value
-            break
+    layout_content = next(
+        (definition[k] for k in definition if k.lower().endswith("layout")), None
+    )
+    if layout_content is None:
+        for key in definition:
+            if is_skipped_part(key):
+                continue
+            value = definition[key]
+            if isinstance(value, dict) and "sections" in value:
+                layout_content = value
+                break
 
     if not layout_content:
         return None
     if isinstance(layout_content, str):
         try:
-            layout_content = json.loads(layout_content)
+            layout_content = fastjson.loads(layout_content)
         except json.JSONDecodeError:
             return None
 
@@ -732,26 +548,76 @@ def _try_parse_legacy_layout(
     return pages
 
 
+# ── Legacy visual config memo ───────────────────────────────────────
+# Legacy reports repeat the same container config many times (slicers copied
+# across pages, reports cloned from one template). Copies differ only in their
+# "name" (the visual id), which Power BI writes as the first key, so the memo is
+# keyed by a digest of the config after that key: each distinct config is
+# decoded and parsed once per process, and every container gets a fresh
+# VisualInfo with its own visual id. Configs that don't start with the name are
+# keyed by their full text.
+
+LEGACY_CONFIG_MEMO_SIZE = 16384
+
+# visual type, title, visual id, field bindings
+_LegacyVisual = tuple[str, Optional[str], Optional[str], tuple[VisualFieldBinding, ...]]
+
+_legacy_config_memo: dict[bytes, Optional[_LegacyVisual]] = {}
+
+_LEADING_NAME = re.compile(r'\s*\{\s*"name"\s*:\s*"((?:[^"\\]|\\.)*)"\s*,?')
+
+
+def clear_legacy_config_memo() -> None:
+    _legacy_config_memo.clear()
+
+
 def _parse_legacy_visual_container(vc: dict[str, Any]) -> Optional[VisualInfo]:
-    config_str = vc.get("config", "")
-    if isinstance(config_str, str):
+    config = vc.get("config", "")
+    name: Optional[str] = None
+    if isinstance(config, str):
+        match = _LEADING_NAME.match(config)
+        if match:
+            name = match.group(1)
+            if "\\" in name:
+                name = json.loads(f'"{name}"')
+        key = hashlib.blake2b(config[match.end() if match else 0:].encode("utf-8"), digest_size=16).digest()
         try:
-            config = json.loads(config_str)
-        except json.JSONDecodeError:
-            return None
+            parsed = _legacy_config_memo[key]
+        except KeyError:
+            try:
+                parsed = _parse_legacy_config(fastjson.loads(config))
+            except json.JSONDecodeError:
+                parsed = None
+            if len(_legacy_config_memo) >= LEGACY_CONFIG_MEMO_SIZE:
+                _legacy_config_memo.clear()
+            _legacy_config_memo[key] = parsed
     else:
-        config = config_str
+        parsed = _parse_legacy_config(config)
+
+    if parsed is None:
+        return None
+    visual_type, title, visual_id, field_bindings = parsed
+    return VisualInfo(
+        visual_type=visual_type, title=title, visual_id=name if name is not None else visual_id,
+        field_bindings=list(field_bindings),
+    )
+
 
+def _parse_legacy_config(config: Any) -> Optional[_LegacyVisual]:
+    if not isinstance(config, dict):
+        return None
     single_visual = config.get("singleVisual", {})
     if not single_visual:
         return None
     visual_type = single_visual.get("visualType", "unknown")
     if visual_type in ("shape", "image", "textbox", "actionButton"):
         return None
-    visual_id = config.get("name")
-    title = _extract_visual_title_legacy(single_visual)
-    field_bindings = _extract_field_bindings_legacy(single_visual)
-    return VisualInfo(visual_type=visual_type, title=title, visual_id=visual_id, field_bindings=field_bindings)
+    return (
+        visual_type,
+        _extract_visual_title_legacy(single_visual),
+        config.get("name"),
+        tuple(_extract_field_bindings_legacy(single_visual)),
+    )
 
 
 def _extract_visual_title_legacy(sv: dict[str, Any]) -> Optional[str]:
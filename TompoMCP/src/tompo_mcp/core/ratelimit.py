@@ -0,0 +1,188 @@
+"""Client-side rate limiting for Power BI / Fabric / Graph requests.
+
+Every request takes a token from the bucket of its endpoint class before it is
+sent. A 429 or 503 pauses the whole bucket for the server's Retry-After (so all
+callers hitting the same throttle wait out one shared pause instead of retrying
+individually) and halves the bucket's rate; each success then creeps the rate
+back towards its configured limit. A long scan therefore settles just under the
+rate the service accepts instead of alternating between bursts and 429s.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# (requests per second, burst) per endpoint class. Where Microsoft publishes a
+# quota it is used here; the rest are conservative per-user defaults.
+ENDPOINT_LIMITS: dict[str, tuple[float, int]] = {
+    "scanner_get_info": (500 / 3600, 16),       # 500/hour, 16 concurrent
+    "scanner_status": (10000 / 3600, 10),       # 10,000/hour
+    "scanner_result": (500 / 3600, 16),         # 500/hour
+    "execute_queries": (120 / 60, 10),          # 120 queries/minute per user
+    # Label downgrades and the restores that undo them; kept apart from the
+    # other admin calls so a restore never queues behind a scan's lookups
+    "set_labels": (25 / 3600, 25),              # 25/hour
+    "admin": (200 / 3600, 10),                  # other Power BI / Fabric admin APIs: 200/hour
+    "fabric": (10.0, 20),
+    "powerbi": (10.0, 20),
+    "graph": (10.0, 20),
+}
+
+THROTTLE_STATUSES = (429, 503)
+MAX_RETRIES = 5
+# Used when a throttled response carries no Retry-After header
+DEFAULT_RETRY_AFTER = 5.0
+MAX_RETRY_AFTER = 300.0
+# Rate never drops below this fraction of the configured limit
+MIN_RATE_FRACTION = 0.05
+# Fraction of the configured limit regained per successful request
+RECOVERY_STEP = 0.02
+
+
+class RateLimited(Exception):
+    """Raised when a request is still throttled after ``MAX_RETRIES`` retries."""
+
+    def __init__(self, endpoint: str, status_code: int) -> None:
+        super().__init__(f"{endpoint} requests throttled (HTTP {status_code}) after {MAX_RETRIES} retries")
+        self.endpoint = endpoint
+        self.status_code = status_code
+
+
+def classify_endpoint(url: str) -> str:
+    """Map a request URL to its rate-limit class (a key of ``ENDPOINT_LIMITS``)."""
+    if "graph.microsoft.com" in url:
+        return "graph"
+    if "api.fabric.microsoft.com" in url:
+        return "admin" if "/v1/admin/" in url else "fabric"
+    if "/admin/workspaces/getInfo" in url:
+        return "scanner_get_info"
+    if "/admin/workspaces/scanStatus/" in url:
+        return "scanner_status"
+    if "/admin/workspaces/scanResult/" in url:
+        return "scanner_result"
+    if url.endswith("/executeQueries"):
+        return "execute_queries"
+    if url.endswith("/informationprotection/setLabels"):
+        return "set_labels"
+    if "/admin/" in url:
+        return "admin"
+    return "powerbi"
+
+
+def parse_retry_after(resp: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header given in seconds; None if missing or malformed."""
+    value = resp.headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """Async token bucket with an adaptive rate and a shared pause.
+
+    Not thread-safe; meant to be used from one event loop (it holds no
+    loop-bound primitives, so it survives across ``asyncio.run`` calls).
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.limit = rate
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        # Bumped on every throttle; waiters scheduled before it re-queue at the new rate
+        self._epoch = 0
+
+    async def acquire(self) -> None:
+        epoch = self._epoch
+        delay = self._reserve()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            if self._epoch == epoch:
+                return
+            # Throttled while waiting: the old slot was cancelled, queue again
+            epoch = self._epoch
+            delay = self._reserve()
+
+    def throttled(self, retry_after: float) -> None:
+        """Halve the rate and hand out no tokens for ``retry_after`` seconds.
+
+        Throttles reported while a pause is already running (the other requests
+        of the same burst) extend the pause but do not lower the rate again.
+        Callers already waiting for a token are re-queued behind the pause.
+        """
+        self._refill()
+        now = time.monotonic()
+        if now >= self._paused_until:
+            self.rate = max(self.limit * MIN_RATE_FRACTION, self.rate / 2)
+        self._paused_until = max(self._paused_until, now + retry_after)
+        self._tokens = 0.0
+        self._epoch += 1
+
+    def succeeded(self) -> None:
+        if self.rate < self.limit:
+            self.rate = min(self.limit, self.rate + self.limit * RECOVERY_STEP)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        # No refill while paused
+        elapsed = max(0.0, now - max(self._updated, self._paused_until))
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def _reserve(self) -> float:
+        """Take a token (possibly going into debt) and return how long to wait for it."""
+        self._refill()
+        self._tokens -= 1
+        wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        return max(wait, self._paused_until - time.monotonic())
+
+
+class RateLimiter:
+    """Sends requests through per-endpoint token buckets, retrying throttled ones."""
+
+    def __init__(self, limits: Optional[dict[str, tuple[float, int]]] = None) -> None:
+        limits = {**ENDPOINT_LIMITS, **(limits or {})}
+        self._buckets = {name: TokenBucket(rate, burst) for name, (rate, burst) in limits.items()}
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        return self._buckets[endpoint]
+
+    async def send(
+        self, client: httpx.AsyncClient, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        """Send a request, waiting out 429/503 responses.
+
+        Returns the first non-throttled response; raises ``RateLimited`` if the
+        request is still throttled after ``MAX_RETRIES`` retries.
+        """
+        endpoint = classify_endpoint(url)
+        bucket = self._buckets[endpoint]
+        for attempt in range(MAX_RETRIES + 1):
+            await bucket.acquire()
+            resp = await client.request(method, url, **kwargs)
+            if resp.status_code not in THROTTLE_STATUSES:
+                bucket.succeeded()
+                return resp
+
+            retry_after = parse_retry_after(resp)
+            if retry_after is None:
+                retry_after = DEFAULT_RETRY_AFTER * (2 ** attempt)
+            # Jitter so callers released by the same pause don't all fire at once
+            retry_after = min(MAX_RETRY_AFTER, retry_after) * random.uniform(1.0, 1.1)
+            bucket.throttled(retry_after)
+            logger.info(
+                "%s throttled (HTTP %d), pausing %.1fs; rate now %.2f/s",
+                endpoint, resp.status_code, retry_after, bucket.rate,
+            )
+        raise RateLimited(endpoint, resp.status_code)
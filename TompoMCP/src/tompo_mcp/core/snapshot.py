@@ -0,0 +1,94 @@
+"""Snapshots of scanned workspaces for incremental lineage refresh.
+
+After a workspace scan the snapshot records, for each model and report, the
+version marker it had in the listing and a digest of its raw definition, plus
+the reports each model's lineage was built from. The parsed items themselves
+live only in the lineage store. The next scan diffs a fresh listing against the
+snapshot and only refetches items that were added or whose version changed; a
+refetched item whose definition digest is unchanged is reloaded from the store
+instead of reparsed. Version markers come from the Fabric admin item listing
+(see ``FabricClient.get_workspace_items``); items without one can't be compared
+from the listing alone and are always refetched (their digest still avoids a
+reparse).
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from tompo_mcp.core.store import LineageStore
+
+
+@dataclass
+class ScannedItem:
+    version: str
+    digest: str
+    # Reports: the dataset whose stored lineage holds the parsed report
+    dataset_id: str = ""
+
+
+@dataclass
+class ItemChanges:
+    added: set[str] = field(default_factory=set)
+    changed: set[str] = field(default_factory=set)
+    removed: set[str] = field(default_factory=set)
+    unchanged: set[str] = field(default_factory=set)
+
+    @property
+    def stale(self) -> set[str]:
+        """Items that have to be fetched again."""
+        return self.added | self.changed
+
+
+@dataclass
+class WorkspaceSnapshot:
+    workspace_id: str
+    models: dict[str, ScannedItem] = field(default_factory=dict)
+    reports: dict[str, ScannedItem] = field(default_factory=dict)
+    # dataset id → ids of the reports bound to it when its lineage was built
+    bindings: dict[str, list[str]] = field(default_factory=dict)
+    scanned_at: float = field(default_factory=time.time)
+
+    def lineage_is_current(
+        self, store: LineageStore, dataset_id: str, bound_report_ids: list[str], rebuilt_reports: set[str]
+    ) -> bool:
+        """True if the store holds a lineage built from the same model and reports."""
+        return (
+            dataset_id in self.bindings
+            and self.bindings.get(dataset_id) == bound_report_ids
+            and not rebuilt_reports.intersection(bound_report_ids)
+            and bool(store.keys(self.workspace_id, dataset_id))
+        )
+
+
+def diff_items(
+    previous: dict[str, ScannedItem], listing: list[dict[str, Any]], versions: dict[str, str]
+) -> ItemChanges:
+    """Compare a workspace listing (datasets or reports) with the previous scan.
+
+    ``versions`` maps lowercase item ids to their modification markers.
+    """
+    changes = ItemChanges()
+    current_ids = set()
+    for item in listing:
+        item_id = item.get("id")
+        if not item_id:
+            continue
+        current_ids.add(item_id)
+        scanned = previous.get(item_id)
+        version = versions.get(item_id.lower(), "")
+        if scanned is None:
+            changes.added.add(item_id)
+        elif not version or version != scanned.version:
+            changes.changed.add(item_id)
+        else:
+            changes.unchanged.add(item_id)
+    changes.removed = set(previous) - current_ids
+    return changes
+
+
+def same_definition(previous: Optional[ScannedItem], digest: str, dataset_id: str = "") -> bool:
+    """Whether a refetched item has the definition (and, for reports, the binding) scanned before."""
+    return previous is not None and previous.digest == digest and previous.dataset_id == dataset_id
@@ -0,0 +1,551 @@
+"""Persistent lineage store (SQLite — standard library only).
+
+Scanned lineages are written as rows — models, tables, fields, reports, pages,
+visuals and field bindings — keyed by (workspace, dataset), instead of being
+kept as pydantic trees in server globals. Impact analysis is one indexed query
+over the bindings; a model or a full lineage is rebuilt from its rows only when
+a tool needs it. Results survive server restarts and do not have to fit in RAM.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from typing import Optional
+
+from tompo_mcp.core.dax import DaxDependencyGraph, FieldRef
+from tompo_mcp.core.lineage import build_lineage
+from tompo_mcp.core.links import build_report_link, build_visual_link
+from tompo_mcp.core.models import (
+    ColumnInfo,
+    ImpactAnalysisResponse,
+    ImpactItem,
+    LineageResponse,
+    MeasureInfo,
+    PageInfo,
+    RelationshipInfo,
+    ReportInfo,
+    RoleInfo,
+    SemanticModelInfo,
+    TableInfo,
+    VisualFieldBinding,
+    VisualInfo,
+)
+
+logger = logging.getLogger(__name__)
+
+LineageKey = tuple[str, str]
+
+# Child rows are keyed by their parent's key plus their position under it, so
+# everything reloads in scan order.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    workspace_id  TEXT NOT NULL,
+    dataset_id    TEXT NOT NULL,
+    name          TEXT NOT NULL,
+    description   TEXT,
+    relationships TEXT NOT NULL,
+    roles         TEXT NOT NULL,
+    report_count  INTEGER NOT NULL,
+    scanned_at    REAL NOT NULL,
+    PRIMARY KEY (workspace_id, dataset_id)
+);
+CREATE TABLE IF NOT EXISTS model_tables (
+    workspace_id TEXT NOT NULL,
+    dataset_id   TEXT NOT NULL,
+    position     INTEGER NOT NULL,
+    name         TEXT NOT NULL,
+    is_hidden    INTEGER NOT NULL,
+    description  TEXT,
+    source       TEXT,
+    PRIMARY KEY (workspace_id, dataset_id, position)
+);
+CREATE TABLE IF NOT EXISTS fields (
+    workspace_id   TEXT NOT NULL,
+    dataset_id     TEXT NOT NULL,
+    table_position INTEGER NOT NULL,
+    field_type     TEXT NOT NULL,
+    position       INTEGER NOT NULL,
+    table_name     TEXT NOT NULL,
+    name           TEXT NOT NULL,
+    data_type      TEXT,
+    is_hidden      INTEGER NOT NULL,
+    expression     TEXT,
+    description    TEXT,
+    source_column  TEXT,
+    format_string  TEXT,
+    PRIMARY KEY (workspace_id, dataset_id, table_position, field_type, position)
+);
+CREATE TABLE IF NOT EXISTS reports (
+    workspace_id        TEXT NOT NULL,
+    dataset_id          TEXT NOT NULL,
+    position            INTEGER NOT NULL,
+    report_id           TEXT NOT NULL,
+    report_workspace_id TEXT,
+    name                TEXT NOT NULL,
+    PRIMARY KEY (workspace_id, dataset_id, position)
+);
+CREATE TABLE IF NOT EXISTS pages (
+    workspace_id    TEXT NOT NULL,
+    dataset_id      TEXT NOT NULL,
+    report_position INTEGER NOT NULL,
+    position        INTEGER NOT NULL,
+    name            TEXT NOT NULL,
+    display_name    TEXT NOT NULL,
+    ordinal         INTEGER NOT NULL,
+    visibility      TEXT,
+    PRIMARY KEY (workspace_id, dataset_id, report_position, position)
+);
+CREATE TABLE IF NOT EXISTS visuals (
+    workspace_id    TEXT NOT NULL,
+    dataset_id      TEXT NOT NULL,
+    report_position INTEGER NOT NULL,
+    page_position   INTEGER NOT NULL,
+    position        INTEGER NOT NULL,
+    visual_type     TEXT NOT NULL,
+    title           TEXT,
+    visual_id       TEXT,
+    filters         TEXT NOT NULL,
+    PRIMARY KEY (workspace_id, dataset_id, report_position, page_position, position)
+);
+CREATE TABLE IF NOT EXISTS bindings (
+    workspace_id    TEXT NOT NULL,
+    dataset_id      TEXT NOT NULL,
+    report_position INTEGER NOT NULL,
+    page_position   INTEGER NOT NULL,
+    visual_position INTEGER NOT NULL,
+    position        INTEGER NOT NULL,
+    table_name      TEXT NOT NULL,
+    field_name      TEXT NOT NULL,
+    field_type      TEXT NOT NULL,
+    PRIMARY KEY (workspace_id, dataset_id, report_position, page_position, visual_position, position)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_fields_name ON fields (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS ix_bindings_field ON bindings (field_name COLLATE NOCASE, table_name, field_type);
+"""
+
+_ITEM_TABLES = ("models", "model_tables", "fields", "reports", "pages", "visuals", "bindings")
+
+_USAGE_SELECT = """
+SELECT b.workspace_id, b.dataset_id, m.name, b.table_name, b.field_name, b.field_type,
+       r.report_id, r.report_workspace_id, r.name, p.name, p.display_name,
+       v.visual_type, v.title, v.visual_id, b.report_position, b.page_position, b.visual_position
+FROM bindings b
+JOIN models m ON m.workspace_id = b.workspace_id AND m.dataset_id = b.dataset_id
+JOIN reports r ON r.workspace_id = b.workspace_id AND r.dataset_id = b.dataset_id
+    AND r.position = b.report_position
+JOIN pages p ON p.workspace_id = b.workspace_id AND p.dataset_id = b.dataset_id
+    AND p.report_position = b.report_position AND p.position = b.page_position
+JOIN visuals v ON v.workspace_id = b.workspace_id AND v.dataset_id = b.dataset_id
+    AND v.report_position = b.report_position AND v.page_position = b.page_position
+    AND v.position = b.visual_position
+"""
+_USAGE_QUERY = _USAGE_SELECT + "WHERE b.field_name = ? COLLATE NOCASE\n"
+_USAGE_ORDER = (
+    " ORDER BY b.workspace_id, b.dataset_id, b.report_position, b.page_position,"
+    " b.visual_position, b.position"
+)
+# Bound (table, field, type) triples per query, well under SQLite's variable limit
+_FIELDS_PER_QUERY = 300
+
+# Without a table, only bindings to a field the model actually defines count
+_FIELD_EXISTS = """
+ AND EXISTS (SELECT 1 FROM fields f
+     WHERE f.workspace_id = b.workspace_id AND f.dataset_id = b.dataset_id
+       AND f.table_name = b.table_name AND f.name = b.field_name AND f.field_type = b.field_type)
+"""
+
+
+def _where_key(workspace_id: str, dataset_id: str, alias: str = "") -> tuple[str, list[str]]:
+    """SQL filter on the (workspace, dataset) key; empty values match everything."""
+    clauses, params = [], []
+    if workspace_id:
+        clauses.append(f"{alias}workspace_id = ?")
+        params.append(workspace_id)
+    if dataset_id:
+        clauses.append(f"{alias}dataset_id = ?")
+        params.append(dataset_id)
+    return "".join(f" AND {c}" for c in clauses), params
+
+
+class LineageStore:
+    """SQLite-backed store of scanned lineages, keyed by (workspace_id, dataset_id).
+
+    ``path=None`` keeps the store in memory for this process only. Safe to
+    call from worker threads (``asyncio.to_thread``); a single connection is
+    shared behind a lock.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), mode=0o700, exist_ok=True)
+        self.path = path or ":memory:"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._graphs: dict[LineageKey, DaxDependencyGraph] = {}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ── Writes ────────────────────────────────────────────────────────
+
+    def save(self, workspace_id: str, lineage: LineageResponse) -> None:
+        """Store a lineage, replacing any earlier scan of the same model."""
+        model = lineage.model
+        key = (workspace_id, model.id)
+        tables, fields, reports, pages, visuals, bindings = [], [], [], [], [], []
+        for ti, table in enumerate(model.tables):
+            tables.append((*key, ti, table.name, int(table.is_hidden), table.description, table.source))
+            for ci, col in enumerate(table.columns):
+                fields.append((
+                    *key, ti, "column", ci, table.name, col.name, col.data_type, int(col.is_hidden),
+                    col.expression, col.description, col.source_column, None,
+                ))
+            for mi, m in enumerate(table.measures):
+                fields.append((
+                    *key, ti, "measure", mi, table.name, m.name, None, 0,
+                    m.expression, m.description, None, m.format_string,
+                ))
+        for ri, report in enumerate(lineage.reports):
+            reports.append((*key, ri, report.id, report.workspace_id, report.name))
+            for pi, page in enumerate(report.pages):
+                pages.append((*key, ri, pi, page.name, page.display_name, page.ordinal, page.visibility))
+                for vi, visual in enumerate(page.visuals):
+                    visuals.append((
+                        *key, ri, pi, vi, visual.visual_type, visual.title, visual.visual_id,
+                        json.dumps(visual.filters, default=str),
+                    ))
+                    bindings.extend(
+                        (*key, ri, pi, vi, bi, fb.table_name, fb.field_name, fb.field_type)
+                        for bi, fb in enumerate(visual.field_bindings)
+                    )
+
+        model_row = (
+            *key, model.name, model.description,
+            json.dumps([r.model_dump() for r in model.relationships]),
+            json.dumps([r.model_dump() for r in model.roles]),
+            len(lineage.reports), time.time(),
+        )
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._delete(*key)
+                self._conn.execute("INSERT INTO models VALUES (?, ?, ?, ?, ?, ?, ?, ?)", model_row)
+                self._conn.executemany("INSERT INTO model_tables VALUES (?, ?, ?, ?, ?, ?, ?)", tables)
+                self._conn.executemany(
+                    "INSERT INTO fields VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", fields
+                )
+                self._conn.executemany("INSERT INTO reports VALUES (?, ?, ?, ?, ?, ?)", reports)
+                self._conn.executemany("INSERT INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)", pages)
+                self._conn.executemany("INSERT INTO visuals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", visuals)
+                self._conn.executemany("INSERT INTO bindings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", bindings)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, workspace_id: str, dataset_id: str = "") -> None:
+        """Drop one model's lineage, or every lineage of a workspace."""
+        with self._lock:
+            self._delete(workspace_id, dataset_id)
+            self._forget_last(workspace_id, dataset_id)
+
+    def retain(self, workspace_id: str, dataset_ids: Iterable[str]) -> None:
+        """Drop the workspace's lineages for every model not in ``dataset_ids``."""
+        keep = set(dataset_ids)
+        with self._lock:
+            stale = [
+                ds for (ds,) in self._conn.execute(
+                    "SELECT dataset_id FROM models WHERE workspace_id = ?", (workspace_id,)
+                ) if ds not in keep
+            ]
+            for ds in stale:
+                self._delete(workspace_id, ds)
+                self._forget_last(workspace_id, ds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._graphs.clear()
+            for table in (*_ITEM_TABLES, "meta"):
+                self._conn.execute(f"DELETE FROM {table}")
+
+    def set_last(self, workspace_id: str, dataset_id: str) -> None:
+        """Remember the most recently generated lineage (the default for follow-up tools)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('last', ?)", (json.dumps([workspace_id, dataset_id]),)
+            )
+
+    # ── Reads ─────────────────────────────────────────────────────────
+
+    def last(self) -> Optional[LineageKey]:
+        """Key of the most recently generated lineage, if it is still stored."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'last'").fetchone()
+        if row is None:
+            return None
+        key = tuple(json.loads(row[0]))
+        return key if self.keys(*key) else None  # type: ignore[return-value]
+
+    def keys(self, workspace_id: str = "", dataset_id: str = "") -> list[LineageKey]:
+        """Stored (workspace_id, dataset_id) keys, optionally filtered, in scan order."""
+        where, params = _where_key(workspace_id, dataset_id)
+        with self._lock:
+            return [
+                (ws, ds) for ws, ds in self._conn.execute(
+                    f"SELECT workspace_id, dataset_id FROM models WHERE 1 = 1{where} ORDER BY rowid", params
+                )
+            ]
+
+    def summary(self, workspace_id: str = "", dataset_id: str = "") -> tuple[int, int]:
+        """(models, reports) stored under the given filter."""
+        where, params = _where_key(workspace_id, dataset_id)
+        with self._lock:
+            models, reports = self._conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(report_count), 0) FROM models WHERE 1 = 1{where}", params
+            ).fetchone()
+        return models, reports
+
+    def load_model(self, workspace_id: str, dataset_id: str) -> Optional[SemanticModelInfo]:
+        with self._lock:
+            return self._load_model(workspace_id, dataset_id)
+
+    def load_reports(self, workspace_id: str, dataset_id: str) -> list[ReportInfo]:
+        """The reports stored with a model's lineage."""
+        with self._lock:
+            return self._load_reports(workspace_id, dataset_id)
+
+    def table_count(self, workspace_id: str, dataset_id: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM model_tables WHERE workspace_id = ? AND dataset_id = ?",
+                (workspace_id, dataset_id),
+            ).fetchone()[0]
+
+    def load(self, workspace_id: str, dataset_id: str) -> Optional[LineageResponse]:
+        """Rebuild a full lineage (model, reports and tree) from its rows."""
+        with self._lock:
+            model = self._load_model(workspace_id, dataset_id)
+            if model is None:
+                return None
+            reports = self._load_reports(workspace_id, dataset_id)
+        return build_lineage(model, reports, workspace_id)
+
+    def dependency_graph(self, workspace_id: str, dataset_id: str) -> DaxDependencyGraph:
+        """The model's DAX dependency graph, built from its stored fields on first use.
+
+        Graphs are kept until the model is rescanned or dropped.
+        """
+        with self._lock:
+            return self._dependency_graph(workspace_id, dataset_id)
+
+    def find_usages(
+        self,
+        field_name: str,
+        table_name: str = "",
+        field_type: str = "",
+        workspace_id: str = "",
+        dataset_id: str = "",
+        indirect: bool = True,
+    ) -> list[tuple[str, ImpactAnalysisResponse]]:
+        """Every visual binding a field, grouped per model and field as (model name, impact).
+
+        With ``table_name`` the field must match exactly (name, table and type);
+        without it, every column or measure of that name (case-insensitive) that
+        the model defines is looked up. With ``indirect``, visuals that bind a
+        measure or calculated column derived from the field are included too,
+        once each, with ``via`` naming the field they bind.
+        """
+        sql, params = _USAGE_QUERY, [field_name]
+        if table_name:
+            sql += " AND b.field_name = ? AND b.table_name = ? AND b.field_type = ?"
+            params += [field_name, table_name, field_type or "column"]
+        else:
+            sql += _FIELD_EXISTS
+        where, key_params = _where_key(workspace_id, dataset_id, "b.")
+        with self._lock:
+            rows = self._conn.execute(sql + where + _USAGE_ORDER, params + key_params).fetchall()
+            derived = self._derived_usages(
+                field_name, table_name, field_type, workspace_id, dataset_id
+            ) if indirect else []
+
+        grouped: dict[tuple[str, str, str, str, str], tuple[str, ImpactAnalysisResponse]] = {}
+        seen: set[tuple[str, str, str, str, int, int, int]] = set()
+
+        def add(target: FieldRef, row: tuple, via: Optional[str] = None) -> None:
+            (ws, ds, model_name, _tbl, _fld, _ftype, rid, report_ws, rname,
+             page_name, page_display, vtype, vtitle, vid, ri, pi, vi) = row
+            tbl, fld, ftype = target
+            visual_key = (ws, ds, tbl, fld, ri, pi, vi)
+            if via is not None and visual_key in seen:
+                return
+            seen.add(visual_key)
+            _, impact = grouped.setdefault((ws, ds, tbl, fld, ftype), (model_name, ImpactAnalysisResponse(
+                object_name=fld, object_type=ftype, table_name=tbl,
+            )))
+            link_ws = report_ws or ws
+            impact.used_in.append(ImpactItem(
+                report_name=rname,
+                page_name=page_display,
+                visual_type=vtype,
+                visual_title=vtitle,
+                visual_link=build_visual_link(link_ws, rid, page_name, vid),
+                report_link=build_report_link(link_ws, rid, page_name),
+                via=via,
+            ))
+            impact.usage_count += 1
+            impact.indirect_count += via is not None
+
+        for row in rows:
+            add((row[3], row[4], row[5]), row)
+        for target, row in derived:
+            add(target, row, via=row[4])
+        return list(grouped.values())
+
+    # ── Internals (caller holds the lock) ─────────────────────────────
+
+    def _delete(self, workspace_id: str, dataset_id: str = "") -> None:
+        where, params = _where_key(workspace_id, dataset_id)
+        for table in _ITEM_TABLES:
+            self._conn.execute(f"DELETE FROM {table} WHERE 1 = 1{where}", params)
+        for key in [k for k in self._graphs if k[0] == workspace_id and dataset_id in ("", k[1])]:
+            del self._graphs[key]
+
+    def _forget_last(self, workspace_id: str, dataset_id: str = "") -> None:
+        """Drop the 'last' pointer if it names a deleted lineage (saves keep it)."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'last'").fetchone()
+        if row is not None:
+            last_ws, last_ds = json.loads(row[0])
+            if last_ws == workspace_id and dataset_id in ("", last_ds):
+                self._conn.execute("DELETE FROM meta WHERE key = 'last'")
+
+    def _dependency_graph(self, workspace_id: str, dataset_id: str) -> DaxDependencyGraph:
+        key = (workspace_id, dataset_id)
+        graph = self._graphs.get(key)
+        if graph is None:
+            graph = self._graphs[key] = DaxDependencyGraph(self._conn.execute(
+                "SELECT table_name, name, field_type, expression FROM fields"
+                " WHERE workspace_id = ? AND dataset_id = ? ORDER BY table_position, field_type, position",
+                key,
+            ))
+        return graph
+
+    def _derived_usages(
+        self, field_name: str, table_name: str, field_type: str, workspace_id: str, dataset_id: str
+    ) -> list[tuple[FieldRef, tuple]]:
+        """Usage rows of the fields derived from the looked-up field, as (looked-up field, row)."""
+        where, params = _where_key(workspace_id, dataset_id)
+        keys = self._conn.execute(
+            f"SELECT workspace_id, dataset_id FROM models WHERE 1 = 1{where} ORDER BY rowid", params
+        ).fetchall()
+        found: list[tuple[FieldRef, tuple]] = []
+        for ws, ds in keys:
+            graph = self._dependency_graph(ws, ds)
+            targets = [(table_name, field_name, field_type or "column")] if table_name else graph.fields_named(field_name)
+            for target in targets:
+                derived = graph.dependents(target)
+                for i in range(0, len(derived), _FIELDS_PER_QUERY):
+                    chunk = derived[i:i + _FIELDS_PER_QUERY]
+                    sql = (
+                        _USAGE_SELECT + "WHERE b.workspace_id = ? AND b.dataset_id = ?"
+                        " AND (b.table_name, b.field_name, b.field_type) IN (VALUES "
+                        + ", ".join(["(?, ?, ?)"] * len(chunk)) + ")" + _USAGE_ORDER
+                    )
+                    rows = self._conn.execute(sql, [ws, ds, *(v for ref in chunk for v in ref)]).fetchall()
+                    found.extend((target, row) for row in rows)
+        return found
+
+    def _load_model(self, workspace_id: str, dataset_id: str) -> Optional[SemanticModelInfo]:
+        key = (workspace_id, dataset_id)
+        row = self._conn.execute(
+            "SELECT name, description, relationships, roles FROM models"
+            " WHERE workspace_id = ? AND dataset_id = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        name, description, relationships, roles = row
+
+        tables = [
+            TableInfo(name=tname, is_hidden=bool(hidden), description=desc, source=source)
+            for tname, hidden, desc, source in self._conn.execute(
+                "SELECT name, is_hidden, description, source FROM model_tables"
+                " WHERE workspace_id = ? AND dataset_id = ? ORDER BY position",
+                key,
+            )
+        ]
+        for ti, ftype, tname, fname, data_type, hidden, expr, desc, source_col, fmt in self._conn.execute(
+            "SELECT table_position, field_type, table_name, name, data_type, is_hidden, expression,"
+            " description, source_column, format_string FROM fields"
+            " WHERE workspace_id = ? AND dataset_id = ? ORDER BY table_position, field_type, position",
+            key,
+        ):
+            if ftype == "column":
+                tables[ti].columns.append(ColumnInfo(
+                    name=fname, data_type=data_type, is_hidden=bool(hidden),
+                    expression=expr, description=desc, source_column=source_col,
+                ))
+            else:
+                tables[ti].measures.append(MeasureInfo(
+                    name=fname, expression=expr or "", format_string=fmt,
+                    description=desc, table_name=tname,
+                ))
+
+        return SemanticModelInfo(
+            id=dataset_id,
+            name=name,
+            description=description,
+            tables=tables,
+            relationships=[RelationshipInfo(**r) for r in json.loads(relationships)],
+            roles=[RoleInfo(**r) for r in json.loads(roles)],
+        )
+
+    def _load_reports(self, workspace_id: str, dataset_id: str) -> list[ReportInfo]:
+        key = (workspace_id, dataset_id)
+        reports = [
+            ReportInfo(id=rid, name=rname, dataset_id=dataset_id, workspace_id=report_ws)
+            for rid, report_ws, rname in self._conn.execute(
+                "SELECT report_id, report_workspace_id, name FROM reports"
+                " WHERE workspace_id = ? AND dataset_id = ? ORDER BY position",
+                key,
+            )
+        ]
+        for ri, name, display_name, ordinal, visibility in self._conn.execute(
+            "SELECT report_position, name, display_name, ordinal, visibility FROM pages"
+            " WHERE workspace_id = ? AND dataset_id = ? ORDER BY report_position, position",
+            key,
+        ):
+            reports[ri].pages.append(PageInfo(
+                name=name, display_name=display_name, ordinal=ordinal, visibility=visibility,
+            ))
+        for ri, pi, vtype, title, vid, filters in self._conn.execute(
+            "SELECT report_position, page_position, visual_type, title, visual_id, filters FROM visuals"
+            " WHERE workspace_id = ? AND dataset_id = ? ORDER BY report_position, page_position, position",
+            key,
+        ):
+            reports[ri].pages[pi].visuals.append(VisualInfo(
+                visual_type=vtype, title=title, visual_id=vid, filters=json.loads(filters),
+            ))
+        for ri, pi, vi, tname, fname, ftype in self._conn.execute(
+            "SELECT report_position, page_position, visual_position, table_name, field_name, field_type"
+            " FROM bindings WHERE workspace_id = ? AND dataset_id = ?"
+            " ORDER BY report_position, page_position, visual_position, position",
+            key,
+        ):
+            reports[ri].pages[pi].visuals[vi].field_bindings.append(VisualFieldBinding(
+                table_name=tname, field_name=fname, field_type=ftype,
+            ))
+        return reports
@@ -0,0 +1,301 @@
+"""Streaming parser for TMDL (Tabular Model Definition Language) semantic models.
+
+Each ``.tmdl`` file is read one line at a time off an in-memory stream — no
+list of lines is built, and only structural lines are split further — and turned into a small tree of ``TmdlObject`` declarations
+using the indentation rules of the format:
+
+    /// Description of the next object
+    table Sales                          ← object: kind, name
+        isHidden                         ← boolean property
+        column Amount                    ← child object, one level deeper
+            dataType: decimal            ← key: value property
+        measure Total = SUM(Sales[Amount])   ← object with an expression
+        measure Margin =
+                VAR x = [Total]          ← expression lines: two levels deeper
+                RETURN x                   than the object (or a ``` fence)
+            formatString: 0.0%
+
+Tables (columns, measures, partitions), relationships, roles (table
+permissions, members) and the model itself are mapped to TOMPo's models, in a
+single pass over all files, wherever they appear — their own folders or inline
+in model.tmdl. Other objects (hierarchies, annotations, cultures, …) are parsed
+and ignored.
+"""
+
+from __future__ import annotations
+
+import io
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from tompo_mcp.core.models import (
+    ColumnInfo,
+    MeasureInfo,
+    RelationshipInfo,
+    RoleInfo,
+    RoleMember,
+    SemanticModelInfo,
+    TableInfo,
+)
+
+# first line indented with spaces (tab-indented files, the norm, never need it)
+_SPACE_INDENT = re.compile(r"^\t*( +)\S", re.MULTILINE)
+
+_FENCE = "```"
+
+
+@dataclass(slots=True)
+class TmdlObject:
+    kind: str
+    name: str
+    expression: Optional[str] = None
+    description: Optional[str] = None
+    properties: dict[str, str] = field(default_factory=dict)
+    children: list[TmdlObject] = field(default_factory=list)
+
+    def flag(self, key: str) -> bool:
+        value = self.properties.get(key)
+        return value is not None and value.lower() != "false"
+
+    def children_of(self, kind: str) -> Iterator[TmdlObject]:
+        return (child for child in self.children if child.kind == kind)
+
+
+# ── Lines and indentation ────────────────────────────────────────────
+
+def _space_unit(content: str) -> int:
+    """Width of one indentation level in a file that indents with spaces."""
+    if "\n " not in content and not content.startswith(" "):
+        return 4
+    match = _SPACE_INDENT.search(content)
+    return min(len(match.group(1)), 8) if match else 4
+
+
+def _depth(indent: str, space_unit: int) -> int:
+    if " " not in indent:
+        return len(indent)
+    tabs = indent.count("\t")
+    return tabs + (len(indent) - tabs) // space_unit
+
+
+def _read_name(text: str, pos: int, stop: str = "=") -> tuple[str, int]:
+    """A quoted ('it''s') or bare name starting at ``pos``; a bare name ends at ``stop``."""
+    if text.startswith("'", pos):
+        end = text.find("'", pos + 1)
+        while end != -1 and text.startswith("'", end + 1):
+            end = text.find("'", end + 2)
+        if end == -1:
+            end = len(text)
+        return text[pos + 1:end].replace("''", "'"), end + 1
+    end = text.find(stop, pos) if stop else -1
+    if end == -1:
+        end = len(text)
+    return text[pos:end].strip(), end
+
+
+def _unquote(value: str) -> str:
+    if value[:1] == '"' and len(value) >= 2 and value[-1] == '"':
+        return value[1:-1].replace('""', '"')
+    return value
+
+
+def _dedent(lines: list[str]) -> str:
+    while lines and not lines[-1]:
+        lines.pop()
+    if not lines:
+        return ""
+    margin = min(len(line) - len(line.lstrip(" \t")) for line in lines if line)
+    return "\n".join(line[margin:] for line in lines)
+
+
+def _read_expression(readline: Callable[[], str], first: str, depth: int, space_unit: int) -> tuple[str, str]:
+    """The expression after ``=`` on a line at ``depth``, and the raw line after it."""
+    block: list[str] = []
+    if first == _FENCE:
+        raw = readline()
+        while raw and raw.strip() != _FENCE:
+            block.append(raw.rstrip())
+            raw = readline()
+        return _dedent(block), readline()
+
+    raw = readline()
+    while raw:
+        line = raw.rstrip()
+        body = line.lstrip(" \t")
+        if body and _depth(line[:len(line) - len(body)], space_unit) < depth + 2:
+            break
+        block.append(line)
+        raw = readline()
+    rest = _dedent(block)
+    if first and rest:
+        return first + "\n" + rest, raw
+    return first or rest, raw
+
+
+# ── Parser ───────────────────────────────────────────────────────────
+
+def parse_tmdl_file(content: str) -> list[TmdlObject]:
+    """Top-level objects declared in one TMDL file."""
+    roots: list[TmdlObject] = []
+    stack: list[tuple[int, TmdlObject]] = []
+    description: list[str] = []
+    space_unit = _space_unit(content)
+    readline = io.StringIO(content).readline
+
+    raw = readline()
+    while raw:
+        body = raw.lstrip("\t")
+        if body[:1] == " ":
+            body = body.lstrip(" \t")
+            depth = _depth(raw[:len(raw) - len(body)], space_unit)
+        else:
+            depth = len(raw) - len(body)
+        text = body.rstrip()
+        raw = ""
+        if not text or text[0] == "/":
+            if text.startswith("///"):
+                description.append(text[3:].strip())
+            raw = readline()
+            continue
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        owner = stack[-1][1] if stack else None
+
+        head, sep, rest = text.partition(" ")
+        if head[-1] == ":" or (not sep and ":" in head):
+            # key: value
+            key, _, value = text.partition(":")
+            if owner is not None:
+                owner.properties[key] = _unquote(value.strip())
+        elif not sep or rest[0] == "=":
+            # bare flag, or key = expression
+            value = "true"
+            if sep:
+                value, raw = _read_expression(readline, rest[1:].strip(), depth, space_unit)
+            if owner is not None and head.isidentifier():
+                owner.properties[head] = value
+        elif head.isidentifier():
+            if head == "ref":
+                name, end = rest, len(rest)
+            else:
+                name, end = _read_name(rest, 0)
+            obj = TmdlObject(kind=head, name=name, description="\n".join(description) or None)
+            description.clear()
+            after = rest[end:].lstrip()
+            if after.startswith("="):
+                obj.expression, raw = _read_expression(readline, after[1:].strip(), depth, space_unit)
+            (owner.children if owner is not None else roots).append(obj)
+            stack.append((depth, obj))
+        if not raw:
+            raw = readline()
+
+    return roots
+
+
+def parse_tmdl(
+    parts: Iterable[tuple[str, str]], dataset_id: str, dataset_name: str
+) -> SemanticModelInfo:
+    """Build a semantic model from ``(path, text)`` pairs of every .tmdl file."""
+    model = SemanticModelInfo(id=dataset_id, name=dataset_name)
+    for _path, content in parts:
+        for obj in parse_tmdl_file(content):
+            if obj.kind == "table":
+                model.tables.append(_table(obj))
+            elif obj.kind == "relationship":
+                relationship = _relationship(obj)
+                if relationship:
+                    model.relationships.append(relationship)
+            elif obj.kind == "role":
+                model.roles.append(_role(obj))
+            elif obj.kind == "model":
+                model.description = _description(obj)
+                for child in obj.children:
+                    if child.kind == "relationship":
+                        relationship = _relationship(child)
+                        if relationship:
+                            model.relationships.append(relationship)
+                    elif child.kind == "role":
+                        model.roles.append(_role(child))
+    return model
+
+
+# ── Mapping to TOMPo models ──────────────────────────────────────────
+
+def _description(obj: TmdlObject) -> Optional[str]:
+    return obj.description or obj.properties.get("description")
+
+
+def _table(obj: TmdlObject) -> TableInfo:
+    source = next(
+        (p.properties.get("source") for p in obj.children_of("partition") if (p.expression or "").lower() == "m"),
+        None,
+    )
+    return TableInfo(
+        name=obj.name,
+        is_hidden=obj.flag("isHidden"),
+        description=_description(obj),
+        source=source,
+        columns=[
+            ColumnInfo(
+                name=col.name,
+                data_type=col.properties.get("dataType", "Unknown"),
+                is_hidden=col.flag("isHidden"),
+                expression=col.expression,
+                description=_description(col),
+                source_column=col.properties.get("sourceColumn"),
+            )
+            for col in obj.children_of("column")
+        ],
+        measures=[
+            MeasureInfo(
+                name=m.name,
+                expression=m.expression or "",
+                format_string=m.properties.get("formatString"),
+                description=_description(m),
+                table_name=obj.name,
+            )
+            for m in obj.children_of("measure")
+        ],
+    )
+
+
+def _column_ref(ref: str) -> tuple[str, str]:
+    """Split ``Table.Column`` / ``'My Table'.'My.Column'`` into (table, column)."""
+    table, end = _read_name(ref, 0, ".")
+    if ref.startswith(".", end):
+        column, _ = _read_name(ref, end + 1, "")
+        return table, column
+    return "", table
+
+
+def _relationship(obj: TmdlObject) -> Optional[RelationshipInfo]:
+    props = obj.properties
+    from_table, from_column = _column_ref(props.get("fromColumn", ""))
+    to_table, to_column = _column_ref(props.get("toColumn", ""))
+    if not (from_table and to_table):
+        return None
+    return RelationshipInfo(
+        from_table=from_table, from_column=from_column,
+        to_table=to_table, to_column=to_column,
+        from_cardinality=props.get("fromCardinality", "many"),
+        to_cardinality=props.get("toCardinality", "one"),
+        cross_filter=props.get("crossFilteringBehavior", "oneDirection"),
+        is_active=props.get("isActive", "true").lower() != "false",
+    )
+
+
+def _role(obj: TmdlObject) -> RoleInfo:
+    return RoleInfo(
+        name=obj.name,
+        model_permission=obj.properties.get("modelPermission", "read"),
+        table_permissions=[
+            {"table": tp.name, "filter": tp.expression or tp.properties.get("filterExpression", "")}
+            for tp in obj.children_of("tablePermission")
+        ],
+        members=[
+            RoleMember(member_name=m.name, member_type=m.properties.get("memberType"))
+            for m in obj.children_of("member")
+        ],
+    )
@@ -1,33 +1,45 @@
 """
 TOMPo MCP Server — Power BI & Fabric Lineage Intelligence.
 
-Exposes 6 tools to AI assistants (GitHub Copilot, Claude, etc):
+Exposes 9 tools to AI assistants (GitHub Copilot, Claude, etc):
   1. list_workspaces            — List Fabric workspaces you have access to
   2. generate_lineage           — Full lineage for ONE model: model → tables → reports → visuals → fields
   3. generate_workspace_lineage — Full lineage for ALL models in a workspace (parallel, fast)
-  4. impact_analysis            — Where is a specific column/measure used?
-  5. describe_semantic_model    — Tables, columns, measures, relationships, roles
-  6. export_lineage_html        — Generate interactive D3 visualization as HTML file (all models)
+  4. generate_tenant_lineage    — Full lineage across many workspaces, incl. cross-workspace reports
+  5. scan_status                — Progress, throughput and ETA of background scans
+  6. scan_results               — Summary of a finished background scan
+  7. impact_analysis            — Where is a specific column/measure used?
+  8. describe_semantic_model    — Tables, columns, measures, relationships, roles
+  9. export_lineage_html        — Generate interactive D3 visualization as HTML file (all models)
 """
 
 from __future__ import annotations
 
 import asyncio
+import base64
+import gzip
 import json
 import logging
 import os
 import tempfile
 import webbrowser
+from collections.abc import Iterator
 from importlib import resources
+from itertools import islice
 from typing import Any
 
 from mcp.server.fastmcp import FastMCP
 
 from tompo_mcp.auth import TokenProvider
+from tompo_mcp.core.cache import DEFAULT_CACHE_DIR, DefinitionCache
+from tompo_mcp.core.definition import definition_digest
 from tompo_mcp.core.fabric_client import FabricClient
-from tompo_mcp.core.lineage import build_lineage, get_all_impact_analysis, get_impact_analysis
+from tompo_mcp.core.jobs import ScanJob, ScanJobQueue
+from tompo_mcp.core.lineage import build_lineage, get_all_impact_analysis
 from tompo_mcp.core.models import LineageNode, LineageResponse, ReportInfo, SemanticModelInfo
-from tompo_mcp.core.parser import parse_report_definition, parse_semantic_model
+from tompo_mcp.core.offload import ParseExecutor
+from tompo_mcp.core.snapshot import ScannedItem, WorkspaceSnapshot, diff_items, same_definition
+from tompo_mcp.core.store import LineageStore
 
 logger = logging.getLogger(__name__)
 
@@ -36,23 +48,120 @@ mcp = FastMCP(
     instructions="Power BI & Fabric lineage intelligence — trace from semantic models to reports to individual visuals.",
 )
 
+# ── Scan concurrency ──────────────────────────────────────────────────
+# Models scanned at once, and report definitions fetched at once across the
+# whole scan. In-flight getDefinition calls never exceed the sum of the two.
+MODEL_CONCURRENCY = int(os.environ.get("TOMPO_MODEL_CONCURRENCY", "3"))
+REPORT_CONCURRENCY = int(os.environ.get("TOMPO_REPORT_CONCURRENCY", "8"))
+# Workspace listings fetched at once by tenant scans
+WORKSPACE_CONCURRENCY = int(os.environ.get("TOMPO_WORKSPACE_CONCURRENCY", "4"))
+# Tenant scan summaries list at most this many errors
+MAX_LISTED_ERRORS = 20
+
+# ── Background scans ──────────────────────────────────────────────────
+# Scans started with background=true run as jobs, this many at a time; the
+# rest wait in order. The newest TOMPO_SCAN_JOBS_KEPT finished jobs stay readable.
+SCAN_JOB_WORKERS = int(os.environ.get("TOMPO_SCAN_JOB_WORKERS", "2"))
+SCAN_JOBS_KEPT = int(os.environ.get("TOMPO_SCAN_JOBS_KEPT", "20"))
+
+# ── Definition cache ──────────────────────────────────────────────────
+# Decoded getDefinition results are kept on disk between server runs;
+# set TOMPO_DEFINITION_CACHE=0 to turn the cache off entirely.
+CACHE_ENABLED = os.environ.get("TOMPO_DEFINITION_CACHE", "1").lower() not in ("0", "false", "off")
+CACHE_DIR = os.environ.get("TOMPO_CACHE_DIR") or None
+CACHE_MAX_MB = int(os.environ.get("TOMPO_CACHE_MAX_MB", "512"))
+CACHE_MAX_AGE_DAYS = float(os.environ.get("TOMPO_CACHE_MAX_AGE_DAYS", "7"))
+
+# ── Lineage store ─────────────────────────────────────────────────────
+# Scan results are written to lineage.sqlite in the cache directory and
+# survive restarts; TOMPO_LINEAGE_STORE=0 keeps them in memory instead.
+STORE_ENABLED = os.environ.get("TOMPO_LINEAGE_STORE", "1").lower() not in ("0", "false", "off")
+
+# ── Tool output ───────────────────────────────────────────────────────
+# generate_lineage returns the tree a page of this many nodes at a time
+LINEAGE_PAGE_SIZE = int(os.environ.get("TOMPO_LINEAGE_PAGE_SIZE", "500"))
+LINEAGE_NODE_TYPES = ("table", "report", "page", "visual", "column", "measure")
+# export_lineage_html inlines at most this many models; bigger exports embed
+# each model as a compressed chunk the viewer decodes when it is selected
+HTML_INLINE_MODELS = int(os.environ.get("TOMPO_HTML_INLINE_MODELS", "10"))
+
+# ── Parsing ───────────────────────────────────────────────────────────
+# Where definitions are parsed: "thread" (default) or "process" pools keep
+# downloads flowing while large models/reports parse; "inline" parses on the
+# event loop. TOMPO_PARSE_WORKERS defaults to min(8, CPU count).
+PARSE_MODE = os.environ.get("TOMPO_PARSE_MODE", "thread").lower()
+PARSE_WORKERS = int(os.environ.get("TOMPO_PARSE_WORKERS", "0")) or None
+
 # ── Shared state ──────────────────────────────────────────────────────
 _token_provider: TokenProvider | None = None
 _client: FabricClient | None = None
-_last_lineage: LineageResponse | None = None
-_last_workspace_id: str = ""
-# Accumulates all lineages per workspace (dataset_id → LineageResponse)
-_workspace_lineages: dict[str, LineageResponse] = {}
+_parser: ParseExecutor | None = None
+# All scanned lineages, keyed by (workspace_id, dataset_id)
+_store: LineageStore | None = None
+# Last workspace scan per workspace id, diffed against by incremental scans
+_workspace_snapshots: dict[str, WorkspaceSnapshot] = {}
+_jobs: ScanJobQueue | None = None
 
 
 def _get_client() -> FabricClient:
     global _token_provider, _client
     if _client is None:
         _token_provider = TokenProvider()
-        _client = FabricClient(_token_provider)
+        _client = FabricClient(_token_provider, cache=_open_cache())
     return _client
 
 
+def _get_parser() -> ParseExecutor:
+    global _parser
+    if _parser is None:
+        try:
+            _parser = ParseExecutor(PARSE_MODE, PARSE_WORKERS)
+        except ValueError as exc:
+            logger.warning("%s — falling back to thread mode", exc)
+            _parser = ParseExecutor("thread", PARSE_WORKERS)
+    return _parser
+
+
+def _get_jobs() -> ScanJobQueue:
+    global _jobs
+    if _jobs is None:
+        _jobs = ScanJobQueue(SCAN_JOB_WORKERS, SCAN_JOBS_KEPT)
+    return _jobs
+
+
+def _get_store() -> LineageStore:
+    global _store
+    if _store is None:
+        path = os.path.join(CACHE_DIR or DEFAULT_CACHE_DIR, "lineage.sqlite") if STORE_ENABLED else None
+        try:
+            _store = LineageStore(path)
+        except Exception as exc:
+            logger.warning("Lineage store unavailable, keeping lineage in memory: %s", exc)
+            _store = LineageStore()
+    return _store
+
+
+async def _save_lineage(workspace_id: str, lineage: LineageResponse, last: bool = False) -> None:
+    store = _get_store()
+    await asyncio.to_thread(store.save, workspace_id, lineage)
+    if last:
+        await asyncio.to_thread(store.set_last, workspace_id, lineage.model.id)
+
+
+def _open_cache() -> DefinitionCache | None:
+    if not CACHE_ENABLED:
+        return None
+    try:
+        return DefinitionCache(
+            CACHE_DIR,
+            max_bytes=CACHE_MAX_MB * 1024 * 1024,
+            max_age=CACHE_MAX_AGE_DAYS * 24 * 3600,
+        )
+    except Exception as exc:
+        logger.warning("Definition cache unavailable, continuing without it: %s", exc)
+        return None
+
+
 # ── Tool 1: List Workspaces ──────────────────────────────────────────
 
 @mcp.tool()
@@ -91,6 +200,11 @@ async def generate_lineage(
     workspace_id: str,
     dataset_id: str | None = None,
     dataset_name: str | None = None,
+    refresh: bool = False,
+    cursor: int = 0,
+    page_size: int = 0,
+    max_depth: int = 0,
+    node_types: list[str] | None = None,
 ) -> str:
     """Generate complete lineage for a semantic model: Model → Tables → Reports → Pages → Visuals → Columns/Measures.
 
@@ -98,11 +212,28 @@ async def generate_lineage(
         workspace_id: The workspace ID (from list_workspaces).
         dataset_id: The semantic model (dataset) ID. If not provided, lists available models.
         dataset_name: Optional human name for the dataset (helps with display).
+        refresh: Ignore locally cached definitions and download everything again.
+        cursor: Tree nodes to skip; pass the cursor printed at the end of the previous page.
+            Pages after the first are rendered from the stored lineage without rescanning.
+        page_size: Tree nodes per page (default 500).
+        max_depth: Only show this many levels below the model (1 = tables, 2 = reports, ...; 0 = all).
+        node_types: Only show these node types ("table", "report", "page", "visual", "column",
+            "measure"); nodes of other types are skipped and what they contain moves up a level.
 
     Returns the lineage tree showing exactly which columns/measures appear in which visuals.
     Tip: Use generate_workspace_lineage to scan ALL models in a workspace at once (faster).
     """
-    global _last_lineage, _last_workspace_id, _workspace_lineages
+    unknown = sorted(set(node_types or ()) - set(LINEAGE_NODE_TYPES))
+    if unknown:
+        return f"Unknown node type(s): {', '.join(unknown)}. Use any of: {', '.join(LINEAGE_NODE_TYPES)}."
+    paging = {"cursor": max(cursor, 0), "page_size": page_size, "max_depth": max_depth, "node_types": node_types}
+
+    # Later pages come from the lineage stored by the first one
+    if cursor > 0 and dataset_id and not refresh:
+        lineage = await asyncio.to_thread(_get_store().load, workspace_id, dataset_id)
+        if lineage:
+            return _format_lineage_tree(lineage, **paging)
+
     client = _get_client()
 
     # If no dataset_id, list available datasets
@@ -118,40 +249,30 @@ async def generate_lineage(
         return "\n".join(lines)
 
     # Get semantic model definition
-    raw_model = await client.get_semantic_model_definition(workspace_id, dataset_id)
+    raw_model = await client.get_semantic_model_definition(workspace_id, dataset_id, bypass_cache=refresh)
     if not raw_model:
         return f"Could not retrieve semantic model definition for dataset `{dataset_id}`. This may be due to sensitivity labels (Confidential/Restricted) blocking access. Check permissions."
 
-    model = parse_semantic_model(raw_model, dataset_id, dataset_name or dataset_id)
+    model = await _get_parser().parse_semantic_model(raw_model, dataset_id, dataset_name or dataset_id)
 
     # Get reports bound to this dataset
     report_dicts = await client.get_reports_for_dataset(workspace_id, dataset_id)
     if not report_dicts:
         lineage = build_lineage(model, [], workspace_id)
-        _last_lineage = lineage
-        _last_workspace_id = workspace_id
-        _workspace_lineages[dataset_id] = lineage
+        await _save_lineage(workspace_id, lineage, last=True)
         return f"Semantic model **{model.name}** has {len(model.tables)} tables but no reports are bound to it (orphaned model).\n\n" + _format_model_summary(model)
 
     # Get report definitions
-    reports: list[ReportInfo] = []
-    for rd in report_dicts:
-        rid = rd.get("id", "")
-        rname = rd.get("name", "Unknown")
-        raw_report = await client.get_report_definition(workspace_id, rid)
-        if raw_report:
-            report = parse_report_definition(raw_report, rid, rname, dataset_id)
-            reports.append(report)
-        else:
-            reports.append(ReportInfo(id=rid, name=rname, dataset_id=dataset_id))
+    reports = await _fetch_reports(
+        client, workspace_id, dataset_id, report_dicts, asyncio.Semaphore(REPORT_CONCURRENCY),
+        bypass_cache=refresh,
+    )
 
     # Build lineage
-    lineage = build_lineage(model, reports, workspace_id)
-    _last_lineage = lineage
-    _last_workspace_id = workspace_id
-    _workspace_lineages[dataset_id] = lineage
+    lineage = await _get_parser().build_lineage(model, reports, workspace_id)
+    await _save_lineage(workspace_id, lineage, last=True)
 
-    return _format_lineage_tree(lineage)
+    return _format_lineage_tree(lineage, **paging)
 
 
 # ── Tool 2b: Generate Workspace Lineage (ALL models, parallel) ───────
@@ -159,80 +280,204 @@ async def generate_lineage(
 @mcp.tool()
 async def generate_workspace_lineage(
     workspace_id: str,
+    refresh: bool = False,
+    use_scanner: bool = False,
+    incremental: bool = True,
+    background: bool = False,
 ) -> str:
     """Generate lineage for ALL semantic models in a workspace in one call (parallel, fast).
 
     Args:
         workspace_id: The workspace ID (from list_workspaces).
+        refresh: Ignore locally cached definitions and download everything again.
+        use_scanner: Read every model's schema from a single Admin Scanner API scan of the
+            workspace instead of one getDefinition call per model (requires Fabric admin).
+        incremental: Reuse the previous scan of this workspace for models and reports whose
+            modification time has not changed; only new or changed items are fetched.
+        background: Queue the scan as a background job and return its job id immediately;
+            follow it with scan_status and read the summary with scan_results.
 
     Scans every semantic model in the workspace, finds bound reports, and builds complete
     lineage trees. Results are accumulated for export_lineage_html. Much faster than
     calling generate_lineage multiple times.
     """
-    global _last_lineage, _last_workspace_id, _workspace_lineages
+    if background:
+        job = _get_jobs().submit(
+            f"workspace:{workspace_id}:{refresh}:{use_scanner}:{incremental}",
+            f"Workspace scan `{workspace_id}`",
+            lambda job: _scan_workspace(workspace_id, refresh, use_scanner, incremental, job),
+        )
+        return _format_job_submitted(job)
+    return await _scan_workspace(workspace_id, refresh, use_scanner, incremental)
+
+
+async def _scan_workspace(
+    workspace_id: str,
+    refresh: bool,
+    use_scanner: bool,
+    incremental: bool,
+    job: ScanJob | None = None,
+) -> str:
+    """Body of generate_workspace_lineage; reports per-model progress to ``job``."""
+    job = job or ScanJob(id="", description="")
     client = _get_client()
+    store = _get_store()
 
     items = await client.get_workspace_items(workspace_id)
     datasets = items.get("datasets", [])
     all_reports = items.get("reports", [])
+    versions = items.get("versions", {})
 
     if not datasets:
+        # Every model was deleted: drop the workspace's stored lineages too
+        _workspace_snapshots.pop(workspace_id, None)
+        await asyncio.to_thread(store.retain, workspace_id, [])
         return "No semantic models found in this workspace."
+    job.set_total(len(datasets))
 
-    # Reset workspace lineages for this workspace
-    _workspace_lineages = {}
-    _last_workspace_id = workspace_id
+    # Diff the listing against the previous scan (everything is new on a full scan)
+    previous = _workspace_snapshots.get(workspace_id) if incremental and not refresh else None
+    previous = previous or WorkspaceSnapshot(workspace_id)
+    model_changes = diff_items(previous.models, datasets, versions)
+    report_changes = diff_items(previous.reports, all_reports, versions)
+    snapshot = WorkspaceSnapshot(workspace_id)
+    rebuilt_reports: set[str] = set()
 
     results: list[str] = []
     errors: list[str] = []
-
-    # Process models with limited concurrency (3 at a time to avoid rate limits)
-    semaphore = asyncio.Semaphore(3)
+    unchanged = 0
+    with_reports: set[str] = set()
+
+    if use_scanner and model_changes.stale:
+        scanned = await client.scan_workspaces_admin([workspace_id])
+        logger.info("Scanner API returned %d of %d models", len(scanned), len(datasets))
+
+    # Process models with limited concurrency to avoid rate limits; report
+    # fetches share one limit across every model in the scan
+    semaphore = asyncio.Semaphore(MODEL_CONCURRENCY)
+    report_semaphore = asyncio.Semaphore(REPORT_CONCURRENCY)
+    parser = _get_parser()
+
+    async def _fetch_model(
+        ds: dict, reuse: bool = True
+    ) -> tuple[ScannedItem, SemanticModelInfo | None] | None:
+        """Fetch a model definition; None in place of the model means the stored one still applies."""
+        ds_id = ds.get("id", "")
+        raw_model = await client.get_semantic_model_definition(
+            workspace_id, ds_id, bypass_cache=refresh, prefer_scanner=use_scanner
+        )
+        if not raw_model:
+            return None
+        scanned = ScannedItem(versions.get(ds_id.lower(), ""), await asyncio.to_thread(definition_digest, raw_model))
+        if reuse and same_definition(previous.models.get(ds_id), scanned.digest):
+            return scanned, None
+        return scanned, await parser.parse_semantic_model(raw_model, ds_id, ds.get("name", "Unknown"))
+
+    async def _scan_report(
+        rd: dict[str, Any], ds_id: str, reuse: bool = True
+    ) -> tuple[ScannedItem, ReportInfo | None]:
+        """Scan one bound report; None in place of the report means the stored one still applies."""
+        rid = rd.get("id", "")
+        rname = rd.get("name", "Unknown")
+        prior = previous.reports.get(rid)
+        if reuse and rid in report_changes.unchanged and prior.dataset_id == ds_id:
+            return prior, None
+        async with report_semaphore:
+            raw_report = await client.get_report_definition(workspace_id, rid, bypass_cache=refresh)
+        rebuilt_reports.add(rid)
+        if not raw_report:
+            # No version recorded, so the next scan tries again
+            return ScannedItem("", "", ds_id), ReportInfo(id=rid, name=rname, dataset_id=ds_id)
+        scanned = ScannedItem(versions.get(rid.lower(), ""), await asyncio.to_thread(definition_digest, raw_report), ds_id)
+        if reuse and same_definition(prior, scanned.digest, ds_id):
+            rebuilt_reports.discard(rid)
+            return scanned, None
+        return scanned, await parser.parse_report_definition(raw_report, rid, rname, ds_id)
 
     async def _process_model(ds: dict) -> None:
+        nonlocal unchanged
         ds_id = ds.get("id", "")
         ds_name = ds.get("name", "Unknown")
+        bound_ids: list[str] = []
+        ok = False
         async with semaphore:
+            job.model_started(ds_name)
             try:
-                raw_model = await client.get_semantic_model_definition(workspace_id, ds_id)
-                if not raw_model:
-                    errors.append(f"⚠️ **{ds_name}** — could not retrieve definition (possibly Confidential/Restricted label)")
-                    return
-
-                model = parse_semantic_model(raw_model, ds_id, ds_name)
+                model: SemanticModelInfo | None = None
+                if ds_id in model_changes.unchanged:
+                    scanned_model = previous.models[ds_id]
+                else:
+                    fetched = await _fetch_model(ds)
+                    if fetched is None:
+                        errors.append(f"⚠️ **{ds_name}** — could not retrieve definition (possibly Confidential/Restricted label)")
+                        return
+                    scanned_model, model = fetched
 
                 # Find reports bound to this dataset
                 bound_reports = [r for r in all_reports if r.get("datasetId") == ds_id]
-                reports: list[ReportInfo] = []
-                for rd in bound_reports:
-                    rid = rd.get("id", "")
-                    rname = rd.get("name", "Unknown")
-                    raw_report = await client.get_report_definition(workspace_id, rid)
-                    if raw_report:
-                        report = parse_report_definition(raw_report, rid, rname, ds_id)
+                scanned = await asyncio.gather(*[_scan_report(r, ds_id) for r in bound_reports])
+                bound_ids = sorted(r.get("id", "") for r in bound_reports)
+
+                if model is None and previous.lineage_is_current(store, ds_id, bound_ids, rebuilt_reports):
+                    # The stored lineage was built from exactly these items
+                    unchanged += 1
+                    table_count = await asyncio.to_thread(store.table_count, workspace_id, ds_id)
+                else:
+                    # Reused items come back from the store; anything it lacks is fetched again
+                    if model is None:
+                        model = await asyncio.to_thread(store.load_model, workspace_id, ds_id)
+                    if model is None:
+                        fetched = await _fetch_model(ds, reuse=False)
+                        if fetched is None:
+                            errors.append(f"⚠️ **{ds_name}** — could not retrieve definition (possibly Confidential/Restricted label)")
+                            return
+                        scanned_model, model = fetched
+                    stored: dict[str, ReportInfo] = {}
+                    if any(report is None for _, report in scanned):
+                        stored = {r.id: r for r in await asyncio.to_thread(store.load_reports, workspace_id, ds_id)}
+                    reports = []
+                    for i, (rd, (item, report)) in enumerate(zip(bound_reports, scanned)):
+                        if report is None:
+                            report = stored.get(rd.get("id", ""))
+                        if report is None:
+                            item, report = scanned[i] = await _scan_report(rd, ds_id, reuse=False)
                         reports.append(report)
-                    else:
-                        reports.append(ReportInfo(id=rid, name=rname, dataset_id=ds_id))
-
-                lineage = build_lineage(model, reports, workspace_id)
-                _workspace_lineages[ds_id] = lineage
-
-                status = "Active" if reports else "Orphaned (no reports)"
-                results.append(f"✅ **{ds_name}** — {len(model.tables)} tables, {len(reports)} reports [{status}]")
+                    lineage = await parser.build_lineage(model, reports, workspace_id)
+                    await asyncio.to_thread(store.save, workspace_id, lineage)
+                    table_count = len(model.tables)
+
+                snapshot.models[ds_id] = scanned_model
+                snapshot.reports.update((rd.get("id", ""), item) for rd, (item, _) in zip(bound_reports, scanned))
+                snapshot.bindings[ds_id] = bound_ids
+                if bound_ids:
+                    with_reports.add(ds_id)
+
+                status = "Active" if bound_ids else "Orphaned (no reports)"
+                results.append(f"✅ **{ds_name}** — {table_count} tables, {len(bound_ids)} reports [{status}]")
+                ok = True
             except Exception as exc:
                 errors.append(f"❌ **{ds_name}** — error: {exc}")
+            finally:
+                job.model_finished(ds_name, len(bound_ids), failed=not ok)
 
     await asyncio.gather(*[_process_model(ds) for ds in datasets])
+    _workspace_snapshots[workspace_id] = snapshot
+    # Drop removed and failed models; other workspaces' scans are kept
+    await asyncio.to_thread(store.retain, workspace_id, snapshot.models)
 
-    # Set _last_lineage to the first one that has reports, or just the first one
-    for lineage in _workspace_lineages.values():
-        _last_lineage = lineage
-        if lineage.reports:
-            break
+    # The first model that has reports, or just the first one, becomes the default
+    scanned_ids = [ds.get("id", "") for ds in datasets if ds.get("id", "") in snapshot.models]
+    if scanned_ids:
+        await asyncio.to_thread(
+            store.set_last, workspace_id, next((d for d in scanned_ids if d in with_reports), scanned_ids[0])
+        )
 
     # Format summary
     lines = [f"# Workspace Lineage Scan Complete\n"]
     lines.append(f"**Models found:** {len(datasets)} | **Successfully scanned:** {len(results)} | **Errors:** {len(errors)}\n")
+    if unchanged:
+        removed = len(model_changes.removed)
+        lines.append(f"**Unchanged since last scan:** {unchanged} (reused) | **Removed:** {removed}\n")
 
     if results:
         lines.append("## Scanned Models\n")
@@ -244,59 +489,324 @@ async def generate_workspace_lineage(
         lines.extend(errors)
         lines.append("")
 
-    lines.append(f"\n💡 Use `export_lineage_html` to generate an interactive visualization with ALL {len(_workspace_lineages)} models.")
+    lines.append(f"\n💡 Use `export_lineage_html` to generate an interactive visualization with ALL {len(store.keys())} models.")
+    return "\n".join(lines)
+
+
+# ── Tool 2c: Generate Tenant Lineage (many workspaces, parallel) ─────
+
+@mcp.tool()
+async def generate_tenant_lineage(
+    workspace_ids: list[str] | None = None,
+    refresh: bool = False,
+    use_scanner: bool = False,
+    background: bool = False,
+) -> str:
+    """Generate lineage for every semantic model across many workspaces (or the whole tenant).
+
+    Args:
+        workspace_ids: Workspaces to scan. Leave empty to scan every workspace you can access.
+        refresh: Ignore locally cached definitions and download everything again.
+        use_scanner: Read model schemas from one Admin Scanner API scan of all the workspaces
+            (requires Fabric admin).
+        background: Queue the scan as a background job and return its job id immediately;
+            follow it with scan_status and read the summary with scan_results.
+
+    Reports are matched to their model through the model's workspace, so a report in one
+    workspace bound to a model in another shows up in that model's lineage. Results are
+    kept per (workspace, model) alongside earlier scans for impact_analysis and
+    export_lineage_html.
+    """
+    if background:
+        scope = ",".join(sorted(workspace_ids)) if workspace_ids else "*"
+        job = _get_jobs().submit(
+            f"tenant:{scope}:{refresh}:{use_scanner}",
+            f"Tenant scan of {len(workspace_ids)} workspace(s)" if workspace_ids else "Tenant scan of every workspace",
+            lambda job: _scan_tenant(workspace_ids, refresh, use_scanner, job),
+        )
+        return _format_job_submitted(job)
+    return await _scan_tenant(workspace_ids, refresh, use_scanner)
+
+
+async def _scan_tenant(
+    workspace_ids: list[str] | None,
+    refresh: bool,
+    use_scanner: bool,
+    job: ScanJob | None = None,
+) -> str:
+    """Body of generate_tenant_lineage; reports per-model progress to ``job``."""
+    job = job or ScanJob(id="", description="")
+    client = _get_client()
+    store = _get_store()
+
+    if not workspace_ids:
+        workspaces = await client.list_workspaces()
+        workspace_ids = [
+            ws["id"] for ws in workspaces
+            if ws.get("id") and ws.get("state", "Active") not in ("Deleted", "Removing")
+        ]
+    if not workspace_ids:
+        return "No workspaces found. Make sure you're logged in with `az login` and have access to Fabric workspaces."
+
+    # List every workspace's items, a few workspaces at a time
+    listing_semaphore = asyncio.Semaphore(WORKSPACE_CONCURRENCY)
+    errors: list[str] = []
+
+    async def _list(ws_id: str) -> dict[str, list[dict[str, Any]]] | None:
+        async with listing_semaphore:
+            try:
+                return await client.get_workspace_items(ws_id)
+            except Exception as exc:
+                errors.append(f"❌ Workspace `{ws_id}` — could not list items: {exc}")
+                return None
+
+    # Workspaces whose listing failed are left out, and their stored lineages kept
+    listings = {
+        ws_id: items
+        for ws_id, items in zip(workspace_ids, await asyncio.gather(*[_list(ws) for ws in workspace_ids]))
+        if items is not None
+    }
+
+    # Bind reports to (model workspace, model id); ids are GUIDs, compared case-insensitively
+    models: dict[tuple[str, str], tuple[str, dict[str, Any]]] = {}
+    for ws_id, items in listings.items():
+        for ds in items.get("datasets", []):
+            if ds.get("id"):
+                models[(ws_id.lower(), ds["id"].lower())] = (ws_id, ds)
+    bindings: dict[tuple[str, str], list[dict[str, Any]]] = {key: [] for key in models}
+    cross_workspace = unresolved = 0
+    for ws_id, items in listings.items():
+        for rd in items.get("reports", []):
+            if not rd.get("datasetId"):
+                continue
+            model_ws = rd.get("datasetWorkspaceId") or ws_id
+            key = (model_ws.lower(), rd["datasetId"].lower())
+            if key not in bindings:
+                unresolved += 1
+                continue
+            if key[0] != ws_id.lower():
+                cross_workspace += 1
+            bindings[key].append({**rd, "_workspace_id": ws_id})
+
+    if not models:
+        # The listed workspaces are empty now: drop whatever was stored for them
+        for ws_id in listings:
+            await asyncio.to_thread(store.retain, ws_id, [])
+            _workspace_snapshots.pop(ws_id, None)
+        return f"No semantic models found in {len(workspace_ids)} workspaces."
+    job.set_total(len(models))
+
+    if use_scanner:
+        scanner_models = await client.scan_workspaces_admin(list(listings))
+        logger.info("Scanner API returned %d of %d models", len(scanner_models), len(models))
+
+    # Same global limits as a single-workspace scan, shared across every workspace
+    semaphore = asyncio.Semaphore(MODEL_CONCURRENCY)
+    report_semaphore = asyncio.Semaphore(REPORT_CONCURRENCY)
+    parser = _get_parser()
+    scanned: dict[str, list[str]] = {ws_id: [] for ws_id in listings}
+    report_total = 0
+    # Default for follow-up tools: the first model scanned that has reports
+    default: list[tuple[str, str]] = []
+
+    async def _process_model(key: tuple[str, str]) -> None:
+        ws_id, ds = models[key]
+        ds_id = ds["id"]
+        ds_name = ds.get("name", "Unknown")
+        nonlocal report_total
+        reports: list[ReportInfo] = []
+        ok = False
+        async with semaphore:
+            job.model_started(ds_name)
+            try:
+                raw_model = await client.get_semantic_model_definition(
+                    ws_id, ds_id, bypass_cache=refresh, prefer_scanner=use_scanner
+                )
+                if not raw_model:
+                    errors.append(f"⚠️ **{ds_name}** (`{ws_id}`) — could not retrieve definition")
+                    return
+                model = await parser.parse_semantic_model(raw_model, ds_id, ds_name)
+                reports = await _fetch_reports(
+                    client, ws_id, ds_id, bindings[key], report_semaphore, bypass_cache=refresh,
+                )
+                lineage = await parser.build_lineage(model, reports, ws_id)
+                await asyncio.to_thread(store.save, ws_id, lineage)
+                scanned[ws_id].append(ds_id)
+                report_total += len(reports)
+                if reports and not default:
+                    default.append((ws_id, ds_id))
+                ok = True
+            except Exception as exc:
+                errors.append(f"❌ **{ds_name}** (`{ws_id}`) — error: {exc}")
+            finally:
+                job.model_finished(ds_name, len(reports), failed=not ok)
+
+    await asyncio.gather(*[_process_model(key) for key in models])
+
+    # Drop the listed workspaces' removed and failed models; results are keyed per workspace.
+    # Their incremental snapshots no longer describe the store, so the next workspace scan is full.
+    for ws_id, ds_ids in scanned.items():
+        await asyncio.to_thread(store.retain, ws_id, ds_ids)
+        _workspace_snapshots.pop(ws_id, None)
+    success = sum(len(ds_ids) for ds_ids in scanned.values())
+    default.extend((ws_id, ds_id) for ws_id, ds_ids in scanned.items() for ds_id in ds_ids[:1])
+    if default:
+        await asyncio.to_thread(store.set_last, *default[0])
+
+    lines = ["# Tenant Lineage Scan Complete\n"]
+    lines.append(
+        f"**Workspaces:** {len(workspace_ids)} | **Models found:** {len(models)} | "
+        f"**Successfully scanned:** {success} | **Errors:** {len(errors)}\n"
+    )
+    lines.append(
+        f"**Reports:** {report_total} | "
+        f"**Cross-workspace bindings:** {cross_workspace} | "
+        f"**Bound to models outside the scan:** {unresolved}\n"
+    )
+    if errors:
+        lines.append("## Issues\n")
+        lines.extend(errors[:MAX_LISTED_ERRORS])
+        if len(errors) > MAX_LISTED_ERRORS:
+            lines.append(f"... and {len(errors) - MAX_LISTED_ERRORS} more")
+        lines.append("")
+
+    lines.append(f"\n💡 Use `impact_analysis` or `export_lineage_html` across all {len(store.keys())} models.")
     return "\n".join(lines)
 
 
-def _format_lineage_tree(lineage: LineageResponse) -> str:
-    """Format lineage as a readable tree string."""
+async def _fetch_reports(
+    client: FabricClient,
+    workspace_id: str,
+    dataset_id: str,
+    report_dicts: list[dict[str, Any]],
+    limit: asyncio.Semaphore,
+    bypass_cache: bool = False,
+) -> list[ReportInfo]:
+    """Fetch and parse report definitions concurrently, at most ``limit`` in flight.
+
+    Parsing runs on the parse executor after the fetch slot is released, so the
+    next download starts while this one parses. Results keep the order of
+    ``report_dicts``; reports whose definition cannot be retrieved are returned
+    without pages. A report dict carrying ``_workspace_id`` (set by tenant scans
+    for reports bound across workspaces) is fetched from that workspace.
+    """
+    parser = _get_parser()
+
+    async def _fetch(rd: dict[str, Any]) -> ReportInfo:
+        rid = rd.get("id", "")
+        rname = rd.get("name", "Unknown")
+        report_ws = rd.get("_workspace_id") or workspace_id
+        async with limit:
+            raw_report = await client.get_report_definition(report_ws, rid, bypass_cache=bypass_cache)
+        if raw_report:
+            report = await parser.parse_report_definition(raw_report, rid, rname, dataset_id)
+        else:
+            report = ReportInfo(id=rid, name=rname, dataset_id=dataset_id)
+        if report_ws != workspace_id:
+            report.workspace_id = report_ws
+        return report
+
+    return list(await asyncio.gather(*[_fetch(rd) for rd in report_dicts]))
+
+
+_NODE_ICONS = {
+    "model": "📊", "table": "📋", "report": "📄",
+    "page": "📑", "visual": "📈", "column": "🔹", "measure": "🔸",
+}
+
+
+def _format_lineage_tree(
+    lineage: LineageResponse,
+    cursor: int = 0,
+    page_size: int = 0,
+    max_depth: int = 0,
+    node_types: list[str] | None = None,
+) -> str:
+    """Format one page of the lineage as a readable tree string."""
     lines: list[str] = []
     model = lineage.model
-    tree = lineage.lineage_tree
+    page_size = page_size if page_size > 0 else LINEAGE_PAGE_SIZE
 
     lines.append(f"# Lineage for {model.name}\n")
     lines.append(f"**Tables:** {len(model.tables)} | **Reports:** {len(lineage.reports)} | "
                  f"**Relationships:** {len(model.relationships)}\n")
+    if cursor:
+        lines.append(f"*…continued from node {cursor}*\n")
+
+    # Only the nodes on this page (plus one, to know whether more follow) are rendered
+    rows = list(islice(
+        _iter_tree_rows(lineage.lineage_tree, max_depth, set(node_types) if node_types else None),
+        cursor, cursor + page_size + 1,
+    ))
+    for prefix, node in rows[:page_size]:
+        lines.append(f"{prefix}{_format_node(node)}")
+
+    if not rows:
+        lines.append("No lineage connections found." if not cursor else "No more nodes.")
+    elif len(rows) > page_size:
+        lines.append(
+            f"\n*Showing nodes {cursor + 1}–{cursor + page_size}. More follow: call "
+            f"`generate_lineage` again with `cursor={cursor + page_size}` and the same filters.*"
+        )
+    return "\n".join(lines)
 
-    def _render_node(node: LineageNode, indent: str = "", is_last: bool = True) -> None:
-        connector = "└── " if is_last else "├── "
-        prefix = indent + connector
-
-        icon = {
-            "model": "📊", "table": "📋", "report": "📄",
-            "page": "📑", "visual": "📈", "column": "🔹", "measure": "🔸",
-        }.get(node.node_type, "•")
-
-        label = node.name
-        extra = ""
-
-        if node.node_type == "visual":
-            title = node.metadata.get("title", "")
-            if title and title != node.name:
-                extra = f" — *{title}*"
-        elif node.node_type == "table":
-            cc = node.metadata.get("column_count", 0)
-            mc = node.metadata.get("measure_count", 0)
-            if node.metadata.get("orphan"):
-                extra = f" ({cc} cols, {mc} measures) ⚠️ *not used in any report*"
-            else:
-                extra = f" ({cc} cols, {mc} measures)"
-        elif node.node_type in ("column", "measure"):
-            extra = f" [{node.node_type[0].upper()}]"
-
-        lines.append(f"{prefix}{icon} {label}{extra}")
-
-        child_indent = indent + ("    " if is_last else "│   ")
-        for i, child in enumerate(node.children):
-            _render_node(child, child_indent, i == len(node.children) - 1)
-
-    if tree.children:
-        for i, child in enumerate(tree.children):
-            _render_node(child, "", i == len(tree.children) - 1)
-    else:
-        lines.append("No lineage connections found.")
 
-    return "\n".join(lines)
+def _iter_tree_rows(
+    root: LineageNode, max_depth: int = 0, node_types: set[str] | None = None,
+) -> Iterator[tuple[str, LineageNode]]:
+    """Yield (tree prefix, node) depth-first, one node at a time, below ``root``."""
+
+    def _shown(node: LineageNode) -> Iterator[LineageNode]:
+        if node_types is None:
+            yield from node.children
+            return
+        # Children of skipped nodes take their place; fields bound by several
+        # skipped visuals are listed once (per table: same-named fields of
+        # different tables stay apart)
+        promoted: set[tuple[str, str, str]] = set()
+        for child in node.children:
+            if child.node_type in node_types:
+                yield child
+                continue
+            for descendant in _shown(child):
+                if descendant.children:
+                    yield descendant
+                    continue
+                key = (descendant.node_type, descendant.metadata.get("table", ""), descendant.name)
+                if key not in promoted:
+                    promoted.add(key)
+                    yield descendant
+
+    def _walk(node: LineageNode, indent: str, depth: int) -> Iterator[tuple[str, LineageNode]]:
+        children = _shown(node)
+        upcoming = next(children, None)
+        while upcoming is not None:
+            child, upcoming = upcoming, next(children, None)
+            is_last = upcoming is None
+            yield indent + ("└── " if is_last else "├── "), child
+            if not max_depth or depth < max_depth:
+                yield from _walk(child, indent + ("    " if is_last else "│   "), depth + 1)
+
+    yield from _walk(root, "", 1)
+
+
+def _format_node(node: LineageNode) -> str:
+    icon = _NODE_ICONS.get(node.node_type, "•")
+    extra = ""
+    if node.node_type == "visual":
+        title = node.metadata.get("title", "")
+        if title and title != node.name:
+            extra = f" — *{title}*"
+    elif node.node_type == "table":
+        cc = node.metadata.get("column_count", 0)
+        mc = node.metadata.get("measure_count", 0)
+        if node.metadata.get("orphan"):
+            extra = f" ({cc} cols, {mc} measures) ⚠️ *not used in any report*"
+        else:
+            extra = f" ({cc} cols, {mc} measures)"
+    elif node.node_type in ("column", "measure"):
+        extra = f" [{node.node_type[0].upper()}]"
+    return f"{icon} {node.name}{extra}"
 
 
 def _format_model_summary(model: SemanticModelInfo) -> str:
@@ -308,6 +818,98 @@ def _format_model_summary(model: SemanticModelInfo) -> str:
     return "\n".join(lines)
 
 
+# ── Tool 2d: Background Scan Jobs ────────────────────────────────────
+
+@mcp.tool()
+async def scan_status(job_id: str = "") -> str:
+    """Progress of background scans started with background=true.
+
+    Args:
+        job_id: The job to report on (from generate_workspace_lineage / generate_tenant_lineage).
+            Leave empty to list every queued, running and recently finished job.
+
+    Shows models done out of the total, failures, throughput and an ETA. Once a job is
+    done, call scan_results for its summary.
+    """
+    jobs = _get_jobs()
+    if not job_id:
+        listed = jobs.jobs()
+        if not listed:
+            return "No background scans. Pass `background=true` to `generate_workspace_lineage` or `generate_tenant_lineage`."
+        lines = ["# Background Scans\n", "| Job | Scan | State | Models | Elapsed |", "|-----|------|-------|--------|---------|"]
+        for job in reversed(listed):
+            models = f"{job.models_done}/{job.models_total}" if job.models_total else "–"
+            lines.append(
+                f"| `{job.id}` | {job.description} | {_job_state(jobs, job)} | {models} | {_format_duration(job.elapsed)} |"
+            )
+        return "\n".join(lines)
+
+    job = jobs.get(job_id)
+    if job is None:
+        return f"No scan job `{job_id}` (finished jobs are kept for the {SCAN_JOBS_KEPT} most recent scans)."
+    lines = [f"# Scan job `{job.id}` — {_job_state(jobs, job)}\n", f"{job.description}\n"]
+    if job.models_total:
+        failed = f" ({job.models_failed} failed)" if job.models_failed else ""
+        lines.append(f"**Models:** {job.models_done}/{job.models_total} done{failed} | **Reports:** {job.reports_done}")
+    rate = job.rate()
+    if rate is not None:
+        eta = job.eta()
+        lines.append(
+            f"**Throughput:** {rate:.2f} models/s, {job.reports_done / job.elapsed:.2f} reports/s"
+            + (f" | **ETA:** ~{_format_duration(eta)}" if eta is not None else "")
+        )
+    if job.started_at is not None:
+        lines.append(f"**Elapsed:** {_format_duration(job.elapsed)}")
+    if job.in_progress:
+        lines.append(f"**In progress:** {', '.join(job.in_progress)}")
+    if job.state == "done":
+        lines.append(f"\n💡 Call `scan_results` with `job_id={job.id}` for the summary.")
+    elif job.state == "failed":
+        lines.append(f"\n❌ {job.error}")
+    return "\n".join(lines)
+
+
+@mcp.tool()
+async def scan_results(job_id: str) -> str:
+    """Summary of a finished background scan — the report the scan tool returns when run directly.
+
+    Args:
+        job_id: The job id returned when the scan was queued.
+    """
+    jobs = _get_jobs()
+    job = jobs.get(job_id)
+    if job is None:
+        return f"No scan job `{job_id}` (finished jobs are kept for the {SCAN_JOBS_KEPT} most recent scans)."
+    if job.state == "failed":
+        return f"Scan job `{job.id}` failed: {job.error}"
+    if job.state != "done":
+        return await scan_status(job_id)
+    return job.result or ""
+
+
+def _format_job_submitted(job: ScanJob) -> str:
+    jobs = _get_jobs()
+    return (
+        f"{job.description} is {_job_state(jobs, job)} as job `{job.id}`.\n"
+        f"Poll `scan_status` with `job_id={job.id}`; when it is done, `scan_results` returns the summary."
+    )
+
+
+def _job_state(jobs: ScanJobQueue, job: ScanJob) -> str:
+    if job.state == "queued":
+        return f"queued (position {jobs.position(job)}, {jobs.workers} scan(s) run at a time)"
+    return job.state
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
+
 # ── Tool 3: Impact Analysis ─────────────────────────────────────────
 
 @mcp.tool()
@@ -328,70 +930,58 @@ async def impact_analysis(
         dataset_id: Dataset ID (optional if you just ran generate_lineage).
 
     Searches across ALL scanned models in the workspace. Shows which reports, pages, and
-    visuals would be affected if you rename or remove this field.
+    visuals would be affected if you rename or remove this field — including visuals that
+    only use it through measures (or calculated columns) whose DAX references it.
     """
-    global _last_lineage, _last_workspace_id, _workspace_lineages
-
-    wid = workspace_id or _last_workspace_id
-
-    # Determine which lineages to search
-    lineages_to_search: list[LineageResponse] = []
-    if dataset_id and dataset_id in _workspace_lineages:
-        lineages_to_search = [_workspace_lineages[dataset_id]]
-    elif _workspace_lineages:
-        lineages_to_search = list(_workspace_lineages.values())
-    elif _last_lineage:
-        lineages_to_search = [_last_lineage]
-    elif workspace_id and dataset_id:
-        await generate_lineage(workspace_id, dataset_id)
-        if _last_lineage:
-            lineages_to_search = [_last_lineage]
-
-    if not lineages_to_search:
+    store = _get_store()
+
+    # Determine which stored lineages to search: the dataset, the workspace, the
+    # last generated lineage, or a fresh generate_lineage
+    scope = (workspace_id, dataset_id)
+    if not dataset_id or not store.keys(*scope):
+        scope = (workspace_id, "")
+    if not store.keys(*scope):
+        last = store.last()
+        if last:
+            scope = last
+        elif workspace_id and dataset_id:
+            await generate_lineage(workspace_id, dataset_id)
+            scope = (workspace_id, dataset_id)
+
+    model_count, total_reports = store.summary(*scope)
+    if not model_count:
         return "No lineage data available. Run `generate_workspace_lineage` or `generate_lineage` first."
 
-    # Search across all lineages
-    all_results = []
-    for lineage in lineages_to_search:
-        reports = lineage.reports
-        model = lineage.model
-
-        if not table_name:
-            for tbl in model.tables:
-                for col in tbl.columns:
-                    if col.name.lower() == field_name.lower():
-                        r = get_impact_analysis(col.name, "column", tbl.name, reports, wid)
-                        if r.usage_count > 0:
-                            all_results.append((model.name, r))
-                for m in tbl.measures:
-                    if m.name.lower() == field_name.lower():
-                        r = get_impact_analysis(m.name, "measure", tbl.name, reports, wid)
-                        if r.usage_count > 0:
-                            all_results.append((model.name, r))
-        else:
-            result = get_impact_analysis(field_name, field_type, table_name, reports, wid)
-            if result.usage_count > 0:
-                all_results.append((model.name, result))
+    # One indexed lookup across every lineage in scope
+    all_results = await asyncio.to_thread(
+        store.find_usages, field_name, table_name, field_type, *scope
+    )
 
     if not all_results:
-        model_count = len(lineages_to_search)
-        total_reports = sum(len(l.reports) for l in lineages_to_search)
         return f"Field `{field_name}` is not used in any visual across {model_count} model(s), {total_reports} report(s)."
 
     return _format_impact_results_multi(all_results)
 
 
+def _usage_summary(result: Any) -> str:
+    if result.indirect_count:
+        return f"{result.usage_count} usage(s), {result.indirect_count} through dependent measures"
+    return f"{result.usage_count} usage(s)"
+
+
 def _format_impact_results(results: list) -> str:
     lines: list[str] = []
     total_usage = sum(r.usage_count for r in results)
     lines.append(f"# Impact Analysis — {total_usage} visual(s) affected\n")
 
     for r in results:
-        lines.append(f"## `{r.table_name}.{r.object_name}` ({r.object_type}) — {r.usage_count} usage(s)\n")
+        lines.append(f"## `{r.table_name}.{r.object_name}` ({r.object_type}) — {_usage_summary(r)}\n")
         lines.append("| Report | Page | Visual | Type |")
         lines.append("|--------|------|--------|------|")
         for item in r.used_in:
             title = item.visual_title or item.visual_type
+            if item.via:
+                title += f" (via `{item.via}`)"
             lines.append(f"| {item.report_name} | {item.page_name} | {title} | {item.visual_type} |")
         lines.append("")
 
@@ -406,11 +996,13 @@ def _format_impact_results_multi(results: list[tuple[str, Any]]) -> str:
     lines.append(f"# Impact Analysis — {total_usage} visual(s) affected across {len(model_names)} model(s)\n")
 
     for model_name, r in results:
-        lines.append(f"## [{model_name}] `{r.table_name}.{r.object_name}` ({r.object_type}) — {r.usage_count} usage(s)\n")
+        lines.append(f"## [{model_name}] `{r.table_name}.{r.object_name}` ({r.object_type}) — {_usage_summary(r)}\n")
         lines.append("| Report | Page | Visual | Type |")
         lines.append("|--------|------|--------|------|")
         for item in r.used_in:
             title = item.visual_title or item.visual_type
+            if item.via:
+                title += f" (via `{item.via}`)"
             lines.append(f"| {item.report_name} | {item.page_name} | {title} | {item.visual_type} |")
         lines.append("")
 
@@ -433,23 +1025,24 @@ async def describe_semantic_model(
     Returns detailed metadata about the semantic model structure.
     If dataset_id is provided and was previously scanned, returns that specific model.
     """
-    global _last_lineage, _workspace_lineages
+    store = _get_store()
 
-    # Look up specific model from cache if dataset_id provided
-    lineage = None
-    if dataset_id and dataset_id in _workspace_lineages:
-        lineage = _workspace_lineages[dataset_id]
-    elif _last_lineage:
-        lineage = _last_lineage
+    # Look up specific model from the store if dataset_id provided
+    key = None
+    found = store.keys(workspace_id, dataset_id) if dataset_id else []
+    if found:
+        key = found[0]
+    else:
+        key = store.last()
 
-    if not lineage and workspace_id and dataset_id:
+    if not key and workspace_id and dataset_id:
         await generate_lineage(workspace_id, dataset_id)
-        lineage = _workspace_lineages.get(dataset_id) or _last_lineage
+        key = store.last()
 
-    if not lineage:
+    model = await asyncio.to_thread(store.load_model, *key) if key else None
+    if not model:
         return "No lineage data available. Run `generate_lineage` or `generate_workspace_lineage` first."
 
-    model = lineage.model
     lines: list[str] = []
 
     lines.append(f"# Semantic Model: {model.name}\n")
@@ -514,11 +1107,15 @@ async def describe_semantic_model(
 @mcp.tool()
 async def export_lineage_html(
     output_path: str = "",
+    chunked: bool | None = None,
 ) -> str:
     """Export ALL generated lineages as an interactive D3 tree visualization (HTML file).
 
     Args:
         output_path: File path to save HTML (default: auto-generated in current directory).
+        chunked: Embed each model as a compressed chunk that the viewer decodes only when
+            the model is selected. Default: only when more than TOMPO_HTML_INLINE_MODELS
+            (10) models are exported.
 
     The HTML includes a model selector dropdown when multiple models are scanned.
     Opens the visualization in your default browser. The HTML file is self-contained
@@ -526,33 +1123,21 @@ async def export_lineage_html(
 
     Run generate_lineage or generate_workspace_lineage first to populate the lineage data.
     """
-    global _workspace_lineages, _last_lineage
-
-    # Collect all lineages
-    all_lineages = list(_workspace_lineages.values()) if _workspace_lineages else (
-        [_last_lineage] if _last_lineage else []
-    )
-
-    if not all_lineages:
+    store = _get_store()
+    keys = store.keys()
+    if not keys:
         return "No lineage data available. Run `generate_workspace_lineage` or `generate_lineage` first."
-
-    # Serialize all lineages as an array
-    lineages_json = [l.model_dump() for l in all_lineages]
-
-    # Load HTML template
-    template_path = os.path.join(os.path.dirname(__file__), "viz", "template.html")
-    with open(template_path, "r", encoding="utf-8") as f:
-        template = f.read()
-
-    # Inject lineage data (array of all models)
-    html = template.replace("__LINEAGE_DATA_PLACEHOLDER__", json.dumps(lineages_json, default=str))
+    if chunked is None:
+        chunked = len(keys) > HTML_INLINE_MODELS
 
     # Determine output path
     if not output_path:
         # Use first model name or workspace
-        model_name = all_lineages[0].model.name.replace(" ", "_").replace("/", "_")
-        if len(all_lineages) > 1:
-            model_name = f"workspace_{len(all_lineages)}_models"
+        if len(keys) > 1:
+            model_name = f"workspace_{len(keys)}_models"
+        else:
+            model = await asyncio.to_thread(store.load_model, *keys[0])
+            model_name = (model.name if model else keys[0][1]).replace(" ", "_").replace("/", "_")
         output_path = os.path.join(os.getcwd(), f"lineage_{model_name}.html")
 
     # Validate output path — prevent path traversal
@@ -564,8 +1149,10 @@ async def export_lineage_html(
     parent_dir = os.path.dirname(output_path)
     os.makedirs(parent_dir, exist_ok=True)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html)
+    model_names = await asyncio.to_thread(_write_lineage_html, output_path, store, keys, chunked)
+    if not model_names:
+        os.remove(output_path)
+        return "No lineage data available. Run `generate_workspace_lineage` or `generate_lineage` first."
 
     # Open in browser
     try:
@@ -573,13 +1160,70 @@ async def export_lineage_html(
     except Exception:
         pass
 
-    model_names = [l.model.name for l in all_lineages]
     return (
         f"Interactive lineage visualization saved to `{output_path}` and opened in browser.\n"
-        f"Contains {len(all_lineages)} model(s): {', '.join(model_names)}"
+        f"Contains {len(model_names)} model(s){' (loaded on demand)' if chunked else ''}: {', '.join(model_names)}"
     )
 
 
+def _script_json(value: Any) -> str:
+    """JSON that is safe inside a <script> element (no ``</script>`` or ``<!--``)."""
+    return json.dumps(value, default=str).replace("<", "\\u003c")
+
+
+def _write_lineage_html(output_path: str, store: LineageStore, keys: list[tuple[str, str]], chunked: bool) -> list[str]:
+    """Stream the viewer to ``output_path``, loading one stored lineage at a time.
+
+    Inline exports write the lineages as a JSON array in place of the data
+    placeholder. Chunked exports write each lineage as a gzipped, base64
+    ``<script type="application/x-tompo-chunk">`` block ahead of the viewer
+    script and inline only a manifest of per-model counts. Returns the names
+    of the models written.
+    """
+    template_path = os.path.join(os.path.dirname(__file__), "viz", "template.html")
+    with open(template_path, "r", encoding="utf-8") as f:
+        template = f.read()
+    head, _, rest = template.partition("<!-- __LINEAGE_CHUNKS__ -->")
+    before_data, _, after_data = rest.partition("__LINEAGE_DATA_PLACEHOLDER__")
+
+    names: list[str] = []
+    summaries: list[dict[str, Any]] = []
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(head)
+        if not chunked:
+            f.write(before_data)
+            f.write("[")
+        for ws, ds in keys:
+            lineage = store.load(ws, ds)
+            if lineage is None:
+                continue
+            data = _script_json(lineage.model_dump())
+            if not chunked:
+                f.write(("," if names else "") + data)
+            else:
+                chunk_id = f"tompo-chunk-{len(summaries)}"
+                payload = base64.b64encode(gzip.compress(data.encode("utf-8"), compresslevel=6)).decode("ascii")
+                f.write(f'<script type="application/x-tompo-chunk" id="{chunk_id}">{payload}</script>\n')
+                tables = lineage.model.tables
+                summaries.append({
+                    "name": lineage.model.name,
+                    "chunk": chunk_id,
+                    "tables": len(tables),
+                    "reports": len(lineage.reports),
+                    "relationships": len(lineage.model.relationships),
+                    "columns": sum(len(t.columns) for t in tables),
+                    "measures": sum(len(t.measures) for t in tables),
+                })
+            names.append(lineage.model.name)
+        if chunked:
+            f.write(before_data)
+            f.write(_script_json({"chunked": True, "models": summaries}))
+        else:
+            f.write("]")
+        f.write(after_data)
+    return names
+
+
 # ── Server entry point ───────────────────────────────────────────────
 
 def run_server() -> None:
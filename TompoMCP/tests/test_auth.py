@@ -0,0 +1,76 @@
+"""Tests for token caching and refresh in TokenProvider (fake credential, no Azure)."""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from tompo_mcp.auth import FABRIC_SCOPE, POWERBI_SCOPE, TokenProvider
+
+
+class _FakeCredential:
+    """Slow credential issuing numbered tokens valid for ``lifetime`` seconds."""
+
+    def __init__(self, lifetime: float = 3600, delay: float = 0.05) -> None:
+        self.lifetime = lifetime
+        self.delay = delay
+        self.calls: list[str] = []
+        self._lock = threading.Lock()
+
+    def get_token(self, scope):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls.append(scope)
+            n = len(self.calls)
+        return SimpleNamespace(token=f"tok-{n}", expires_on=int(time.time() + self.lifetime))
+
+
+def test_raw_token_bypasses_credential():
+    tp = TokenProvider("raw", credential=_FakeCredential())
+    assert tp.get_fabric_token() == "raw"
+    assert asyncio.run(tp.get_token_async(FABRIC_SCOPE)) == "raw"
+    assert tp._credential.calls == []
+
+
+def test_tokens_cached_per_scope():
+    cred = _FakeCredential()
+    tp = TokenProvider(credential=cred)
+    assert tp.get_powerbi_token() == tp.get_powerbi_token() == "tok-1"
+    assert tp.get_fabric_token() == "tok-2"
+    assert asyncio.run(tp.get_token_async(POWERBI_SCOPE)) == "tok-1"
+    assert cred.calls == [POWERBI_SCOPE, FABRIC_SCOPE]
+
+
+def test_concurrent_async_callers_share_one_refresh():
+    cred = _FakeCredential()
+    tp = TokenProvider(credential=cred)
+
+    async def _many():
+        return await asyncio.gather(*[tp.get_token_async(FABRIC_SCOPE) for _ in range(50)])
+
+    assert set(asyncio.run(_many())) == {"tok-1"}
+    assert cred.calls == [FABRIC_SCOPE]
+
+
+def test_token_near_expiry_renewed_in_background():
+    cred = _FakeCredential(lifetime=200)  # inside the default 300 s refresh margin
+    tp = TokenProvider(credential=cred)
+    tp.get_fabric_token()
+
+    async def _access():
+        t0 = time.perf_counter()
+        token = await tp.get_token_async(FABRIC_SCOPE)
+        waited = time.perf_counter() - t0
+        await tp._refreshes[FABRIC_SCOPE]
+        return token, waited
+
+    token, waited = asyncio.run(_access())
+    assert token == "tok-1" and waited < cred.delay
+    assert tp.get_fabric_token() == "tok-2"
+
+
+def test_expired_token_waits_for_refresh():
+    cred = _FakeCredential(lifetime=30)  # below MIN_VALIDITY: never handed out
+    tp = TokenProvider(credential=cred)
+    assert asyncio.run(tp.get_token_async(FABRIC_SCOPE)) == "tok-1"
+    assert asyncio.run(tp.get_token_async(FABRIC_SCOPE)) == "tok-2"
@@ -1,12 +1,24 @@
 """Tests for TOMPo MCP core logic (parser, lineage builder, link builder)."""
 
+import json
+import pickle
+
+import pytest
+from pydantic import ValidationError
+
 from tompo_mcp.core.models import (
-    ColumnInfo, LineageNode, MeasureInfo, PageInfo, ReportInfo,
-    SemanticModelInfo, TableInfo, VisualFieldBinding, VisualInfo,
+    FIELD_REGISTRY, ColumnInfo, LineageNode, LineageResponse, MeasureInfo, PageInfo,
+    ReportInfo, SemanticModelInfo, TableInfo, VisualFieldBinding, VisualInfo,
+)
+from tompo_mcp.core.dax import DaxDependencyGraph, extract_references
+from tompo_mcp.core.lineage import (
+    build_field_usage_index, build_lineage, get_all_impact_analysis,
+    get_dependency_graph, get_field_usage_index, get_impact_analysis,
 )
-from tompo_mcp.core.lineage import build_lineage, get_impact_analysis, get_all_impact_analysis
 from tompo_mcp.core.links import build_report_link, build_visual_link, set_pbi_web_url
+from tompo_mcp.core import parser
 from tompo_mcp.core.parser import parse_semantic_model, parse_report_definition
+from tompo_mcp.core.store import LineageStore
 
 
 # ── Test data ────────────────────────────────────────────────────────
@@ -144,6 +156,26 @@ def test_lineage_tree_structure():
     assert "card" in visual_types
 
 
+def test_lineage_orphans_and_order():
+    model = _make_model()
+    model.tables.append(TableInfo(name="DimDate", columns=[ColumnInfo(name="Date")]))
+    reports = _make_reports()
+    reports[0].pages[0].visuals[0].field_bindings.append(
+        VisualFieldBinding(table_name="NotInModel", field_name="X", field_type="column"),
+    )
+    tree = build_lineage(model, reports).lineage_tree
+
+    # Used tables first in model order, then orphans; unknown/hidden tables never appear
+    assert [c.name for c in tree.children] == ["DimCustomer", "FactSales", "DimDate"]
+    assert tree.children[2].metadata["orphan"] is True
+    assert "orphan" not in tree.children[0].metadata
+
+    pages = tree.children[0].children[0].children
+    assert [p.name for p in pages] == ["Overview", "Details"]
+    assert [f.name for f in pages[1].children[0].children] == ["Name", "Region"]
+    assert "report_link" not in pages[0].metadata
+
+
 def test_impact_analysis():
     model = _make_model()
     reports = _make_reports()
@@ -167,6 +199,70 @@ def test_all_impact_analysis():
     assert results[0].usage_count >= results[-1].usage_count
 
 
+def test_field_usage_index():
+    reports = _make_reports()
+    index = build_field_usage_index(reports)
+
+    region = index[("DimCustomer", "Region", "column")]
+    assert [visual.visual_id for _, _, visual in region] == ["v1", "v3"]
+    assert ("DimCustomer", "Region", "measure") not in index
+
+    result = get_impact_analysis("Region", "column", "DimCustomer", reports, "ws-001", index)
+    assert result.usage_count == 2
+    assert result.used_in[1].page_name == "Details"
+
+
+def test_field_usage_index_cached_on_lineage():
+    lineage = build_lineage(_make_model(), _make_reports(), workspace_id="ws-001")
+    index = get_field_usage_index(lineage)
+    assert get_field_usage_index(lineage) is index
+    assert "_field_index" not in lineage.model_dump()
+
+
+def test_lineage_dump_validate_round_trip():
+    lineage = build_lineage(_make_model(), _make_reports(), workspace_id="ws-001")
+    dumped = lineage.model_dump()
+
+    loaded = LineageResponse.model_validate(dumped)
+    assert loaded.model_dump() == dumped
+    # Dumped bindings are interned again, not copied
+    [a, b] = loaded.reports[0].pages[0].visuals[0].field_bindings
+    assert a is VisualFieldBinding("DimCustomer", "Region", "column")
+    assert b is VisualFieldBinding("FactSales", "TotalRevenue", "measure")
+    assert LineageResponse.model_validate_json(lineage.model_dump_json()).model_dump() == dumped
+
+    dumped["reports"][0]["pages"][0]["visuals"][0]["field_bindings"][0] = {"table_name": "DimCustomer"}
+    with pytest.raises(ValidationError):
+        LineageResponse.model_validate(dumped)
+
+
+def test_lineage_store_round_trip():
+    lineage = build_lineage(_make_model(), _make_reports(), workspace_id="ws-001")
+    store = LineageStore()
+    store.save("ws-001", lineage)
+    store.save("ws-001", lineage)  # replaces, no duplicate rows
+
+    loaded = store.load("ws-001", "ds-001")
+    assert loaded.model_dump() == lineage.model_dump()
+    assert store.keys() == [("ws-001", "ds-001")]
+    assert store.summary("ws-001") == (1, 1)
+
+    [(model_name, impact)] = store.find_usages("Region", "DimCustomer", "column")
+    expected = get_impact_analysis("Region", "column", "DimCustomer", _make_reports(), "ws-001")
+    assert model_name == "Sales Model"
+    assert impact.model_dump() == expected.model_dump()
+    # Without a table: case-insensitive, only fields the model defines
+    assert [i.table_name for _, i in store.find_usages("region")] == ["DimCustomer"]
+    assert store.find_usages("Region", workspace_id="ws-other") == []
+
+    store.set_last("ws-001", "ds-001")
+    store.retain("ws-001", [])
+    assert store.keys() == [] and store.load("ws-001", "ds-001") is None
+    # The default lineage pointer went with it, and doesn't revive on a later save
+    store.save("ws-001", lineage)
+    assert store.last() is None
+
+
 # ── Link builder tests ───────────────────────────────────────────────
 
 def test_report_link():
@@ -186,6 +282,72 @@ def test_link_none_on_missing():
     assert build_visual_link("ws-001", "rpt-001", "page", None) is None
 
 
+# ── DAX tests ────────────────────────────────────────────────────────
+
+def test_extract_dax_references():
+    expr = """
+        VAR total = CALCULATE([Total Revenue], 'Dim Customer'[Region] = "West [not a field]")
+        // FactSales[Commented]
+        RETURN DIVIDE(total, SUM(FactSales[Amount])) /* [Hidden]
+        */ + FactSales[Amount] + 'It''s'[Odd]]Name]
+    """
+    assert extract_references(expr) == [
+        ("", "Total Revenue"), ("Dim Customer", "Region"), ("FactSales", "Amount"), ("It's", "Odd]Name"),
+    ]
+
+
+def _model_with_measure_chain() -> SemanticModelInfo:
+    model = _make_model()
+    fact = model.tables[1]
+    fact.columns.append(ColumnInfo(name="Net", data_type="Decimal", expression="[amount] * 0.9"))
+    fact.measures += [
+        MeasureInfo(name="Revenue x2", expression="[TotalRevenue] * 2", table_name="FactSales"),
+        MeasureInfo(name="Net Revenue", expression="SUM(FactSales[Net])", table_name="FactSales"),
+        MeasureInfo(name="Loop", expression="[Loop] + [Revenue x2]", table_name="FactSales"),
+    ]
+    return model
+
+
+def test_dax_dependency_graph_closure():
+    graph = DaxDependencyGraph.from_model(_model_with_measure_chain())
+    amount = ("FactSales", "Amount", "column")
+    # Bare [amount] in a calculated column resolves to its own table, case-insensitively
+    assert graph.used_by(amount) == [("FactSales", "Net", "column"), ("FactSales", "TotalRevenue", "measure")]
+    assert graph.dependents(amount) == (
+        ("FactSales", "Net", "column"), ("FactSales", "TotalRevenue", "measure"),
+        ("FactSales", "Net Revenue", "measure"), ("FactSales", "Revenue x2", "measure"),
+        ("FactSales", "Loop", "measure"),
+    )
+    assert graph.dependents(amount) is graph.dependents(amount)  # computed once
+    assert graph.dependents(("DimCustomer", "Region", "column")) == ()
+
+
+def test_impact_analysis_through_measures():
+    model = _model_with_measure_chain()
+    reports = _make_reports()
+    reports[0].pages[0].visuals[0].field_bindings.append(
+        VisualFieldBinding(table_name="FactSales", field_name="Revenue x2", field_type="measure")
+    )
+    graph = get_dependency_graph(model)
+    assert get_dependency_graph(model) is graph and "_dax_graph" not in model.model_dump()
+
+    # Amount is never bound; the visual binding TotalRevenue and Revenue x2 is listed once
+    assert get_impact_analysis("Amount", "column", "FactSales", reports).usage_count == 0
+    result = get_impact_analysis("Amount", "column", "FactSales", reports, "ws-001", graph=graph)
+    assert (result.usage_count, result.indirect_count) == (1, 1)
+    assert result.used_in[0].via == "TotalRevenue"
+    assert ("FactSales", "Amount", "column") in {
+        (r.table_name, r.object_name, r.object_type) for r in get_all_impact_analysis(model, reports)
+    }
+
+    store = LineageStore()
+    store.save("ws-001", build_lineage(model, reports, "ws-001"))
+    [(_, stored)] = store.find_usages("amount")
+    assert stored.model_dump() == result.model_dump()
+    assert store.find_usages("Amount", indirect=False) == []
+    assert store.dependency_graph("ws-001", "ds-001") is store.dependency_graph("ws-001", "ds-001")
+
+
 # ── Parser tests ─────────────────────────────────────────────────────
 
 def test_parse_bim_model():
@@ -238,6 +400,88 @@ def test_parse_dax_model():
     assert model.tables[0].measures[0].name == "Total"
 
 
+def test_parse_tmdl_model():
+    raw = {
+        "definition/tables/Sales.tmdl": (
+            "/// Sales facts\n"
+            "table Sales\n"
+            "\tisHidden\n"
+            "\n"
+            "\t/// Net amount\n"
+            "\tcolumn Amount\n"
+            "\t\tdataType: decimal\n"
+            "\t\tisHidden\n"
+            "\t\tsourceColumn: amount_net\n"
+            "\n"
+            "\tcolumn 'Unit Price' = [Amount] / [Qty]\n"
+            "\t\tdataType: double\n"
+            "\n"
+            "\tmeasure Margin =\n"
+            "\t\t\tVAR x = [Total]\n"
+            "\n"
+            "\t\t\tRETURN\n"
+            "\t\t\t    x * 2\n"
+            "\t\tformatString: 0.0%\n"
+            "\n"
+            "\tmeasure Fenced = ```\n"
+            "\t\t\tSUM(Sales[Amount])\n"
+            "\t\t\t```\n"
+            "\n"
+            "\tpartition Sales-1 = m\n"
+            "\t\tmode: import\n"
+            "\t\tsource =\n"
+            "\t\t\t\tlet\n"
+            "\t\t\t\t    Source = Sql.Database(\"srv\", \"db\")\n"
+            "\t\t\t\tin\n"
+            "\t\t\t\t    Source\n"
+        ),
+        "definition/relationships.tmdl": (
+            "relationship r1\n"
+            "\tfromColumn: Sales.CustomerKey\n"
+            "\ttoColumn: 'Dim Customer'.'Customer.Key'\n"
+            "\tisActive: false\n"
+        ),
+        "definition/roles/West.tmdl": (
+            "role West\n"
+            "\tmodelPermission: read\n"
+            "\tmember alice@contoso.com\n"
+            "\ttablePermission Sales = [Region] = \"West\"\n"
+        ),
+        "definition/model.tmdl": (
+            "model Model\n"
+            "\tculture: en-US\n"
+            "\n"
+            "ref table Sales\n"
+            "\n"
+            "relationship r2\n"
+            "\tfromColumn: Sales.DateKey\n"
+            "\ttoColumn: Date.DateKey\n"
+        ),
+    }
+    model = parse_semantic_model(raw, "ds-tmdl", "TMDL Model")
+    [sales] = model.tables
+    assert (sales.is_hidden, sales.description) == (True, "Sales facts")
+    assert sales.source == 'let\n    Source = Sql.Database("srv", "db")\nin\n    Source'
+    amount, unit_price = sales.columns
+    assert (amount.data_type, amount.is_hidden, amount.source_column, amount.description) == (
+        "decimal", True, "amount_net", "Net amount"
+    )
+    assert (unit_price.name, unit_price.expression, unit_price.data_type) == ("Unit Price", "[Amount] / [Qty]", "double")
+    margin, fenced = sales.measures
+    assert margin.expression == "VAR x = [Total]\n\nRETURN\n    x * 2"
+    assert margin.format_string == "0.0%"
+    assert fenced.expression == "SUM(Sales[Amount])"
+
+    r1, r2 = model.relationships
+    assert (r1.from_table, r1.from_column, r1.to_table, r1.to_column, r1.is_active) == (
+        "Sales", "CustomerKey", "Dim Customer", "Customer.Key", False
+    )
+    assert (r2.to_table, r2.to_column, r2.is_active) == ("Date", "DateKey", True)
+    [role] = model.roles
+    assert role.table_permissions == [{"table": "Sales", "filter": '[Region] = "West"'}]
+    assert [m.member_name for m in role.members] == ["alice@contoso.com"]
+
+
 def test_parse_pbir_report():
     raw = {
         "definition/pages/page1/page.json": {
@@ -269,17 +513,80 @@ def test_parse_pbir_report():
     assert fb[1].field_type == "measure"
 
 
+def test_field_bindings_share_one_identity():
+    legacy = {"report.json": {"sections": [{"name": "s1", "displayName": "S1", "visualContainers": [
+        {"config": json.dumps({"name": "v1", "singleVisual": {"visualType": "card", "prototypeQuery": {"Select": [
+            {"Column": {"Expression": {"SourceRef": {"Entity": "Sales"}}, "Property": "Region"}},
+        ]}}})},
+    ]}]}}
+    pbir = {"definition/pages/p1/visuals/v1/visual.json": {"visual": {"visualType": "card", "prototypeQuery": {
+        "Select": [{"Column": {"Expression": {"SourceRef": {"Entity": "Sales"}}, "Property": "Region"}}],
+    }}}, "definition/pages/p1/page.json": {"displayName": "P1"}}
+
+    [a] = parse_report_definition(legacy, "r1", "Legacy").pages[0].visuals[0].field_bindings
+    [b] = parse_report_definition(pbir, "r2", "PBIR").pages[0].visuals[0].field_bindings
+    assert a is b
+    assert FIELD_REGISTRY.get("Sales", "Region", "column") is a
+    assert VisualFieldBinding("Sales", "Region", "measure").field_id != a.field_id
+    # Bindings coming back from a parse worker process rejoin the registry
+    assert pickle.loads(pickle.dumps(a)) is a
+
+
+def test_legacy_configs_are_parsed_once_per_content():
+    # Copies of a visual differ only in their leading "name", as Power BI writes them
+    def slicer(name):
+        return json.dumps({"name": name, "singleVisual": {"visualType": "slicer", "prototypeQuery": {"Select": [
+            {"Column": {"Expression": {"SourceRef": {"Entity": "DimDate"}}, "Property": "Year"}},
+        ]}}})
+
+    def textbox(name):
+        return json.dumps({"name": name, "singleVisual": {"visualType": "textbox"}})
+
+    def layout(report):
+        return {"report.json": {"sections": [
+            {"name": f"s{i}", "visualContainers": [
+                {"config": slicer(f"{report}-slicer{i}")}, {"config": textbox(f"{report}-tb{i}")}, {"config": "{not json"},
+            ]}
+            for i in range(3)
+        ]}}
+
+    parser.clear_legacy_config_memo()
+    first = parse_report_definition(layout("r1"), "r1", "Template copy 1")
+    assert len(parser._legacy_config_memo) == 3
+    second = parse_report_definition(layout("r2"), "r2", "Template copy 2")
+    assert len(parser._legacy_config_memo) == 3
+
+    visuals = [v for r in (first, second) for p in r.pages for v in p.visuals]
+    assert len(visuals) == 6
+    assert all(v.visual_type == "slicer" for v in visuals)
+    # Each container keeps its own visual id
+    assert [v.visual_id for v in visuals] == [f"{r}-slicer{i}" for r in ("r1", "r2") for i in range(3)]
+    assert visuals[0].field_bindings is not visuals[1].field_bindings
+    assert [(fb.table_name, fb.field_name) for fb in visuals[5].field_bindings] == [("DimDate", "Year")]
+
+
 # ── Run tests ────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
     test_build_lineage()
     test_lineage_tree_structure()
+    test_lineage_orphans_and_order()
     test_impact_analysis()
     test_all_impact_analysis()
+    test_field_usage_index()
+    test_field_usage_index_cached_on_lineage()
+    test_lineage_dump_validate_round_trip()
+    test_lineage_store_round_trip()
     test_report_link()
     test_visual_link()
     test_link_none_on_missing()
+    test_extract_dax_references()
+    test_dax_dependency_graph_closure()
+    test_impact_analysis_through_measures()
     test_parse_bim_model()
     test_parse_dax_model()
+    test_parse_tmdl_model()
     test_parse_pbir_report()
+    test_field_bindings_share_one_identity()
+    test_legacy_configs_are_parsed_once_per_content()
     print("All tests passed!")
@@ -0,0 +1,602 @@
+"""Tests for the Fabric REST client and its local definition cache (no network)."""
+
+import asyncio
+import base64
+import json
+import time
+
+import httpx
+
+from tompo_mcp.auth import TokenProvider
+from tompo_mcp.core import fabric_client
+from tompo_mcp.core.cache import DefinitionCache, item_version
+from tompo_mcp.core.definition import DefinitionParts, definition_digest
+from tompo_mcp.core.fabric_client import FabricClient
+from tompo_mcp.core.labels import LabelBatcher, LabelDowngrades
+from tompo_mcp.core.lro import LROScheduler
+from tompo_mcp.core.ratelimit import RateLimiter, TokenBucket, classify_endpoint
+from tompo_mcp.core.parser import parse_report_definition, parse_semantic_model
+
+
+def _b64(obj) -> str:
+    return base64.b64encode(json.dumps(obj).encode("utf-8")).decode("ascii")
+
+
+def _make_client(handler, cache=None) -> FabricClient:
+    client = FabricClient(TokenProvider("test-token"), cache=cache)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+# ── Definition cache ─────────────────────────────────────────────────
+
+def test_cache_roundtrip_and_version_check(tmp_path):
+    cache = DefinitionCache(str(tmp_path))
+    cache.put("ws", "reports", "r1", "2024-01-01", "PBIR", {"a.json": b'{"x": 1}', "raw": "text"}.items())
+
+    assert cache.get("ws", "reports", "r1", "2024-01-01") == ("PBIR", {"a.json": b'{"x": 1}', "raw": "text"})
+    # A newer modification marker invalidates the entry
+    assert cache.get("ws", "reports", "r1", "2024-02-01") is None
+    assert cache.get("ws", "reports", "r1", "2024-01-01") is None
+
+
+def test_cache_lookup_without_version(tmp_path):
+    cache = DefinitionCache(str(tmp_path))
+    cache.put("ws", "reports", "r1", "2024-01-01", "PBIR", [("a", b"1")])
+
+    # An unknown version is a hit while the entry is recent, and never deletes it
+    assert cache.get("ws", "reports", "r1", "") == ("PBIR", {"a": b"1"})
+    cache.unversioned_max_age = -1
+    assert cache.get("ws", "reports", "r1", "") is None
+    assert cache.get("ws", "reports", "r1", "2024-01-01") == ("PBIR", {"a": b"1"})
+
+
+def test_cache_age_and_size_eviction(tmp_path):
+    cache = DefinitionCache(str(tmp_path), max_bytes=10_000_000, unversioned_max_age=0)
+    cache.put("ws", "reports", "r1", "", "PBIR", [("a", b"1")])
+    assert cache.get("ws", "reports", "r1", "") is None
+
+    cache.max_bytes = 1
+    cache.put("ws", "reports", "r2", "v", "PBIR", [("a", b"1")])
+    assert cache.stats()["items"] == 0
+
+
+def test_item_version():
+    assert item_version({"id": "x", "lastUpdatedDate": "2024-05-01T00:00:00Z"}) == "2024-05-01T00:00:00Z"
+    # Power BI listing entries carry no modification time
+    assert item_version({"id": "x", "name": "R", "datasetId": "ds", "webUrl": "https://x"}) == ""
+
+
+def test_workspace_items_take_versions_from_admin_item_listing():
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/groups/ws/datasets"):
+            return httpx.Response(200, json={"value": [{"id": "DS1", "name": "Sales", "isRefreshable": True}]})
+        if path.endswith("/groups/ws/reports"):
+            return httpx.Response(200, json={"value": [{"id": "r1", "name": "R", "datasetId": "DS1"}]})
+        assert path.endswith("/admin/items") and request.url.params["workspaceId"] == "ws"
+        if "continuationToken" not in request.url.params:
+            return httpx.Response(200, json={
+                "itemEntities": [{"id": "ds1", "type": "SemanticModel", "lastUpdatedDate": "t1"}],
+                "continuationToken": "next",
+            })
+        return httpx.Response(200, json={"itemEntities": [{"id": "r1", "type": "Report", "lastUpdatedDate": "t2"}]})
+
+    items = asyncio.run(_make_client(handler).get_workspace_items("ws"))
+    assert items["versions"] == {"ds1": "t1", "r1": "t2"}
+    assert [d["id"] for d in items["datasets"]] == ["DS1"]
+
+    # Without admin rights the listing still works; every version is unknown
+    def no_admin(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/admin/items"):
+            return httpx.Response(403)
+        return httpx.Response(200, json={"value": []})
+
+    assert asyncio.run(_make_client(no_admin).get_workspace_items("ws"))["versions"] == {}
+
+
+def test_get_definition_served_from_cache(tmp_path):
+    calls = []
+    version = {"r1": "t1"}
+
+    # Listing payloads shaped like the real endpoints: only admin/items has a version
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("/groups/ws/reports"):
+            return httpx.Response(200, json={"value": [
+                {"id": "r1", "name": "R", "reportType": "PowerBIReport", "datasetId": "ds", "webUrl": "https://x"},
+            ]})
+        if request.url.path.endswith("/groups/ws/datasets"):
+            return httpx.Response(200, json={"value": []})
+        if request.url.path.endswith("/admin/items"):
+            return httpx.Response(200, json={"itemEntities": [
+                {"id": "r1", "type": "Report", "workspaceId": "ws", "lastUpdatedDate": version["r1"]},
+            ]})
+        return httpx.Response(200, json={"definition": {"format": "PBIR", "parts": [
+            {"path": "definition/report.json", "payload": _b64({"k": "v"}), "payloadType": "InlineBase64"},
+        ]}})
+
+    cache = DefinitionCache(str(tmp_path))
+    client = _make_client(handler, cache)
+
+    async def _run():
+        await client.get_workspace_items("ws")
+        first = await client.get_report_definition("ws", "r1")
+        second = await client.get_report_definition("ws", "r1")
+        bypassed = await client.get_report_definition("ws", "r1", bypass_cache=True)
+        return first, second, bypassed
+
+    first, second, bypassed = asyncio.run(_run())
+    assert first == second == bypassed == {"_format": "PBIR", "definition/report.json": {"k": "v"}}
+    assert sum(1 for p in calls if p.endswith("getDefinition")) == 2
+
+    # A warm rescan past the unversioned TTL is still served from the cache ...
+    cache.unversioned_max_age = -1
+    calls.clear()
+    rescan = _make_client(handler, cache)
+
+    async def _rescan():
+        await rescan.get_workspace_items("ws")
+        return await rescan.get_report_definition("ws", "r1")
+
+    assert asyncio.run(_rescan()) == first
+    assert not any(p.endswith("getDefinition") for p in calls)
+    # ... until the item's version changes
+    version["r1"] = "t2"
+    asyncio.run(_rescan())
+    assert sum(1 for p in calls if p.endswith("getDefinition")) == 1
+
+
+# ── Long-running operation scheduler ─────────────────────────────────
+
+def test_lro_scheduler_many_operations():
+    scheduler = LROScheduler(base_delay=0.001, max_delay=0.004)
+    polls: dict[int, int] = {}
+
+    def _make_poll(i: int):
+        async def _poll():
+            polls[i] = polls.get(i, 0) + 1
+            return polls[i] > i % 3, f"result-{i}", None
+        return _poll
+
+    async def _run():
+        return await asyncio.gather(*[scheduler.wait(_make_poll(i), name=str(i)) for i in range(50)])
+
+    assert asyncio.run(_run()) == [f"result-{i}" for i in range(50)]
+    metrics = scheduler.metrics()
+    assert metrics["outcomes"] == {"succeeded": 50}
+    assert metrics["pending"] == 0
+    assert [m.polls for m in scheduler.recent() if m.name == "5"] == [3]
+
+
+def test_lro_scheduler_timeout_and_retry_after():
+    scheduler = LROScheduler(base_delay=0.001, max_delay=0.001, max_attempts=3)
+
+    async def _never_done():
+        return False, None, None
+
+    async def _run():
+        try:
+            await scheduler.wait(_never_done)
+        except TimeoutError:
+            return True
+        return False
+
+    assert asyncio.run(_run())
+    assert scheduler.metrics()["outcomes"] == {"timed_out": 1}
+    # Retry-After is a floor, even above the backoff cap
+    assert scheduler.next_delay(0, retry_after=0.5) >= 0.5
+
+
+def test_lro_scheduler_deadline_bounds_total_wait():
+    # Backoff would reach 10 s per poll; the deadline ends the wait after ~50 ms
+    scheduler = LROScheduler(base_delay=0.01, max_delay=10.0, max_attempts=1000, deadline=0.05)
+
+    async def _never_done():
+        return False, None, None
+
+    async def _run():
+        t0 = time.perf_counter()
+        try:
+            await scheduler.wait(_never_done)
+        except TimeoutError:
+            return time.perf_counter() - t0
+        return None
+
+    elapsed = asyncio.run(_run())
+    assert elapsed is not None and 0.04 <= elapsed < 1.0
+    assert scheduler.recent()[0].outcome == "timed_out"
+
+
+def test_lro_scheduler_deadline_stretches_with_retry_after():
+    # The server asks for 20 ms between polls: 4 polls outlast the 10 ms deadline
+    scheduler = LROScheduler(base_delay=0.001, max_delay=0.001, max_attempts=5, deadline=0.01)
+    polls = 0
+
+    async def _slow():
+        nonlocal polls
+        polls += 1
+        return polls == 4, "done", 0.02
+
+    assert asyncio.run(scheduler.wait(_slow, retry_after=0.02)) == "done"
+    assert scheduler.recent()[0].latency >= 0.06
+
+
+def test_definition_lro_polls_until_succeeded():
+    states = iter(["Running", "Running", "Succeeded"])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("getDefinition"):
+            return httpx.Response(202, headers={"Location": "https://api.fabric.microsoft.com/v1/operations/op1", "Retry-After": "0"})
+        if path.endswith("/operations/op1"):
+            status = next(states)
+            headers = {"Location": "https://api.fabric.microsoft.com/v1/operations/op1/result"} if status == "Succeeded" else {}
+            return httpx.Response(200, json={"status": status}, headers=headers)
+        return httpx.Response(200, json={"definition": {"format": "TMSL", "parts": [
+            {"path": "model.bim", "payload": _b64({"model": {}}), "payloadType": "InlineBase64"},
+        ]}})
+
+    client = _make_client(handler)
+    client._lro = LROScheduler(base_delay=0.001, max_delay=0.002)
+    result = asyncio.run(client._get_definition_fabric("ws", "semanticModels", "ds"))
+    assert result == {"_format": "TMSL", "model.bim": {"model": {}}}
+    assert client._lro.recent()[0].polls == 3
+
+
+# ── Admin Scanner API batch mode ─────────────────────────────────────
+
+def _scanner_handler(calls: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        calls.append(path)
+        if path.endswith("getDefinition"):
+            return httpx.Response(403)
+        if path.endswith("/admin/workspaces/getInfo"):
+            return httpx.Response(202, json={"id": "scan-1"})
+        if "/scanStatus/" in path:
+            return httpx.Response(200, json={"status": "Succeeded"})
+        if "/scanResult/" in path:
+            return httpx.Response(200, json={"workspaces": [{"id": "WS", "datasets": [
+                {"id": "ds1", "name": "One", "tables": [{"name": "T1", "columns": [{"name": "C"}]}]},
+                {"id": "ds2", "name": "Two", "tables": [{"name": "T2"}]},
+            ]}]})
+        return httpx.Response(404)
+    return handler
+
+
+def test_scanner_fallback_shares_one_workspace_scan():
+    calls: list = []
+    client = _make_client(_scanner_handler(calls))
+    client._lro = LROScheduler(base_delay=0.001, max_delay=0.001)
+
+    async def _run():
+        return await asyncio.gather(
+            client.get_semantic_model_definition("ws", "ds1"),
+            client.get_semantic_model_definition("ws", "ds2"),
+        )
+
+    one, two = asyncio.run(_run())
+    assert one["_source"] == two["_source"] == "scanner"
+    assert one["dataset"]["tables"][0]["name"] == "T1"
+    assert two["dataset"]["name"] == "Two"
+    assert sum(1 for p in calls if p.endswith("getInfo")) == 1
+
+
+def test_scanner_batch_prefetch_skips_get_definition():
+    calls: list = []
+    client = _make_client(_scanner_handler(calls))
+    client._lro = LROScheduler(base_delay=0.001, max_delay=0.001)
+
+    async def _run():
+        scanned = await client.scan_workspaces_admin(["ws"])
+        model = await client.get_semantic_model_definition("ws", "ds2", prefer_scanner=True)
+        return scanned, model
+
+    scanned, model = asyncio.run(_run())
+    assert set(scanned) == {"ds1", "ds2"}
+    assert model["dataset"]["name"] == "Two"
+    assert not any(p.endswith("getDefinition") for p in calls)
+
+
+# ── Lazy definition parts ────────────────────────────────────────────
+
+def test_definition_parts_decode_lazily_and_skip_resources():
+    body = {"definition": {"format": "PBIR", "parts": [
+        {"path": "definition/report.json", "payload": _b64({"k": "v"}), "payloadType": "InlineBase64"},
+        {"path": "definition/pages/p1/page.json", "payload": _b64({"displayName": "P1"}), "payloadType": "InlineBase64"},
+        {"path": "definition/pages/p1/visuals/v1/visual.json", "payloadType": "InlineBase64",
+         "payload": _b64({"visual": {"visualType": "card"}})},
+        {"path": "definition/bookmarks/b1.bookmark.json", "payload": _b64({"name": "b1"}), "payloadType": "InlineBase64"},
+        {"path": "StaticResources/RegisteredResources/logo.png", "payloadType": "InlineBase64",
+         "payload": base64.b64encode(b"\x89PNG\xff\xfe").decode("ascii")},
+    ]}}
+    parts = DefinitionParts.from_response(body)
+    assert list(parts)[0] == "_format" and parts["_format"] == "PBIR"
+    assert "definition/report.json" in parts and not parts._loaded.keys() - {"_format"}
+
+    report = parse_report_definition(parts, "r1", "Report", "ds1")
+    assert report.pages[0].display_name == "P1"
+    assert set(parts._raw) == {
+        "definition/report.json",
+        "definition/bookmarks/b1.bookmark.json",
+        "StaticResources/RegisteredResources/logo.png",
+    }
+
+    # Reading everything gives the same dict as the eager decoder did
+    eager = dict(parts)
+    assert eager["definition/bookmarks/b1.bookmark.json"] == {"name": "b1"}
+    assert eager["StaticResources/RegisteredResources/logo.png"] == base64.b64encode(b"\x89PNG\xff\xfe").decode("ascii")
+    assert not parts._raw
+
+
+def test_definition_digest_same_from_api_and_cache():
+    body = {"definition": {"format": "TMSL", "parts": [
+        {"path": "model.bim", "payload": _b64({"model": {"tables": []}}), "payloadType": "InlineBase64"},
+    ]}}
+    from_api = DefinitionParts.from_response(body)
+    from_cache = DefinitionParts("TMSL", dict(DefinitionParts.from_response(body).raw_parts()))
+    assert definition_digest(from_api) == definition_digest(from_cache)
+    # Reading a part doesn't change the digest
+    unread = definition_digest(from_api)
+    assert from_api["model.bim"] == {"model": {"tables": []}}
+    assert definition_digest(from_api) == unread
+    changed = {"definition": {"format": "TMSL", "parts": [
+        {"path": "model.bim", "payload": _b64({"model": {"tables": [{"name": "T"}]}}), "payloadType": "InlineBase64"},
+    ]}}
+    assert definition_digest(DefinitionParts.from_response(changed)) != definition_digest(from_api)
+    assert definition_digest({"_source": "dax", "tables": []}) == definition_digest({"tables": [], "_source": "dax"})
+
+
+# ── DAX INFO fallback ────────────────────────────────────────────────
+
+def test_dax_metadata_queries_run_concurrently():
+    in_flight = {"now": 0, "peak": 0}
+    rows = {
+        "INFO.TABLES": [{"[ID]": 1, "[Name]": "Sales"}, {"[ID]": 2, "[Name]": "Dates"}],
+        "INFO.COLUMNS": [
+            {"[TableID]": 2, "[ExplicitName]": "Date"},
+            {"[TableID]": 1, "[ExplicitName]": "Amount"},
+            {"[TableID]": 1, "[ExplicitName]": "Region"},
+        ],
+        "INFO.MEASURES": [{"[TableID]": 1, "[Name]": "Total", "[Expression]": "SUM(Sales[Amount])"}],
+    }
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        query = json.loads(request.content)["queries"][0]["query"]
+        hit = next((r for fn, r in rows.items() if fn in query), [])
+        return httpx.Response(200, json={"results": [{"tables": [{"rows": hit}]}]})
+
+    client = _make_client(handler)
+    raw = asyncio.run(client._get_metadata_via_dax("ws", "ds"))
+    assert in_flight["peak"] == 5
+    assert list(raw) == ["_source", "tables", "columns", "measures", "relationships", "roles"]
+
+    model = parse_semantic_model(raw, "ds", "DAX Model")
+    sales, dates = model.tables
+    assert [c.name for c in sales.columns] == ["Amount", "Region"]
+    assert [c.name for c in dates.columns] == ["Date"]
+    assert [m.name for m in sales.measures] == ["Total"] and dates.measures == []
+
+
+# ── Rate limiting ────────────────────────────────────────────────────
+
+def test_classify_endpoint():
+    pbi = "https://api.powerbi.com/v1.0/myorg"
+    assert classify_endpoint(f"{pbi}/admin/workspaces/getInfo") == "scanner_get_info"
+    assert classify_endpoint(f"{pbi}/admin/workspaces/scanStatus/s1") == "scanner_status"
+    assert classify_endpoint(f"{pbi}/groups/ws/datasets/ds/executeQueries") == "execute_queries"
+    assert classify_endpoint(f"{pbi}/admin/datasets/ds") == "admin"
+    assert classify_endpoint(f"{pbi}/admin/informationprotection/setLabels") == "set_labels"
+    assert classify_endpoint(f"{pbi}/groups/ws/reports") == "powerbi"
+    assert classify_endpoint("https://api.fabric.microsoft.com/v1/operations/op1") == "fabric"
+    assert classify_endpoint("https://api.fabric.microsoft.com/v1/admin/items") == "admin"
+    assert classify_endpoint("https://graph.microsoft.com/v1.0/x") == "graph"
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    bucket = TokenBucket(rate=100.0, burst=2)
+
+    async def _acquire(n):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.perf_counter() - t0
+
+    assert asyncio.run(_acquire(2)) < 0.01
+    assert asyncio.run(_acquire(3)) >= 0.025
+
+
+def test_throttled_requests_share_one_pause_and_recover():
+    # The service throttles everything for the first 50 ms
+    throttled_until = time.monotonic() + 0.05
+    statuses: list[int] = []
+
+    def handler(request):
+        status = 429 if time.monotonic() < throttled_until else 200
+        statuses.append(status)
+        if status == 429:
+            return httpx.Response(429, headers={"Retry-After": "0.05"})
+        return httpx.Response(200, json={"value": []})
+
+    limiter = RateLimiter({"powerbi": (1000.0, 10)})
+    client = _make_client(handler)
+    client._limiter = limiter
+
+    async def _many():
+        return await asyncio.gather(*[client.list_workspaces() for _ in range(10)])
+
+    assert asyncio.run(_many()) == [[]] * 10
+    # Requests queued behind the first 429 waited out its pause instead of retrying
+    assert statuses.count(429) == 1
+    assert 500.0 <= limiter.bucket("powerbi").rate < 1000.0
+
+
+def test_persistent_throttling_skips_fallbacks():
+    calls: list[str] = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(429, headers={"Retry-After": "0.001"})
+
+    client = _make_client(handler)
+    client._limiter = RateLimiter({"fabric": (1000.0, 10)})
+    assert asyncio.run(client.get_semantic_model_definition("ws", "ds")) is None
+    assert all(path.endswith("/getDefinition") for path in calls)
+    assert len(calls) == 6  # first attempt plus MAX_RETRIES
+
+
+# ── Sensitivity label downgrades ─────────────────────────────────────
+
+def test_label_downgrades_are_batched_and_shared():
+    labels = {"rpt-1": "secret", "rpt-2": "secret", "rpt-3": "general", "ds-1": "secret"}
+    set_calls: list[tuple[str, list[str]]] = []
+    definition_calls: list[str] = []
+    admin_calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if "/admin/groups" in path or "/admin/datasets/" in path or "/admin/reports/" in path:
+            admin_calls.append(path)
+        if path.endswith("getDefinition"):
+            item = path.split("/")[-2]
+            definition_calls.append(item)
+            if labels[item] != "general":
+                return httpx.Response(403)
+            return httpx.Response(200, json={"definition": {"format": "PBIR", "parts": [
+                {"path": "definition.pbir", "payload": _b64({}), "payloadType": "InlineBase64"},
+            ]}})
+        if path.endswith("/admin/groups"):
+            return httpx.Response(200, json={"value": [{"id": "ws", **{
+                kind: [{"id": item, "sensitivityLabel": {"labelId": label}}
+                       for item, label in labels.items() if item.startswith(prefix)]
+                for kind, prefix in (("datasets", "ds-"), ("reports", "rpt-"))
+            }}]})
+        if path.endswith("/policy/labels"):
+            return httpx.Response(200, json={"value": [{"id": "general", "name": "General"}]})
+        if path.endswith("/setLabels"):
+            body = json.loads(request.content)
+            ids = [a["id"] for items in body["artifacts"].values() for a in items]
+            set_calls.append((body["labelId"], sorted(ids)))
+            for item in ids:
+                labels[item] = body["labelId"]
+            # Ids come back in upper case
+            return httpx.Response(200, json={
+                kind: [{"id": a["id"].upper(), "status": "Succeeded"} for a in items]
+                for kind, items in body["artifacts"].items()
+            })
+        return httpx.Response(404)
+
+    client = _make_client(handler)
+    client._lro = LROScheduler(base_delay=0.001, max_delay=0.001)
+    client._labels = LabelDowngrades(LabelBatcher(client._set_labels, window=0.01))
+    client._label_ready_delays = (0.01, 0.01)
+
+    async def _run():
+        return await asyncio.gather(
+            client.get_report_definition("ws", "rpt-1"),
+            client.get_report_definition("ws", "rpt-1"),
+            client.get_report_definition("ws", "rpt-2"),
+            client.get_report_definition("ws", "rpt-3"),
+            client.get_semantic_model_definition("ws", "ds-1"),
+        )
+
+    results = asyncio.run(_run())
+    assert all(result is not None for result in results)
+    # One call lowers every labelled item, one call restores them all
+    assert set_calls == [("general", ["ds-1", "rpt-1", "rpt-2"]), ("secret", ["ds-1", "rpt-1", "rpt-2"])]
+    assert labels == {"rpt-1": "secret", "rpt-2": "secret", "rpt-3": "general", "ds-1": "secret"}
+    # Each fetch is retried once, after the label shows General
+    assert sorted(definition_calls) == ["ds-1"] * 2 + ["rpt-1"] * 4 + ["rpt-2"] * 2 + ["rpt-3"]
+    # Labels are read, and readiness probed, from shared workspace listings only
+    assert admin_calls == ["/v1.0/myorg/admin/groups"] * 2
+    assert client._labels._locks == {}
+
+
+def test_unconfirmed_label_downgrade_is_still_restored():
+    calls: list[tuple[str, list]] = []
+
+    async def set_labels(label_id, artifacts):
+        calls.append((label_id, artifacts))
+        if label_id == "general":
+            raise httpx.ReadTimeout("no response")
+        return set(artifacts)
+
+    async def read_label():
+        return "secret"
+
+    async def _run():
+        downgrades = LabelDowngrades(LabelBatcher(set_labels, window=0.001))
+        held = await downgrades.acquire(("reports", "r1"), "general", read_label)
+        return held, await downgrades.release(("reports", "r1"))
+
+    # The downgrade may have gone through before the timeout, so the original is put back
+    assert asyncio.run(_run()) == (True, True)
+    assert calls == [("general", [("reports", "r1")]), ("secret", [("reports", "r1")])]
+
+
+def test_rejected_label_downgrade_takes_no_lease():
+    calls: list[str] = []
+
+    async def set_labels(label_id, artifacts):
+        calls.append(label_id)
+        return set()  # the API answered, and didn't set the label
+
+    async def read_label():
+        return "secret"
+
+    async def _run():
+        downgrades = LabelDowngrades(LabelBatcher(set_labels, window=0.001))
+        held = await downgrades.acquire(("reports", "r1"), "general", read_label)
+        return held, downgrades
+
+    held, downgrades = asyncio.run(_run())
+    assert held is False and calls == ["general"]
+    assert downgrades._leases == {} and downgrades._locks == {}
+
+
+def test_label_lookups_served_from_one_admin_listing(monkeypatch):
+    calls: list[str] = []
+    graph_statuses = iter([500, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        calls.append(path)
+        if path.endswith("/admin/groups"):
+            assert request.url.params["$expand"] == "datasets,reports"
+            return httpx.Response(200, json={"value": [{
+                "id": "ws",
+                "datasets": [{"id": "DS-1", "configuredBy": "a@contoso.com", "sensitivityLabel": {"labelId": "secret"}}],
+                "reports": [{"id": f"rpt-{i}", "sensitivityLabel": {"labelId": "secret"}} for i in range(3)],
+            }]})
+        if path.endswith("/policy/labels"):
+            status = next(graph_statuses)
+            return httpx.Response(status, json={"value": [{"id": "general", "name": "General"}]})
+        if path.endswith("/admin/reports/rpt-new"):
+            return httpx.Response(200, json={"id": "rpt-new"})
+        return httpx.Response(404)
+
+    client = _make_client(handler)
+
+    async def _labels():
+        return await asyncio.gather(
+            client._get_artifact_sensitivity_label("WS", "datasets", "ds-1"),
+            *[client._get_artifact_sensitivity_label("WS", "reports", f"rpt-{i}") for i in range(3)],
+            client._get_artifact_sensitivity_label("WS", "reports", "rpt-new"),
+        )
+
+    labels = asyncio.run(_labels())
+    assert [label and label["labelId"] for label in labels] == ["secret"] * 4 + [None]
+    # One listing for the workspace; only the item missing from it was looked up on its own
+    assert calls == ["/v1.0/myorg/admin/groups", "/v1.0/myorg/admin/reports/rpt-new"]
+
+    # A failed General label lookup is retried once LOOKUP_FAILURE_TTL has passed, a success is kept
+    monkeypatch.setattr(fabric_client, "LOOKUP_FAILURE_TTL", -1)
+    assert asyncio.run(client._get_general_label_id()) is None
+    assert asyncio.run(client._get_general_label_id()) == "general"
+    assert asyncio.run(client._get_general_label_id()) == "general"
+    assert sum(1 for path in calls if path.endswith("/policy/labels")) == 2
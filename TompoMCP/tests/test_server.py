@@ -0,0 +1,392 @@
+"""Tests for TOMPo MCP server orchestration (scan concurrency, tool plumbing)."""
+
+import asyncio
+import base64
+import gzip
+import json
+import re
+
+import pytest
+
+from tompo_mcp import server
+from tompo_mcp.core.jobs import ScanJobQueue
+from tompo_mcp.core.models import LineageNode
+from tompo_mcp.core.offload import ParseExecutor
+from tompo_mcp.core.store import LineageStore
+
+
+class _FakeClient:
+    """Stands in for FabricClient; returns a one-visual PBIR report per id."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def get_report_definition(self, workspace_id, report_id, bypass_cache=False):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if report_id == "missing":
+            return None
+        return {
+            "definition/pages/p1/page.json": {"displayName": report_id},
+            "definition/pages/p1/visuals/v1/visual.json": {"visual": {"visualType": "card"}},
+        }
+
+
+def test_fetch_reports_bounded_and_ordered():
+    client = _FakeClient()
+    report_dicts = [{"id": f"r{i}", "name": f"R{i}"} for i in range(10)] + [{"id": "missing", "name": "Gone"}]
+
+    reports = asyncio.run(server._fetch_reports(
+        client, "ws", "ds", report_dicts, asyncio.Semaphore(3),
+    ))
+
+    assert [r.id for r in reports] == [rd["id"] for rd in report_dicts]
+    assert client.peak_in_flight == 3
+    assert reports[0].pages[0].display_name == "r0"
+    assert reports[-1].pages == []
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+def test_parse_executor_modes_agree(mode):
+    raw_model = {"model.bim": {"model": {"tables": [
+        {"name": "Sales", "columns": [{"name": "Region", "dataType": "string"}], "measures": [{"name": "Total", "expression": "1"}]},
+    ]}}}
+    raw_report = {
+        "definition/pages/p1/page.json": {"displayName": "P1"},
+        "definition/pages/p1/visuals/v1/visual.json": {"visual": {"visualType": "card"}},
+    }
+    executor = ParseExecutor(mode, max_workers=2)
+
+    async def _parse():
+        return await asyncio.gather(
+            executor.parse_semantic_model(raw_model, "ds", "Model"),
+            executor.parse_report_definition(raw_report, "r1", "Report", "ds"),
+        )
+
+    try:
+        model, report = asyncio.run(_parse())
+    finally:
+        executor.shutdown()
+    assert [t.name for t in model.tables] == ["Sales"]
+    assert model.tables[0].measures[0].name == "Total"
+    assert report.pages[0].display_name == "P1" and report.dataset_id == "ds"
+
+
+def test_parse_executor_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        ParseExecutor("gpu")
+
+
+class _WorkspaceClient:
+    """Fake FabricClient for whole-workspace scans.
+
+    Listing entries have only fields of the Power BI groups/{id}/datasets and
+    /reports responses; versions stand in for the Fabric admin item listing.
+    """
+
+    def __init__(self) -> None:
+        self.datasets = {f"ds{i}": "2024-01-01" for i in range(3)}
+        self.reports = {f"r{i}": ("2024-01-01", f"ds{i % 3}") for i in range(6)}
+        self.calls: list[str] = []
+
+    async def get_workspace_items(self, workspace_id):
+        return {
+            "datasets": [{"id": d, "name": d, "configuredBy": "a@contoso.com", "isRefreshable": True}
+                         for d in self.datasets],
+            "reports": [{"id": r, "name": r, "reportType": "PowerBIReport", "datasetId": ds,
+                         "datasetWorkspaceId": workspace_id} for r, (_, ds) in self.reports.items()],
+            "versions": {**self.datasets, **{r: v for r, (v, _) in self.reports.items()}},
+        }
+
+    async def get_semantic_model_definition(self, workspace_id, dataset_id, bypass_cache=False, prefer_scanner=False):
+        self.calls.append(dataset_id)
+        return {"model.bim": {"model": {"tables": [{"name": "Sales", "columns": [{"name": "Region"}]}]}}}
+
+    async def get_report_definition(self, workspace_id, report_id, bypass_cache=False):
+        self.calls.append(report_id)
+        return {
+            "definition/pages/p1/page.json": {"displayName": self.reports[report_id][0]},
+            "definition/pages/p1/visuals/v1/visual.json": {"visual": {"visualType": "card"}},
+        }
+
+
+def test_incremental_workspace_scan_refetches_only_changes(monkeypatch):
+    client = _WorkspaceClient()
+    monkeypatch.setattr(server, "_client", client)
+    monkeypatch.setattr(server, "_workspace_snapshots", {})
+    store = LineageStore()
+    monkeypatch.setattr(server, "_store", store)
+    saved: list[str] = []
+    save = store.save
+    monkeypatch.setattr(store, "save", lambda ws, lineage: (saved.append(lineage.model.id), save(ws, lineage)))
+
+    asyncio.run(server.generate_workspace_lineage("ws"))
+    assert sorted(client.calls) == ["ds0", "ds1", "ds2", "r0", "r1", "r2", "r3", "r4", "r5"]
+    assert sorted(saved) == ["ds0", "ds1", "ds2"]
+
+    # Nothing changed: no definition calls, every stored lineage kept
+    client.calls.clear()
+    saved.clear()
+    out = asyncio.run(server.generate_workspace_lineage("ws"))
+    assert client.calls == [] and saved == []
+    assert "Unchanged since last scan:** 3" in out
+
+    # A lineage missing from the store is rebuilt even though nothing changed
+    store.delete("ws", "ds0")
+    asyncio.run(server.generate_workspace_lineage("ws"))
+    assert sorted(client.calls) == ["ds0", "r0", "r3"] and saved == ["ds0"]
+    assert sorted(r.id for r in store.load("ws", "ds0").reports) == ["r0", "r3"]
+    saved.clear()
+
+    # One report edited, one dataset deleted
+    client.reports["r1"] = ("2024-02-01", "ds1")
+    del client.datasets["ds2"]
+    client.calls.clear()
+    asyncio.run(server.generate_workspace_lineage("ws"))
+    assert client.calls == ["r1"] and saved == ["ds1"]
+    assert sorted(store.keys()) == [("ws", "ds0"), ("ws", "ds1")]
+    ds1_pages = [r.pages[0].display_name for r in store.load("ws", "ds1").reports]
+    assert sorted(ds1_pages) == ["2024-01-01", "2024-02-01"]
+    assert set(server._workspace_snapshots["ws"].models) == {"ds0", "ds1"}
+
+    # A full scan ignores the snapshot
+    client.calls.clear()
+    asyncio.run(server.generate_workspace_lineage("ws", incremental=False))
+    assert len(client.calls) == 2 + 4
+
+    # Every model deleted: the stored lineages and the default lineage go too
+    assert store.last() == ("ws", "ds0")
+    client.datasets.clear()
+    out = asyncio.run(server.generate_workspace_lineage("ws"))
+    assert "No semantic models found" in out
+    assert store.keys() == [] and store.last() is None
+    assert "ws" not in server._workspace_snapshots
+
+
+class _TenantClient:
+    """Fake FabricClient with two workspaces; rpt-b in ws-b is bound to ds-a in ws-a."""
+
+    def __init__(self) -> None:
+        self.items = {
+            "ws-a": {"datasets": [{"id": "ds-a", "name": "Sales"}],
+                     "reports": [{"id": "rpt-a", "name": "Local", "datasetId": "ds-a"}]},
+            "ws-b": {"datasets": [{"id": "ds-b", "name": "Finance"}],
+                     "reports": [{"id": "rpt-b", "name": "Remote", "datasetId": "DS-A", "datasetWorkspaceId": "WS-A"}]},
+        }
+        self.report_calls: list[tuple[str, str]] = []
+
+    async def list_workspaces(self):
+        return [{"id": "ws-a", "name": "A"}, {"id": "ws-b", "name": "B"}, {"id": "ws-x", "state": "Deleted"}]
+
+    async def get_workspace_items(self, workspace_id):
+        return self.items[workspace_id]
+
+    async def get_semantic_model_definition(self, workspace_id, dataset_id, bypass_cache=False, prefer_scanner=False):
+        return {"model.bim": {"model": {"tables": [{"name": "Sales", "columns": [{"name": "Region"}]}]}}}
+
+    async def get_report_definition(self, workspace_id, report_id, bypass_cache=False):
+        self.report_calls.append((workspace_id, report_id))
+        return {
+            "definition/pages/p1/page.json": {"displayName": "Overview"},
+            "definition/pages/p1/visuals/v1/visual.json": {"visual": {"visualType": "table", "prototypeQuery": {
+                "Select": [{"Column": {"Expression": {"SourceRef": {"Entity": "Sales"}}, "Property": "Region"}}],
+            }}},
+        }
+
+
+def test_tenant_lineage_resolves_cross_workspace_reports(monkeypatch):
+    client = _TenantClient()
+    monkeypatch.setattr(server, "_client", client)
+    store = LineageStore()
+    monkeypatch.setattr(server, "_store", store)
+
+    out = asyncio.run(server.generate_tenant_lineage())
+    assert "Cross-workspace bindings:** 1" in out
+    assert sorted(store.keys()) == [("ws-a", "ds-a"), ("ws-b", "ds-b")]
+    # The remote report is fetched from, and linked into, its own workspace
+    assert ("ws-b", "rpt-b") in client.report_calls
+    sales = store.load("ws-a", "ds-a")
+    table_node = sales.lineage_tree.children[0]
+    remote = next(n for n in table_node.children if n.name == "Remote")
+    assert remote.metadata["workspace_id"] == "ws-b"
+    assert "/groups/ws-b/reports/rpt-b" in remote.metadata["report_link"]
+    assert not store.load("ws-b", "ds-b").reports
+
+    # A later single-workspace scan leaves the other workspace's lineages alone
+    asyncio.run(server.generate_workspace_lineage("ws-b", incremental=False))
+    assert ("ws-a", "ds-a") in store.keys()
+
+    out = asyncio.run(server.impact_analysis("region"))
+    assert "2 visual(s) affected across 1 model(s)" in out
+
+
+def test_tenant_scan_keeps_lineages_of_unlisted_workspaces(monkeypatch):
+    client = _TenantClient()
+    monkeypatch.setattr(server, "_client", client)
+    monkeypatch.setattr(server, "_workspace_snapshots", {})
+    store = LineageStore()
+    monkeypatch.setattr(server, "_store", store)
+
+    asyncio.run(server.generate_tenant_lineage())
+    asyncio.run(server.generate_workspace_lineage("ws-a"))
+    assert "ws-a" in server._workspace_snapshots
+
+    async def _fail(workspace_id):
+        raise RuntimeError("listing timed out")
+
+    # ws-b can't be listed: its stored lineage survives; ws-a's snapshot is dropped
+    listed = client.get_workspace_items
+    monkeypatch.setattr(client, "get_workspace_items", lambda ws: _fail(ws) if ws == "ws-b" else listed(ws))
+    out = asyncio.run(server.generate_tenant_lineage())
+    assert "could not list items: listing timed out" in out
+    assert sorted(store.keys()) == [("ws-a", "ds-a"), ("ws-b", "ds-b")]
+    assert "ws-a" not in server._workspace_snapshots
+
+    # Every model of ws-a deleted: its lineage goes, ws-b's (unlisted) stays
+    client.items["ws-a"] = {"datasets": [], "reports": []}
+    out = asyncio.run(server.generate_tenant_lineage())
+    assert "No semantic models found" in out
+    assert store.keys() == [("ws-b", "ds-b")]
+
+
+class _ModelClient(_TenantClient):
+    async def get_reports_for_dataset(self, workspace_id, dataset_id):
+        return [r for r in self.items[workspace_id]["reports"] if r["datasetId"] == dataset_id]
+
+
+def test_generate_lineage_pages_from_the_store(monkeypatch):
+    monkeypatch.setattr(server, "_client", _ModelClient())
+    monkeypatch.setattr(server, "_store", LineageStore())
+
+    first = asyncio.run(server.generate_lineage("ws-a", "ds-a", page_size=2))
+    assert "📋 Sales" in first and "📄 Local" in first and "Overview" not in first
+    assert "`cursor=2`" in first
+
+    # Later pages are rendered from the stored lineage; the client is never called
+    monkeypatch.setattr(server, "_client", object())
+    second = asyncio.run(server.generate_lineage("ws-a", "ds-a", cursor=2, page_size=2))
+    assert "Overview" in second and "📈 table" in second and "`cursor=4`" in second
+    last = asyncio.run(server.generate_lineage("ws-a", "ds-a", cursor=4, page_size=2))
+    assert "Region [C]" in last and "cursor=" not in last
+
+    shallow = asyncio.run(server.generate_lineage("ws-a", "ds-a", cursor=1, max_depth=2))
+    assert "Local" in shallow and "Overview" not in shallow
+    fields = asyncio.run(server.generate_lineage("ws-a", "ds-a", cursor=1, node_types=["table", "column"]))
+    assert "└── 🔹 Region [C]" in fields and "Local" not in fields
+    assert "Unknown node type(s): tile" in asyncio.run(server.generate_lineage("ws-a", "ds-a", node_types=["tile"]))
+
+
+def test_node_type_filter_keeps_same_named_fields_of_different_tables():
+    def field(table, name):
+        return LineageNode(name=name, node_type="column", metadata={"table": table, "field_type": "column"})
+
+    visuals = [
+        LineageNode(name="table", node_type="visual", children=[field("Sales", "Date"), field("Budget", "Date")]),
+        LineageNode(name="card", node_type="visual", children=[field("Sales", "Date")]),
+    ]
+    page = LineageNode(name="P1", node_type="page", children=visuals)
+    root = LineageNode(name="Model", node_type="model", children=[page])
+
+    rows = [node for _, node in server._iter_tree_rows(root, node_types={"column"})]
+    assert [(n.metadata["table"], n.name) for n in rows] == [("Sales", "Date"), ("Budget", "Date")]
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_export_lineage_html_streams_models(monkeypatch, tmp_path, chunked):
+    monkeypatch.setattr(server, "_client", _TenantClient())
+    monkeypatch.setattr(server, "_store", LineageStore())
+    monkeypatch.setattr(server.webbrowser, "open", lambda url: None)
+    asyncio.run(server.generate_workspace_lineage("ws-a", incremental=False))
+    path = tmp_path / "out" / "lineage.html"
+
+    out = asyncio.run(server.export_lineage_html(str(path), chunked=chunked))
+    assert "Contains 1 model(s)" in out and "Sales" in out
+    html = path.read_text(encoding="utf-8")
+    assert "__LINEAGE_DATA_PLACEHOLDER__" not in html and "__LINEAGE_CHUNKS__" not in html
+
+    chunks = re.findall(r'<script type="application/x-tompo-chunk" id="(tompo-chunk-\d+)">([^<]*)</script>', html)
+    if not chunked:
+        assert not chunks and 'const ALL_DATA = [{"model"' in html
+        return
+    # Only a manifest is inlined; the model itself is a gzipped, base64 chunk
+    manifest = json.loads(re.search(r"const ALL_DATA = (.*);", html).group(1))
+    assert manifest["chunked"] is True
+    assert [(m["name"], m["chunk"]) for m in manifest["models"]] == [("Sales", "tompo-chunk-0")]
+    (chunk_id, payload), = chunks
+    lineage = json.loads(gzip.decompress(base64.b64decode(payload)))
+    assert lineage["model"]["name"] == "Sales" and lineage["lineage_tree"]["node_type"] == "model"
+    assert manifest["models"][0]["tables"] == len(lineage["model"]["tables"])
+
+
+def test_background_workspace_scan(monkeypatch):
+    monkeypatch.setattr(server, "_client", _TenantClient())
+    monkeypatch.setattr(server, "_store", LineageStore())
+    monkeypatch.setattr(server, "_jobs", ScanJobQueue(workers=1))
+
+    async def scenario():
+        submitted = await server.generate_workspace_lineage("ws-a", incremental=False, background=True)
+        job_id = re.search(r"job `(\w+)`", submitted).group(1)
+        # The same scan is not queued twice while it is pending
+        assert job_id in await server.generate_workspace_lineage("ws-a", incremental=False, background=True)
+        assert "Workspace scan `ws-a`" in await server.scan_status()
+        assert "queued" in await server.scan_results(job_id)
+
+        await server._get_jobs().wait(job_id)
+        status = await server.scan_status(job_id)
+        assert "— done" in status and "**Models:** 1/1 done | **Reports:** 1" in status
+        return await server.scan_results(job_id)
+
+    assert "Workspace Lineage Scan Complete" in asyncio.run(scenario())
+    assert server._store.keys() == [("ws-a", "ds-a")]
+    assert "No scan job `nope`" in asyncio.run(server.scan_status("nope"))
+
+
+def test_scan_job_queue_runs_a_bounded_number_of_jobs():
+    queue = ScanJobQueue(workers=2, keep_finished=2)
+    running = peak = 0
+
+    async def scan(job):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        job.set_total(2)
+        for name in ("a", "b"):
+            job.model_started(name)
+            await asyncio.sleep(0.01)
+            job.model_finished(name, reports=3, failed=name == "b")
+        running -= 1
+        if job.description == "broken":
+            raise RuntimeError("boom")
+        return f"done {job.description}"
+
+    async def scenario():
+        jobs = [queue.submit(str(i), "broken" if i == 4 else f"scan {i}", scan) for i in range(5)]
+        assert [queue.position(j) for j in jobs] == [1, 2, 3, 4, 5]
+        for job in jobs:
+            await queue.wait(job.id)
+        return jobs
+
+    jobs = asyncio.run(scenario())
+    assert peak == 2
+    assert [(j.models_done, j.models_failed, j.reports_done) for j in jobs] == [(2, 1, 6)] * 5
+    assert jobs[3].result == "done scan 3" and jobs[3].rate() > 0 and jobs[3].eta() is None
+    assert (jobs[4].state, jobs[4].error) == ("failed", "boom")
+    # Only the newest finished jobs are kept
+    assert [j.id for j in queue.jobs()] == [jobs[3].id, jobs[4].id]
+
+
+def test_lineage_survives_restart(monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "_client", _TenantClient())
+    monkeypatch.setattr(server, "_store", LineageStore(str(tmp_path / "lineage.sqlite")))
+    asyncio.run(server.generate_workspace_lineage("ws-a", incremental=False))
+    server._store.close()
+
+    # A fresh server process reopens the same file; no scan needed
+    monkeypatch.setattr(server, "_client", None)
+    monkeypatch.setattr(server, "_store", LineageStore(str(tmp_path / "lineage.sqlite")))
+    out = asyncio.run(server.impact_analysis("Region", "Sales", workspace_id="ws-a"))
+    assert "1 visual(s) affected" in out
+    assert "# Semantic Model: Sales" in asyncio.run(server.describe_semantic_model())